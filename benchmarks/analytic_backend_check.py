@@ -0,0 +1,136 @@
+"""
+Teste qui-quadrado de equivalência entre o backend analítico
+(quantum.AnalyticBackend) e o AerSimulator, nos circuitos que o jogo executa:
+
+- base:  circuito de 1 qubit de uma flutuação (com e sem a porta X);
+- fused: fusões caóticas (medida no meio do circuito seguida de CX),
+  inclusive uma fusão de fusão;
+- ry:    o circuito de decaimento (R_Y + medida) em várias probabilidades.
+
+Para cada circuito, os dois backends rodam --shots medidas com semente fixa.
+São feitos dois testes:
+- aderência de cada backend à distribuição exata (outcome_distribution);
+- homogeneidade entre as contagens do Aer e do analítico (tabela 2 × k).
+Resultados com p-valor abaixo de --alpha reprovam o circuito; o script
+termina com código 1 se algum reprovar.
+
+Uso:
+    python benchmarks/analytic_backend_check.py [--shots N] [--alpha 0.001] [--seed N]
+"""
+import argparse
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from quantum import (CIRCUIT_CACHE, AnalyticBackend, base_circuit_signature, compile_for, decay_angle,
+                     fused_circuit_signature, outcome_distribution)
+
+DECAY_PROBABILITIES = (0.002, 0.01, 0.3, 0.5, 0.94)
+
+
+def chi2_sf(statistic, df):
+    """P(X > statistic) para X ~ qui-quadrado com `df` graus de liberdade (df inteiro)."""
+    if df <= 0:
+        return 1.0
+    x = statistic / 2
+    if df % 2 == 0:
+        term = total = math.exp(-x)
+        for i in range(1, df // 2):
+            term *= x / i
+            total += term
+        return min(1.0, total)
+    chi = math.sqrt(statistic)
+    total = math.erfc(chi / math.sqrt(2))
+    term = chi * math.sqrt(2 / math.pi) * math.exp(-x)
+    for i in range(1, (df - 1) // 2 + 1):
+        total += term
+        term *= statistic / (2 * i + 1)
+    return min(1.0, total)
+
+
+def goodness_of_fit(counts, distribution, shots):
+    """Estatística e p-valor da aderência das contagens à distribuição exata."""
+    outcomes = [o for o, p in distribution.items() if p > 0]
+    observed = np.array([counts.get(o, 0) for o in outcomes], dtype=np.float64)
+    expected = np.array([distribution[o] * shots for o in outcomes])
+    unexpected = shots - observed.sum() # medidas fora do suporte da distribuição exata
+    if unexpected:
+        return math.inf, 0.0
+    statistic = float(((observed - expected) ** 2 / expected).sum())
+    return statistic, chi2_sf(statistic, len(outcomes) - 1)
+
+
+def homogeneity(first, second):
+    """Estatística e p-valor do teste de homogeneidade entre duas contagens."""
+    outcomes = sorted(set(first) | set(second))
+    table = np.array([[first.get(o, 0) for o in outcomes], [second.get(o, 0) for o in outcomes]], dtype=np.float64)
+    expected = table.sum(axis=1, keepdims=True) * table.sum(axis=0, keepdims=True) / table.sum()
+    statistic = float(((table - expected) ** 2 / expected).sum())
+    return statistic, chi2_sf(statistic, len(outcomes) - 1)
+
+
+def decay_circuit(probability):
+    from qiskit import QuantumCircuit
+
+    qc = QuantumCircuit(1, 1)
+    qc.ry(decay_angle(probability), 0)
+    qc.measure(0, 0)
+    return qc
+
+
+def cases():
+    base = base_circuit_signature("Red")
+    anti = base_circuit_signature("Antired")
+    for label, signature in (("base", base), ("base anti", anti),
+                             ("fused", fused_circuit_signature(base, anti)),
+                             ("fused anti+anti", fused_circuit_signature(anti, anti)),
+                             ("fused (fused, base)", fused_circuit_signature(fused_circuit_signature(base, anti), base))):
+        yield label, CIRCUIT_CACHE.get(signature)
+    for probability in DECAY_PROBABILITIES:
+        yield f"ry p={probability}", decay_circuit(probability)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--shots", type=int, default=100000, help="Medidas por circuito e backend")
+    parser.add_argument("--alpha", type=float, default=0.001, help="Nível de significância")
+    parser.add_argument("--seed", type=int, default=1234, help="Semente dos dois backends")
+    args = parser.parse_args()
+
+    from qiskit_aer import AerSimulator
+
+    aer = AerSimulator()
+    analytic = AnalyticBackend(np.random.default_rng(args.seed))
+    failures = 0
+    print(f"{'circuito':<22}{'resultados':>11}{'p Aer':>9}{'p analít.':>11}{'p homog.':>10}"
+          f"{'Aer':>10}{'analít.':>10}  resultado")
+    for label, circuit in cases():
+        distribution = outcome_distribution(circuit)
+
+        start = time.perf_counter()
+        aer_counts = aer.run(compile_for(circuit, aer), shots=args.shots, seed_simulator=args.seed).result().get_counts()
+        aer_time = time.perf_counter() - start
+        start = time.perf_counter()
+        analytic_counts = analytic.run(compile_for(circuit, analytic), shots=args.shots).result().get_counts()
+        analytic_time = time.perf_counter() - start
+
+        _, p_aer = goodness_of_fit(aer_counts, distribution, args.shots)
+        _, p_analytic = goodness_of_fit(analytic_counts, distribution, args.shots)
+        _, p_same = homogeneity(aer_counts, analytic_counts)
+        ok = min(p_aer, p_analytic, p_same) >= args.alpha
+        failures += not ok
+        print(f"{label:<22}{len(distribution):>11}{p_aer:>9.3f}{p_analytic:>11.3f}{p_same:>10.3f}"
+              f"{aer_time * 1000:>8.1f}ms{analytic_time * 1000:>8.1f}ms  {'ok' if ok else 'REPROVADO'}")
+
+    print(f"Backend analítico equivalente ao Aer em todos os circuitos (alfa = {args.alpha})." if not failures
+          else f"{failures} circuito(s) reprovado(s).")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
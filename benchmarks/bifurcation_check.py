@@ -0,0 +1,126 @@
+"""
+Confere o motor vetorizado do mapa logístico (bifurcation.py) contra a
+implementação escalar original, que vive só aqui como referência, e mede a
+diferença de tempo.
+
+Com as mesmas sementes x0 nos dois lados:
+- as órbitas (logistic_iter contra logistic_orbits) devem ser idênticas bit a bit;
+- nos valores de r periódicos (--periodic), os grupos de cluster_attractors
+  (laço valores × grupos) e de cluster_sorted (ordenação) devem ser iguais.
+Nos valores caóticos (--chaotic) os dois agrupamentos podem diferir, já que o
+laço guloso depende da ordem dos valores; a quantidade de grupos de cada um é
+só informada.
+
+Termina com código 1 se alguma órbita ou algum r periódico divergir.
+
+Uso:
+    python benchmarks/bifurcation_check.py [--periodic 3.2 3.5] [--chaotic 3.99] [--seed N]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from bifurcation import cluster_sorted, logistic_orbits
+
+N_INITS = 60
+TAIL = 20
+
+
+# -----------------------
+# Referência Escalar
+# -----------------------
+
+def logistic_iter(r, x0, n_iters=200, discard=100):
+    x = x0
+    seq = []
+    for _ in range(n_iters):
+        x = r * x * (1 - x)
+        seq.append(x)
+    return seq[discard:]
+
+
+def cluster_attractors(values, eps=1e-3):
+    clusters = []
+    for v in values:
+        placed = False
+        for c in clusters:
+            if abs(c[0] - v) < eps:
+                c.append(v)
+                placed = True
+                break
+        if not placed:
+            clusters.append([v])
+    results = [(statistics.mean(c), len(c)) for c in clusters]
+    results.sort(key=lambda t: t[0])
+    return results
+
+
+def sample_branches_for_r(r, seeds):
+    all_end_values = []
+    for x0 in seeds:
+        tail = logistic_iter(r, x0)
+        all_end_values.extend(tail[-TAIL:])
+    return cluster_attractors(all_end_values, eps=1e-3)
+
+
+# -----------------------
+# Comparação
+# -----------------------
+
+def same_clusters(a, b):
+    return len(a) == len(b) and all(ca == cb and abs(ma - mb) <= 1e-12 for (ma, ca), (mb, cb) in zip(a, b))
+
+
+def check(r, seeds):
+    """(órbitas iguais, grupos escalares, grupos vetorizados, tempo escalar, tempo vetorizado)."""
+    start = time.perf_counter()
+    scalar = sample_branches_for_r(r, seeds.tolist())
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    orbits = logistic_orbits(r, seeds)
+    vector = cluster_sorted(orbits[:, -TAIL:])
+    vector_time = time.perf_counter() - start
+
+    reference = np.array([logistic_iter(r, x0) for x0 in seeds.tolist()])
+    return np.array_equal(reference, orbits), scalar, vector, scalar_time, vector_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--periodic", type=float, nargs="+", default=[3.2, 3.5, 3.56, 3.83],
+                        help="Valores de r periódicos (os grupos devem coincidir)")
+    parser.add_argument("--chaotic", type=float, nargs="+", default=[3.9, 3.99],
+                        help="Valores de r caóticos (só informativos)")
+    parser.add_argument("--seed", type=int, default=1234, help="Semente das condições iniciais")
+    args = parser.parse_args()
+
+    seeds = np.random.default_rng(args.seed).random(N_INITS)
+    failures = 0
+    print(f"{'r':>6}{'órbitas':>10}{'grupos':>14}{'escalar':>11}{'vetorizado':>12}  resultado")
+    for r, periodic in [(r, True) for r in args.periodic] + [(r, False) for r in args.chaotic]:
+        orbits_equal, scalar, vector, scalar_time, vector_time = check(r, seeds)
+        clusters_equal = same_clusters(scalar, vector)
+        if periodic:
+            ok = orbits_equal and clusters_equal
+            verdict = "igual" if ok else "DIFERENTE"
+        else:
+            ok = orbits_equal
+            verdict = ("igual" if clusters_equal else "grupos diferem (caótico)") if ok else "DIFERENTE"
+        failures += not ok
+        print(f"{r:>6}{'iguais' if orbits_equal else 'DIFEREM':>10}{f'{len(scalar)} / {len(vector)}':>14}"
+              f"{scalar_time * 1000:>9.1f}ms{vector_time * 1000:>10.2f}ms  {verdict}")
+
+    print("Motor vetorizado confere com a referência escalar." if not failures
+          else f"{failures} valor(es) de r divergiram.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+"""
+Erro e tempo dos solvers aproximados de forças de longo alcance (EM e
+gravidade entre partículas estáveis) em relação ao solver exato.
+
+Cada cena espalha N partículas de vários tipos (os mesmos de
+benchmarks/scenes.py) pelo campo com uma semente fixa. Para cada solver, as
+velocidades são zeradas, o solver roda uma vez e a variação de velocidade de
+cada partícula é comparada com a do apply_forces_exact:
+
+    erro relativo = |dv_aprox - dv_exato| / |dv_exato|  (mediana e p95)
+    erro agregado = média |dv_aprox - dv_exato| / média |dv_exato|
+
+O solver "pm" é periódico (imagem mais próxima) e o exato não, então ele
+também é comparado com uma soma direta periódica (colunas "periódico"),
+que isola o erro da grade do erro de usar o campo toroidal.
+
+Antes da tabela, os pares próximos da correção P3M
+(ParticleMeshSolver.near_pairs) são conferidos contra uma busca O(n²) pela
+imagem mais próxima, nas cenas e em pontos junto às bordas, incluindo pares
+que atravessam a borda a duas células da grade de busca. O script termina
+com código 1 se algum par faltar ou sobrar.
+
+O tempo é a mediana de --repeats chamadas.
+
+Uso:
+    python benchmarks/force_solvers.py [--sizes 250 500 1000] [--seeds 1 2 3] [--theta 0.5]
+                                       [--solvers barnes_hut pm]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+import game_main
+from forces import ParticleMeshSolver
+from game_main import QuantumCollectorGame, StableParticle
+from scenes import MIXED_KINDS
+
+SOLVERS = {
+    "exact": QuantumCollectorGame.apply_forces_exact,
+    "barnes_hut": QuantumCollectorGame.apply_forces_barnes_hut,
+    "pm": QuantumCollectorGame.apply_forces_particle_mesh,
+}
+
+
+def build_scene(size, seed):
+    game = QuantumCollectorGame(seed=seed)
+    rng = game.rng.spawn
+    for _ in range(size):
+        game.stable_particles.append(StableParticle(
+            rng.uniform(0, game_main.WIDTH), rng.uniform(0, game_main.HEIGHT), (255, 255, 255),
+            rng.choice(MIXED_KINDS), game_ref=game))
+    return game
+
+
+def velocity_deltas(game, solver):
+    """Variação de velocidade produzida por uma chamada do solver, a partir do repouso."""
+    store = game.stable_particles
+    n = len(store)
+    store.columns["vx"][:n] = 0.0
+    store.columns["vy"][:n] = 0.0
+    solver(game)
+    return store.columns["vx"][:n].copy(), store.columns["vy"][:n].copy()
+
+
+def periodic_deltas(game, block=256):
+    """Mesmas forças de apply_forces_exact, somadas pela imagem mais próxima (campo toroidal)."""
+    store = game.stable_particles
+    n = len(store)
+    x = store.columns["x"][:n]
+    y = store.columns["y"][:n]
+    charge = store.columns["charge"][:n].astype(np.float64)
+    charged = charge != 0
+    dvx = np.zeros(n)
+    dvy = np.zeros(n)
+    for start in range(0, n, block):
+        stop = min(n, start + block)
+        dx = x[None, :] - x[start:stop, None]
+        dy = y[None, :] - y[start:stop, None]
+        dx -= game_main.WIDTH * np.round(dx / game_main.WIDTH)
+        dy -= game_main.HEIGHT * np.round(dy / game_main.HEIGHT)
+        dist = np.hypot(dx, dy)
+        valid = dist != 0
+        safe = np.where(valid, dist, 1.0)
+        both_charged = valid & charged[start:stop, None] & charged[None, :]
+        coef = np.where(both_charged,
+                        -(charge[start:stop, None] * charge[None, :] * game_main.EM_CONSTANT)
+                        / (np.maximum(safe, 5.0) ** 2 * safe), 0.0)
+        gravity = valid & ~charged[start:stop, None] & ~charged[None, :] & (dist > 25)
+        coef += np.where(gravity, game_main.GRAVITY_CONSTANT / safe ** 3, 0.0)
+        dvx[start:stop] = (coef * dx).sum(axis=1)
+        dvy[start:stop] = (coef * dy).sum(axis=1)
+    scale = game_main.LONG_RANGE_INTERVAL / game_main.FORCE_REFERENCE_INTERVAL
+    return dvx * scale, dvy * scale
+
+
+def brute_near_pairs(x, y, width, height, reach):
+    """Pares (i, j), i < j, a menos de `reach` pela imagem mais próxima (O(n²))."""
+    first, second = np.triu_indices(len(x), 1)
+    dx = x[second] - x[first]
+    dy = y[second] - y[first]
+    dx -= width * np.round(dx / width)
+    dy -= height * np.round(dy / height)
+    near = np.hypot(dx, dy) < reach
+    return set(zip(first[near].tolist(), second[near].tolist()))
+
+
+def near_pair_cases(sizes, seeds):
+    """Posições (nome, x, y) para conferir os pares próximos do P3M."""
+    width, height = game_main.WIDTH, game_main.HEIGHT
+    # Através da borda de baixo, a duas linhas da grade de busca (11,8 < 11,875 px com a grade padrão)
+    yield "borda", np.array([100.0, 100.0]), np.array([height - 11.3, 0.5])
+    for seed in seeds:
+        rng = np.random.default_rng(seed)
+        for size in sizes:
+            game = build_scene(size, seed)
+            n = len(game.stable_particles)
+            yield f"cena {size}/{seed}", game.stable_particles.columns["x"][:n].copy(), game.stable_particles.columns["y"][:n].copy()
+        # Faixas de 15 px junto às quatro bordas, onde o wrap-around decide os pares
+        x = rng.uniform(0, width, 2000)
+        y = rng.uniform(0, height, 2000)
+        x[:500] = rng.uniform(0, 15, 500) % width
+        x[500:1000] = width - rng.uniform(1e-6, 15, 500)
+        y[1000:1500] = rng.uniform(0, 15, 500) % height
+        y[1500:] = height - rng.uniform(1e-6, 15, 500)
+        yield f"bordas/{seed}", x, y
+
+
+def check_near_pairs(sizes, seeds):
+    """Confere near_pairs contra brute_near_pairs; devolve o número de casos divergentes."""
+    solver = ParticleMeshSolver(game_main.WIDTH, game_main.HEIGHT, game_main.PM_GRID_X, game_main.PM_GRID_Y,
+                                short_range=game_main.PM_SHORT_RANGE_CELLS)
+    if solver.short_range <= 0:
+        return 0
+    failures = 0
+    for name, x, y in near_pair_cases(sizes, seeds):
+        first, second, _, _ = solver.near_pairs(x, y)
+        found = set(zip(first.tolist(), second.tolist()))
+        expected = brute_near_pairs(x, y, game_main.WIDTH, game_main.HEIGHT, solver.short_range)
+        if found != expected:
+            failures += 1
+            print(f"pares próximos ({name}): {len(expected - found)} faltando, {len(found - expected)} sobrando")
+    print(f"pares próximos do P3M (alcance {solver.short_range:.3f} px): "
+          + ("iguais à busca O(n²)" if not failures else f"{failures} caso(s) divergiram"))
+    return failures
+
+
+def timed(game, solver, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        solver(game)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def errors(approx, exact):
+    """(mediana, p95) do erro relativo por partícula e o erro agregado."""
+    diff = np.hypot(approx[0] - exact[0], approx[1] - exact[1])
+    norm = np.hypot(exact[0], exact[1])
+    moving = norm > 0
+    relative = diff[moving] / norm[moving]
+    return float(np.median(relative)), float(np.percentile(relative, 95)), float(diff.mean() / norm.mean())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[250, 500, 1000, 2000], help="Partículas por cena")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[1, 2, 3], help="Sementes das cenas")
+    parser.add_argument("--solvers", nargs="+", choices=sorted(SOLVERS), default=[s for s in SOLVERS if s != "exact"],
+                        help="Solvers comparados com o exato")
+    parser.add_argument("--theta", type=float, default=game_main.BARNES_HUT_THETA, help="Ângulo de abertura do Barnes–Hut")
+    parser.add_argument("--repeats", type=int, default=5, help="Chamadas cronometradas por solver (mediana)")
+    args = parser.parse_args()
+
+    failures = check_near_pairs(args.sizes, args.seeds) if "pm" in args.solvers else 0
+    print(f"{'':<18}{'exato':^30}{'periódico':^20}")
+    print(f"{'solver':<12}{'N':>6}{'mediana':>10}{'p95':>10}{'agregado':>10}{'mediana':>10}{'agregado':>10}"
+          f"{'tempo':>10}{'exato':>10}")
+    for size in args.sizes:
+        for name in args.solvers:
+            rows, times, exact_times = [], [], []
+            for seed in args.seeds:
+                game = build_scene(size, seed)
+                game.barnes_hut_theta = args.theta
+                exact = velocity_deltas(game, SOLVERS["exact"])
+                approx = velocity_deltas(game, SOLVERS[name])
+                rows.append(errors(approx, exact) + errors(approx, periodic_deltas(game))[::2])
+                times.append(timed(game, SOLVERS[name], args.repeats))
+                exact_times.append(timed(game, SOLVERS["exact"], args.repeats))
+            columns = [statistics.median(column) for column in zip(*rows)]
+            print(f"{name:<12}{size:>6}" + "".join(f"{value:>10.2%}" for value in columns)
+                  + f"{statistics.median(times) * 1000:>8.1f}ms{statistics.median(exact_times) * 1000:>8.1f}ms")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
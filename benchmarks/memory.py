@@ -0,0 +1,84 @@
+"""
+Memória por entidade viva: o layout anterior (um __dict__ por instância com
+todos os atributos que o __init__ de cada classe criava antes dos __slots__
+e do ParticleStore) contra o atual (objeto com __slots__ e, para as entidades
+do ParticleStore, a linha dela nas colunas NumPy).
+
+Os dois lados são medidos do mesmo jeito: N instâncias com todos os atributos
+apontando para o mesmo valor, de modo que só o custo do objeto e do seu
+armazenamento de atributos entra na conta. Os valores em si não são contados:
+no layout anterior cada float/int da entidade era um objeto Python à parte
+(que as colunas substituem), então o "antes" é um limite inferior.
+
+Uso:
+    python benchmarks/memory.py [--count N]
+"""
+import argparse
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from game_main import QuantumSpark, Photon, Fluctuation, StableParticle
+from particle_store import COLUMNS, StoreView
+
+# Atributos de instância criados pelo __init__ de cada classe no layout anterior
+BASELINE_ATTRIBUTES = {
+    QuantumSpark: ("x", "y", "vx", "vy", "size", "color", "lifetime"),
+    Photon: ("x", "y", "vx", "vy", "size", "color", "lifetime"),
+    Fluctuation: ("x", "y", "center_value", "color", "size", "vx", "vy", "state", "animation_timer",
+                  "pulse_offset", "angle", "spin_speed", "chaos_level", "num_points", "distortion_factor",
+                  "quantum_circuit", "creation_time"),
+    StableParticle: ("x", "y", "color", "particle_type", "size", "vx", "vy", "angle", "spin_speed", "mass",
+                     "charge", "magnetic_field_strength", "is_captured", "lifetime", "is_dead", "game",
+                     "decay_countdown", "is_long_lived", "is_new", "new_timer", "blink_state"),
+}
+
+
+def slot_names(cls):
+    """Todos os atributos declarados em __slots__ ao longo da hierarquia."""
+    names = []
+    for klass in reversed(cls.__mro__):
+        names.extend(klass.__dict__.get("__slots__", ()))
+    return names
+
+
+def bytes_per_instance(make, names, count):
+    """Memória alocada (tracemalloc) por instância, sem contar a lista que as guarda."""
+    holder = [None] * count
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    for i in range(count):
+        obj = make()
+        for name in names:
+            object.__setattr__(obj, name, None)
+        holder[i] = obj
+    used = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    return used / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=20000, help="Instâncias medidas por classe")
+    args = parser.parse_args()
+
+    row_bytes = sum(np.dtype(dtype).itemsize for dtype, _ in COLUMNS.values())
+
+    print(f"{'entidade':<16}{'antes (__dict__)':>22}{'objeto':>10}{'linha':>8}{'depois':>10}{'redução':>10}")
+    for cls, baseline in BASELINE_ATTRIBUTES.items():
+        # Classe sem __slots__ com os atributos do layout anterior no __dict__
+        dict_cls = type("Dict" + cls.__name__, (), {})
+        before = bytes_per_instance(lambda: dict_cls(), baseline, args.count)
+        view = bytes_per_instance(lambda: object.__new__(cls), slot_names(cls), args.count)
+        row = row_bytes if issubclass(cls, StoreView) else 0
+        after = view + row
+        label = f"{before:.1f} B ({len(baseline)} atr.)"
+        print(f"{cls.__name__:<16}{label:>22}{view:>8.1f} B{row:>6} B{after:>8.1f} B{1 - after / before:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
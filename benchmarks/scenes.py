@@ -0,0 +1,266 @@
+"""
+Cenas de estresse montadas por código, com o tempo de cada etapa do tick
+medido em separado e comparado com uma linha de base salva.
+
+Cenas:
+    fluctuations: 1000 flutuações espalhadas pelo campo.
+    mixed:        500 partículas estáveis de vários tipos.
+    quark_soup:   300 quarks concentrados no centro, repostos a cada tick
+                  (os bárions formados saem), para estressar check_for_baryon_formation.
+    spark_storm:  rajadas de faíscas e fótons a cada tick.
+
+Etapas (na mesma ordem de QuantumCollectorGame.step): spawn, forces,
+baryons, collisions, decay, update e draw (render com o driver de vídeo
+"dummy"). Cada repetição monta a cena em um jogo novo com a mesma semente,
+roda alguns ticks de aquecimento e mede os seguintes; o valor de cada etapa
+é a média por tick, e o resultado é a mediana entre as repetições.
+
+Os resultados vão para um JSON (--output). Com uma linha de base
+(--baseline, gravada antes com --save-baseline na mesma máquina), o script
+termina com código 1 se alguma etapa ficar mais de --threshold mais lenta
+(e mais de --min-delta ms, para não reprovar por ruído em etapas rápidas).
+
+Uso:
+    python benchmarks/scenes.py [--scenes mixed quark_soup] [--ticks N] [--repeats N]
+                                [--save-baseline] [--threshold 0.25]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+import game_main
+from game_main import Fluctuation, StableParticle, QuantumCollectorGame, HudRenderer, init_display, render
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+STAGES = ("spawn", "forces", "baryons", "collisions", "decay", "update", "draw")
+
+MIXED_KINDS = ("Proton", "Neutron", "Electron", "Positron", "Hydrogen Atom", "Lambda", "Pion_MINUS", "Muon_MINUS")
+QUARK_KINDS = ("Quark_UP", "Quark_DOWN", "Quark_STRANGE")
+QUARK_STATES = ("Red", "Green", "Blue")
+QUARK_SOUP_SIZE = 300
+
+
+# -----------------------
+# Cenas
+# -----------------------
+
+def build_fluctuations(game):
+    rng = game.rng.spawn
+    centers, _ = game.attractor_cache.get(game.r)
+    for _ in range(1000):
+        center = rng.choice(centers)
+        color = game.get_color_for_state(game.interpret_branch(center))
+        game.fluctuations.append(Fluctuation(rng.uniform(0, game_main.WIDTH), rng.uniform(0, game_main.HEIGHT),
+                                             center, color, game))
+
+
+def build_mixed(game):
+    rng = game.rng.spawn
+    for _ in range(500):
+        game.stable_particles.append(StableParticle(
+            rng.uniform(0, game_main.WIDTH), rng.uniform(0, game_main.HEIGHT), (255, 255, 255),
+            rng.choice(MIXED_KINDS), vx=rng.uniform(-1, 1), vy=rng.uniform(-1, 1), game_ref=game))
+
+
+def add_quarks(game, count):
+    rng = game.rng.spawn
+    cx = game_main.WIDTH / 2
+    cy = game_main.HEIGHT / 2
+    for _ in range(count):
+        color = game.get_color_for_state(rng.choice(QUARK_STATES))
+        game.stable_particles.append(StableParticle(
+            cx + rng.uniform(-150, 150), cy + rng.uniform(-150, 150), color, rng.choice(QUARK_KINDS),
+            vx=rng.uniform(-0.5, 0.5), vy=rng.uniform(-0.5, 0.5), game_ref=game))
+
+
+def build_quark_soup(game):
+    add_quarks(game, QUARK_SOUP_SIZE)
+
+
+def refill_quark_soup(game):
+    """Tira os bárions formados no tick anterior e repõe os quarks consumidos."""
+    store = game.stable_particles
+    quark = game.kind_mask(store, QUARK_KINDS)
+    for slot in np.flatnonzero(~quark).tolist():
+        store.kill(store[slot])
+    store.compact()
+    add_quarks(game, QUARK_SOUP_SIZE - len(store))
+
+
+def spark_storm_tick(game):
+    rng = game.rng.spawn
+    for _ in range(20):
+        x = rng.uniform(0, game_main.WIDTH)
+        y = rng.uniform(0, game_main.HEIGHT)
+        game.emit_sparks(x, y, (255, 255, 255), 50)
+        game.emit_photons(x, y, 5)
+
+
+# Nome -> (monta a cena, ação antes de cada tick ou None)
+SCENES = {
+    "fluctuations": (build_fluctuations, None),
+    "mixed": (build_mixed, None),
+    "quark_soup": (build_quark_soup, refill_quark_soup),
+    "spark_storm": (None, spark_storm_tick),
+}
+
+
+# -----------------------
+# Medição
+# -----------------------
+
+def timed_tick(game, screen, hud, totals):
+    """Um tick de QuantumCollectorGame.step (mais o desenho), somando o tempo de cada etapa em `totals`."""
+    clock = time.perf_counter
+    t0 = clock()
+    game.spawn_tick()
+    t1 = clock()
+    game.age_messages()
+    game.apply_forces(False)
+    t2 = clock()
+    game.check_for_baryon_formation()
+    t3 = clock()
+    game.resolve_particle_collisions()
+    game.resolve_fluctuation_collisions()
+    t4 = clock()
+    game.check_for_quantum_decay()
+    t5 = clock()
+    game.update_entities()
+    game.clock.advance()
+    t6 = clock()
+    if screen is not None:
+        render(screen, hud, game)
+    t7 = clock()
+    for stage, start, stop in zip(STAGES, (t0, t1, t2, t3, t4, t5, t6), (t1, t2, t3, t4, t5, t6, t7)):
+        totals[stage] += stop - start
+
+
+def run_scene(name, args, screen, hud):
+    build, per_tick = SCENES[name]
+    per_repeat = {stage: [] for stage in STAGES}
+    population = None
+    for _ in range(args.repeats):
+        game = QuantumCollectorGame(seed=args.seed)
+        totals = dict.fromkeys(STAGES, 0.0)
+        # As reações só registram eventos no barramento (o custo da emissão fica
+        # dentro das etapas); sem despacho, nada vai para o log nem para o console
+        if build is not None:
+            build(game)
+        for tick in range(args.warmup + args.ticks):
+            if per_tick is not None:
+                per_tick(game)
+            if tick == args.warmup:
+                totals = dict.fromkeys(STAGES, 0.0)
+            timed_tick(game, screen, hud, totals)
+        for stage in STAGES:
+            per_repeat[stage].append(totals[stage] * 1000 / args.ticks)
+        population = {"particles": len(game.stable_particles), "fluctuations": len(game.fluctuations),
+                      "sparks": len(game.sparks), "photons": len(game.photons)}
+
+    stages = {stage: statistics.median(values) for stage, values in per_repeat.items()}
+    return {"stages_ms": stages, "total_ms": sum(stages.values()), "population": population}
+
+
+def compare(results, baseline, threshold, min_delta):
+    """Etapas que ficaram mais lentas que a linha de base além do limite."""
+    regressions = []
+    for scene, result in results["scenes"].items():
+        reference = baseline.get("scenes", {}).get(scene)
+        if reference is None:
+            continue
+        for stage, current in result["stages_ms"].items():
+            before = reference["stages_ms"].get(stage)
+            if before is None:
+                continue
+            if current > before * (1 + threshold) and current - before > min_delta:
+                regressions.append(f"{scene}/{stage}: {before:.3f} ms -> {current:.3f} ms "
+                                   f"(+{(current / before - 1) if before else float('inf'):.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenes", nargs="+", choices=sorted(SCENES), default=list(SCENES),
+                        help="Cenas medidas (padrão: todas)")
+    parser.add_argument("--ticks", type=int, default=30, help="Ticks medidos por repetição")
+    parser.add_argument("--warmup", type=int, default=3, help="Ticks descartados no início de cada repetição")
+    parser.add_argument("--repeats", type=int, default=5, help="Repetições por cena (mediana)")
+    parser.add_argument("--seed", type=int, default=1234, help="Semente de todas as repetições")
+    parser.add_argument("--no-draw", action="store_true", help="Não mede a etapa de desenho")
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "latest.json"), help="JSON com os resultados")
+    parser.add_argument("--baseline", default=os.path.join(RESULTS_DIR, "baseline.json"),
+                        help="Linha de base para a comparação")
+    parser.add_argument("--save-baseline", action="store_true", help="Grava os resultados como a nova linha de base")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Piora relativa tolerada por etapa")
+    parser.add_argument("--min-delta", type=float, default=0.05, help="Piora absoluta mínima (ms) para reprovar")
+    args = parser.parse_args()
+
+    screen = hud = None
+    if not args.no_draw:
+        screen, font = init_display()
+        hud = HudRenderer(font)
+
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "ticks": args.ticks,
+            "warmup": args.warmup,
+            "repeats": args.repeats,
+            "seed": args.seed,
+            "force_solver": game_main.FORCE_SOLVER,
+            "effect_backend": game_main.EFFECT_BACKEND,
+            "quantum_decay_mode": game_main.QUANTUM_DECAY_MODE,
+        },
+        "scenes": {},
+    }
+
+    print(f"{'cena':<14}" + "".join(f"{stage:>11}" for stage in STAGES) + f"{'total':>11}   (ms/tick)")
+    for name in args.scenes:
+        result = run_scene(name, args, screen, hud)
+        results["scenes"][name] = result
+        print(f"{name:<14}" + "".join(f"{result['stages_ms'][stage]:>11.3f}" for stage in STAGES)
+              + f"{result['total_ms']:>11.3f}")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Resultados: {args.output}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Linha de base gravada: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("Sem linha de base para comparar (grave uma com --save-baseline).")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold, args.min_delta)
+    if regressions:
+        print(f"Regressões acima de {args.threshold:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"Nenhuma etapa piorou mais de {args.threshold:.0%} em relação à linha de base.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
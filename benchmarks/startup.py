@@ -0,0 +1,80 @@
+"""
+Tempo de inicialização e memória residente do jogo com a pilha quântica
+carregada sob demanda (padrão) e carregada na partida (como antes).
+
+Cada medida roda em um processo novo, para que os imports não venham do
+cache de módulos de uma medida anterior:
+
+- lazy:  importa game_main e cria o QuantumCollectorGame (modo "random").
+- eager: o mesmo, mais o que a inicialização fazia antes: importa o Qiskit e
+  o Aer e cria o backend de medição.
+
+O RSS informado é o pico do processo (ru_maxrss) ao fim da inicialização.
+
+Uso:
+    python benchmarks/startup.py [--runs N]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(mode):
+    """Mede uma inicialização neste processo e devolve os tempos (s) e o RSS (MB)."""
+    sys.path.insert(0, ROOT)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        import game_main
+    imported = time.perf_counter()
+    game = game_main.QuantumCollectorGame()
+    if mode == "eager":
+        game.sim
+    ready = time.perf_counter()
+    return {
+        "import": imported - start,
+        "init": ready - imported,
+        "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "qiskit_loaded": "qiskit" in sys.modules,
+    }
+
+
+def run_child(mode):
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1",
+               QUANTUM_BACKEND="aer")
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", mode],
+                            env=env, cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Processos medidos por modo (mediana)")
+    parser.add_argument("--child", choices=("lazy", "eager"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.child)))
+        return
+
+    print(f"{'modo':<8}{'import':>10}{'init':>10}{'total':>10}{'RSS':>10}  qiskit")
+    for mode in ("lazy", "eager"):
+        runs = [run_child(mode) for _ in range(args.runs)]
+        imports = statistics.median(r["import"] for r in runs)
+        inits = statistics.median(r["init"] for r in runs)
+        totals = statistics.median(r["import"] + r["init"] for r in runs)
+        rss = statistics.median(r["rss_mb"] for r in runs)
+        loaded = "sim" if runs[0]["qiskit_loaded"] else "não"
+        print(f"{mode:<8}{imports * 1000:>8.0f}ms{inits * 1000:>8.0f}ms{totals * 1000:>8.0f}ms{rss:>8.1f}MB  {loaded}")
+
+
+if __name__ == "__main__":
+    main()
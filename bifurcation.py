@@ -0,0 +1,97 @@
+import numpy as np
+
+# -----------------------
+# Mapa Logístico Vetorizado
+# -----------------------
+
+def logistic_orbits(r, x0, n_iters=200, discard=100):
+    """
+    Itera x = r * x * (1 - x) para todas as sementes ao mesmo tempo.
+
+    Args:
+        r (float | np.ndarray): Nível de caos. Um array de forma (R, 1) itera
+            uma grade de valores de r contra as mesmas colunas de sementes.
+        x0 (np.ndarray): Sementes iniciais, forma (N,) ou (R, N).
+        n_iters (int): Número total de iterações.
+        discard (int): Iterações iniciais descartadas (transiente).
+
+    Returns:
+        np.ndarray: Órbitas pós-transiente, forma (..., n_iters - discard).
+    """
+    r = np.asarray(r, dtype=np.float64)
+    x = np.broadcast_to(np.asarray(x0, dtype=np.float64), np.broadcast_shapes(r.shape, np.shape(x0))).copy()
+    kept = max(0, n_iters - discard)
+    orbits = np.empty(x.shape + (kept,))
+    for i in range(n_iters):
+        x = r * x * (1 - x)
+        if i >= discard:
+            orbits[..., i - discard] = x
+    return orbits
+
+
+def cluster_sorted(values, eps=1e-3):
+    """
+    Agrupa valores por ordenação: ordena e abre um novo grupo sempre que a
+    distância para o valor anterior passa de eps. O(n log n), sem o laço
+    valores × grupos de cluster_attractors (a referência escalar, em
+    benchmarks/bifurcation_check.py).
+
+    Returns:
+        list: Tuplas (média, contagem) ordenadas pela média, como cluster_attractors.
+    """
+    values = np.sort(np.asarray(values, dtype=np.float64).ravel())
+    if values.size == 0:
+        return []
+    starts = np.concatenate(([0], np.nonzero(np.diff(values) > eps)[0] + 1))
+    counts = np.diff(np.concatenate((starts, [values.size])))
+    means = np.add.reduceat(values, starts) / counts
+    return list(zip(means.tolist(), counts.tolist()))
+
+
+def _cluster_rows(rows, eps):
+    """cluster_sorted aplicado a cada linha de uma matriz, tudo de uma vez."""
+    n_rows, n_cols = rows.shape
+    if n_cols == 0:
+        return [[] for _ in range(n_rows)]
+    ordered = np.sort(rows, axis=1)
+    # Um grupo começa no início de cada linha ou após um salto maior que eps
+    breaks = np.ones_like(ordered, dtype=bool)
+    breaks[:, 1:] = np.diff(ordered, axis=1) > eps
+    flat_starts = np.flatnonzero(breaks)
+    flat = ordered.ravel()
+    counts = np.diff(np.concatenate((flat_starts, [flat.size])))
+    means = np.add.reduceat(flat, flat_starts) / counts
+    row_of = flat_starts // n_cols
+    per_row = np.bincount(row_of, minlength=n_rows)
+    bounds = np.concatenate(([0], np.cumsum(per_row)))
+    means = means.tolist()
+    counts = counts.tolist()
+    return [list(zip(means[bounds[i]:bounds[i + 1]], counts[bounds[i]:bounds[i + 1]]))
+            for i in range(n_rows)]
+
+
+def sample_branches(r, n_inits=60, tail=20, eps=1e-3, rng=None, n_iters=200):
+    """
+    Versão vetorizada de sample_branches_for_r (benchmarks/bifurcation_check.py):
+    as n_inits sementes são iteradas como um único array e as últimas `tail`
+    posições de cada órbita são agrupadas por cluster_sorted.
+    """
+    return bifurcation_table([r], n_inits, tail, eps, rng, n_iters)[0]
+
+
+def bifurcation_table(r_values, n_inits=60, tail=20, eps=1e-3, rng=None, n_iters=200):
+    """
+    Tabela de bifurcação completa para uma grade de valores de r, em uma
+    única chamada: todas as (len(r_values) × n_inits) órbitas são iteradas
+    como uma matriz 2-D e agrupadas linha a linha.
+
+    Returns:
+        list: Para cada r (na ordem recebida), a lista de tuplas (média, contagem).
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    r_grid = np.asarray(r_values, dtype=np.float64).reshape(-1, 1)
+    seeds = rng.random((r_grid.shape[0], n_inits))
+    # Só as últimas `tail` iterações são guardadas
+    orbits = logistic_orbits(r_grid, seeds, n_iters=n_iters, discard=n_iters - tail)
+    ends = orbits.reshape(r_grid.shape[0], -1)
+    return _cluster_rows(ends, eps)
@@ -0,0 +1,156 @@
+import functools
+
+import numpy as np
+import pygame
+
+# -----------------------
+# Efeitos Visuais Vetorizados
+# -----------------------
+
+# Colunas de cada efeito (nome -> dtype, forma extra por linha)
+EFFECT_COLUMNS = {
+    "x": (np.float64, ()),
+    "y": (np.float64, ()),
+    "vx": (np.float64, ()),
+    "vy": (np.float64, ()),
+    "size": (np.float64, ()),
+    "life": (np.int32, ()),
+    "color": (np.int16, (3,)), # int16 para o desbotamento não dar a volta abaixo de 0
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _disc_offsets(radius):
+    """
+    Deslocamentos (dx, dy) dos pixels que pygame.draw.circle pinta para um
+    disco de raio inteiro centrado na origem (mesma forma do desenho um a um).
+    """
+    size = 2 * radius + 3
+    stamp = pygame.Surface((size, size))
+    pygame.draw.circle(stamp, (255, 255, 255), (radius + 1, radius + 1), radius)
+    dx, dy = np.nonzero(pygame.surfarray.array2d(stamp))
+    return dx - (radius + 1), dy - (radius + 1)
+
+
+class EffectEmitter:
+    """
+    Efeitos de vida curta (faíscas, fótons) guardados em arrays NumPy, uma
+    linha por efeito. Uma rajada acrescenta linhas de uma vez; movimento,
+    gravidade, encolhimento, desbotamento da cor e remoção dos expirados são
+    operações sobre os arrays inteiros, e o desenho escreve direto nos pixels
+    da tela (pygame.surfarray). O custo por quadro não depende de quantos
+    objetos cada rajada cria.
+
+    Args:
+        lifetime (int): Duração de cada efeito, em quadros.
+        speed_scale (float): Fração da velocidade aplicada por quadro.
+        gravity (float): Aceleração somada a vy a cada quadro.
+        size_factor (float): Fator multiplicativo do tamanho por quadro.
+        size_step (float): Redução fixa do tamanho por quadro (mínimo 0).
+        color_fade (int): Quanto cada canal de cor perde por quadro (mínimo 0).
+    """
+
+    def __init__(self, lifetime, speed_scale=1.0, gravity=0.0, size_factor=1.0,
+                 size_step=0.0, color_fade=0, capacity=256):
+        self.lifetime = lifetime
+        self.speed_scale = speed_scale
+        self.gravity = gravity
+        self.size_factor = size_factor
+        self.size_step = size_step
+        self.color_fade = color_fade
+        self.count = 0
+        self.capacity = max(1, capacity)
+        self.columns = {name: np.zeros((self.capacity,) + shape, dtype=dtype)
+                        for name, (dtype, shape) in EFFECT_COLUMNS.items()}
+
+    def _grow(self, needed):
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        for name, (dtype, shape) in EFFECT_COLUMNS.items():
+            column = np.zeros((capacity,) + shape, dtype=dtype)
+            column[:self.count] = self.columns[name][:self.count]
+            self.columns[name] = column
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.count
+
+    def __bool__(self):
+        return self.count > 0
+
+    def emit(self, x, y, color, vx, vy, size):
+        """Acrescenta uma rajada: vx, vy e size são arrays (um valor por efeito)."""
+        n = len(vx)
+        if n == 0:
+            return
+        if self.count + n > self.capacity:
+            self._grow(self.count + n)
+        c = self.columns
+        rows = slice(self.count, self.count + n)
+        c["x"][rows] = x
+        c["y"][rows] = y
+        c["vx"][rows] = vx
+        c["vy"][rows] = vy
+        c["size"][rows] = size
+        c["life"][rows] = self.lifetime
+        c["color"][rows] = color
+        self.count += n
+
+    def step(self):
+        """Avança um quadro e remove (compactando os arrays) os efeitos expirados."""
+        n = self.count
+        if n == 0:
+            return
+        c = self.columns
+        c["x"][:n] += c["vx"][:n] * self.speed_scale
+        c["y"][:n] += c["vy"][:n] * self.speed_scale
+        if self.gravity:
+            c["vy"][:n] += self.gravity
+        c["life"][:n] -= 1
+        if self.size_factor != 1.0:
+            c["size"][:n] *= self.size_factor
+        if self.size_step:
+            np.maximum(c["size"][:n] - self.size_step, 0, out=c["size"][:n])
+        if self.color_fade:
+            np.maximum(c["color"][:n] - self.color_fade, 0, out=c["color"][:n])
+
+        alive = c["life"][:n] > 0
+        kept = int(alive.sum())
+        if kept < n:
+            for column in c.values():
+                column[:kept] = column[:n][alive]
+            self.count = kept
+
+    def draw(self, screen):
+        """Desenha todos os efeitos como discos de raio int(size), agrupados por raio."""
+        n = self.count
+        if n == 0:
+            return
+        c = self.columns
+        radii = c["size"][:n].astype(np.int64)
+        visible = radii >= 1
+        if not visible.any():
+            return
+        xs = c["x"][:n].astype(np.int64)
+        ys = c["y"][:n].astype(np.int64)
+        colors = c["color"][:n].astype(np.uint8)
+
+        try:
+            pixels = pygame.surfarray.pixels3d(screen)
+        except (ValueError, pygame.error):
+            # Superfícies sem acesso direto aos pixels: desenho um a um
+            for i in np.flatnonzero(visible).tolist():
+                pygame.draw.circle(screen, colors[i].tolist(), (int(xs[i]), int(ys[i])), int(radii[i]))
+            return
+
+        width, height = pixels.shape[:2]
+        for radius in np.unique(radii[visible]).tolist():
+            group = np.flatnonzero(radii == radius)
+            dx, dy = _disc_offsets(radius)
+            px = (xs[group, None] + dx[None, :]).ravel()
+            py = (ys[group, None] + dy[None, :]).ravel()
+            rgb = np.repeat(colors[group], len(dx), axis=0)
+            on_screen = (px >= 0) & (px < width) & (py >= 0) & (py < height)
+            pixels[px[on_screen], py[on_screen]] = rgb[on_screen]
+        del pixels # Libera o lock da superfície
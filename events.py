@@ -0,0 +1,208 @@
+import json
+import sys
+from collections import namedtuple
+from enum import IntEnum
+
+import numpy as np
+
+from reactions import BARYONS, KIND_NAMES, STATE_NAMES
+
+# -----------------------
+# Eventos da Simulação
+# -----------------------
+
+class EventKind(IntEnum):
+    """Tipo de um evento da simulação (coluna "kind" do EventBus)."""
+    FLUCTUATION_ANNIHILATION = 0
+    ANNIHILATION = 1
+    DEUTERIUM_FUSION = 2
+    HYDROGEN_CAPTURE = 3
+    DEUTERIUM_CAPTURE = 4
+    BARYON_FORMATION = 5
+    NEUTRON_DECAY = 6
+    STRANGE_DECAY = 7
+    LAMBDA_DECAY = 8
+    PION_DECAY = 9
+    MUON_DECAY = 10
+
+
+# Texto de cada evento no log e no console (bárions e o decaimento do Strange
+# dependem do produto; ver describe)
+EVENT_MESSAGES = {
+    EventKind.FLUCTUATION_ANNIHILATION: "Aniquilação de Flutuação (Matéria + Anti-Matéria) -> Matéria Sobrevivente",
+    EventKind.ANNIHILATION: "Aniquilação! Elétron e Pósitron se transformam em Fótons.",
+    EventKind.DEUTERIUM_FUSION: "Fusão Nuclear! Um núcleo de Deutério foi formado!",
+    EventKind.HYDROGEN_CAPTURE: "Um átomo de Hidrogênio foi formado!",
+    EventKind.DEUTERIUM_CAPTURE: "Átomo de Deutério foi formado pela captura de um Elétron!",
+    EventKind.NEUTRON_DECAY: "Decaimento Beta: Nêutron -> Próton + Elétron (e Antineutrino, simplificado)",
+    EventKind.LAMBDA_DECAY: "Decaimento Fraco: Bárion Lambda -> Próton + Píon Negativo",
+    EventKind.PION_DECAY: "Decaimento Fraco: Píon Negativo -> Múon Negativo (+ Antineutrino, simplificado)",
+    EventKind.MUON_DECAY: "Decaimento Fraco Final: Múon Negativo -> Elétron (+ 2 Neutrinos, simplificado)",
+}
+BARYON_MESSAGES = {rule.kind: rule.message for rule in BARYONS.values()}
+
+# Eventos em que os reagentes são flutuações (códigos de ColorState, não de ParticleKind)
+FLUCTUATION_EVENTS = frozenset({EventKind.FLUCTUATION_ANNIHILATION})
+
+# Reagentes e produtos guardados por evento (posições vazias = -1)
+MAX_REACTANTS = 3
+MAX_PRODUCTS = 2
+
+
+def describe(kind, product=-1):
+    """Texto do evento `kind` cujo primeiro produto é `product`."""
+    if kind == EventKind.BARYON_FORMATION:
+        return BARYON_MESSAGES[product]
+    if kind == EventKind.STRANGE_DECAY:
+        return f"Decaimento Fraco: Quark Estranho -> {KIND_NAMES[product].replace('Quark_', '')}"
+    return EVENT_MESSAGES[kind]
+
+
+# Eventos de um despacho, do mais antigo ao mais novo, em colunas
+EventBatch = namedtuple("EventBatch", "kind tick x y reactants products")
+
+
+class EventBus:
+    """
+    Barramento de eventos da simulação. As reações só gravam um registro
+    compacto (tipo, tick, posição, reagentes e produtos) em um buffer circular
+    de colunas NumPy alocado uma única vez; nada é impresso nem desenhado
+    durante o tick. Os assinantes recebem os eventos em lote, em dispatch(),
+    chamado fora do passo da simulação (uma vez por quadro no laço interativo).
+    Ao encerrar, close() entrega o que falta e fecha os assinantes.
+
+    Se mais de `capacity` eventos forem emitidos entre dois despachos, os mais
+    antigos são sobrescritos e contados em `dropped`.
+
+    Args:
+        capacity (int): Eventos guardados entre dois despachos.
+    """
+
+    def __init__(self, capacity=4096):
+        self.capacity = max(1, capacity)
+        self.kind = np.zeros(self.capacity, dtype=np.int16)
+        self.tick = np.zeros(self.capacity, dtype=np.int64)
+        self.x = np.zeros(self.capacity, dtype=np.float64)
+        self.y = np.zeros(self.capacity, dtype=np.float64)
+        self.reactants = np.full((self.capacity, MAX_REACTANTS), -1, dtype=np.int16)
+        self.products = np.full((self.capacity, MAX_PRODUCTS), -1, dtype=np.int16)
+        self.subscribers = []
+        self.emitted = 0 # total de eventos emitidos
+        self.dropped = 0 # sobrescritos antes de serem despachados
+        self._pending = 0
+
+    def subscribe(self, callback):
+        """Registra `callback(batch)`, chamado a cada despacho com um EventBatch não vazio."""
+        self.subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        self.subscribers.remove(callback)
+
+    def __len__(self):
+        return self._pending
+
+    def emit(self, kind, tick, x, y, reactants=(), products=()):
+        """Grava um evento nas colunas pré-alocadas do buffer (nenhum assinante é chamado aqui)."""
+        i = self.emitted % self.capacity
+        self.kind[i] = kind
+        self.tick[i] = tick
+        self.x[i] = x
+        self.y[i] = y
+        self.reactants[i] = tuple(reactants) + (-1,) * (MAX_REACTANTS - len(reactants))
+        self.products[i] = tuple(products) + (-1,) * (MAX_PRODUCTS - len(products))
+        self.emitted += 1
+        if self._pending == self.capacity:
+            self.dropped += 1
+        else:
+            self._pending += 1
+
+    def drain(self):
+        """Retira os eventos pendentes como um EventBatch (cópias, em ordem de emissão)."""
+        n = self._pending
+        order = np.arange(self.emitted - n, self.emitted) % self.capacity
+        self._pending = 0
+        return EventBatch(self.kind[order], self.tick[order], self.x[order], self.y[order],
+                          self.reactants[order], self.products[order])
+
+    def dispatch(self):
+        """Entrega os eventos pendentes a todos os assinantes e esvazia o buffer."""
+        if not self._pending:
+            return 0
+        batch = self.drain()
+        for callback in self.subscribers:
+            callback(batch)
+        return len(batch.kind)
+
+    def close(self):
+        """Despacha os eventos pendentes e fecha os assinantes que têm close() (ex.: JsonlSink)."""
+        self.dispatch()
+        for callback in self.subscribers:
+            close = getattr(callback, "close", None)
+            if close is not None:
+                close()
+
+
+def coalesce(batch):
+    """
+    Agrupa um lote por texto: [(texto, quantidade)], na ordem em que cada
+    texto apareceu pela primeira vez.
+    """
+    keys = batch.kind.astype(np.int64) * 256 + (batch.products[:, 0] + 1)
+    unique, first, counts = np.unique(keys, return_index=True, return_counts=True)
+    groups = []
+    for index in np.argsort(first).tolist():
+        kind, product = divmod(int(unique[index]), 256)
+        groups.append((describe(EventKind(kind), product - 1), int(counts[index])))
+    return groups
+
+
+def with_count(text, count):
+    return f"{text} (×{count})" if count > 1 else text
+
+
+# -----------------------
+# Assinantes
+# -----------------------
+
+class ConsoleSink:
+    """Escreve cada lote no console em uma única escrita, com os eventos repetidos agrupados (×N)."""
+
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def __call__(self, batch):
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.write("".join(with_count(text, count) + "\n" for text, count in coalesce(batch)))
+
+
+class JsonlSink:
+    """
+    Grava cada evento como uma linha JSON em `path` (tipo, tick, posição,
+    reagentes e produtos pelo nome), uma escrita por lote.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "a", encoding="utf-8")
+
+    def __call__(self, batch):
+        lines = []
+        for kind, tick, x, y, reactants, products in zip(batch.kind.tolist(), batch.tick.tolist(),
+                                                         batch.x.tolist(), batch.y.tolist(),
+                                                         batch.reactants.tolist(), batch.products.tolist()):
+            kind = EventKind(kind)
+            names = STATE_NAMES if kind in FLUCTUATION_EVENTS else KIND_NAMES
+            lines.append(json.dumps({
+                "kind": kind.name.lower(),
+                "tick": tick,
+                "x": round(x, 2),
+                "y": round(y, 2),
+                "reactants": [names[r] for r in reactants if r >= 0],
+                "products": [KIND_NAMES[p] for p in products if p >= 0],
+            }, ensure_ascii=False))
+        self.file.write("\n".join(lines) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
@@ -1,12 +1,29 @@
+import argparse
+import hashlib
 import math
 import random
-import statistics
+import numpy as np
 import pygame
 import time
 import os
+from collections import OrderedDict
 from dotenv import load_dotenv
-from qiskit import QuantumCircuit, transpile
-from qiskit_aer import AerSimulator
+from quantum import (CIRCUIT_CACHE, BatchedDecaySampler, compile_for, create_backend,
+                     base_circuit_signature, fused_circuit_signature, signature_num_qubits)
+from spatial import SpatialHash, NeighborList, brute_force_pairs, filter_pairs_within, pair_triples
+from bifurcation import sample_branches, bifurcation_table
+from effects import EffectEmitter
+from sprites import SpriteCache, quantize, sprite_radius
+from hud import HudRenderer
+from registry import EntityRegistry
+from rng import RngStreams
+from profiler import FrameProfiler
+from events import EventBus, EventKind, ConsoleSink, JsonlSink, coalesce, with_count
+from forces import BarnesHutTree, ParticleMeshSolver, exact_pairwise_deltas, attraction_deltas, short_range_deltas
+from reactions import (ParticleKind, ColorState, KIND_NAMES, KIND_BY_NAME, QUARK_KINDS, STATE_NAMES, STATE_BY_NAME,
+                       PAIR_REACTIONS, FLUCTUATION_REACTIONS, ANNIHILATION, BARYONS, DECAY_TABLE)
+from particle_store import (ParticleStore, StoreView, COLUMNS, column_property, flag_property,
+                            FLAG_DEAD, FLAG_CAPTURED, FLAG_LONG_LIVED, FLAG_NEW, FLAG_BLINK)
 
 # Carrega as variáveis de ambiente do arquivo .env
 load_dotenv()
@@ -25,71 +42,194 @@ PHOTON_SPEED = 50
 # A taxa de criação de novas flutuações, em milissegundos.
 SPAWN_MULTIPLIER = float(os.getenv("SPAWN_MULTIPLIER", 0.5))
 
+# Passo fixo da simulação (ticks por segundo simulado) e taxa de quadros da janela.
+SIM_TICK_RATE = 60
+RENDER_FPS = 60
+# Ticks de simulação por quadro desenhado (velocidade inicial; + / - alteram durante o jogo).
+SIM_TICKS_PER_FRAME = int(os.getenv("SIM_TICKS_PER_FRAME", 1))
+# Atraso máximo (s) que o acumulador recebe de um quadro (ex.: depois de uma travada da janela).
+# O que impede a espiral é o orçamento de tempo dos ticks em main(), não este limite.
+MAX_FRAME_TIME = 0.25
+
 # O nível de caos (r) decai a cada N flutuações criadas.
 R_DECAY_INTERVAL = int(os.getenv("R_DECAY_INTERVAL", 50))
 # A taxa com que o nível de caos (r) decai.
 R_DECAY_RATE = float(os.getenv("R_DECAY_RATE", 0.005))
 
+# Cache dos atratores do mapa logístico (um conjunto por valor quantizado de r)
+ATTRACTOR_CACHE_SIZE = int(os.getenv("ATTRACTOR_CACHE_SIZE", 256))
+ATTRACTOR_R_QUANTUM = float(os.getenv("ATTRACTOR_R_QUANTUM", 0.001))
+# Pré-calcula os atratores na inicialização (1 = ligado)
+ATTRACTOR_CACHE_PREWARM = bool(int(os.getenv("ATTRACTOR_CACHE_PREWARM", 0)))
+
 # Constantes de Física
 EM_CONSTANT = float(os.getenv("EM_CONSTANT", 50.0))
 GRAVITY_CONSTANT = float(os.getenv("GRAVITY_CONSTANT", 1.0))
 NUCLEAR_THRESHOLD = int(os.getenv("NUCLEAR_THRESHOLD", 20))
+NUCLEAR_ATTRACTION_CONSTANT = -2000
 
 # Tempos de vida de partículas e efeitos visuais
 QUARK_DECAY_MAX_LIFETIME = int(os.getenv("QUARK_DECAY_MAX_LIFETIME", 300))
 SPARK_LIFETIME = int(os.getenv("SPARK_LIFETIME", 60))
 PHOTON_LIFETIME = int(os.getenv("PHOTON_LIFETIME", 60))
 
+# Faíscas e fótons: "arrays" (emissor NumPy vetorizado) ou "objects" (um objeto por efeito, com pool)
+EFFECT_BACKEND = os.getenv("EFFECT_BACKEND", "arrays")
+
+# Desenho por sprites pré-renderizados (1 = ligado, 0 = desenha as formas a cada quadro),
+# também para as flutuações (animadas a cada quadro, por isso desligado por padrão),
+# tamanho máximo do cache, passo dos ângulos (graus) e número de fases da ondulação
+USE_SPRITE_CACHE = bool(int(os.getenv("USE_SPRITE_CACHE", 1)))
+FLUCTUATION_SPRITES = bool(int(os.getenv("FLUCTUATION_SPRITES", 0)))
+SPRITE_CACHE_SIZE = int(os.getenv("SPRITE_CACHE_SIZE", 2048))
+SPRITE_ANGLE_STEP = float(os.getenv("SPRITE_ANGLE_STEP", 5))
+SPRITE_PHASE_STEPS = int(os.getenv("SPRITE_PHASE_STEPS", 12))
+
+# As chances de decaimento por checagem de cada partícula instável ficam em
+# reactions.DECAY_TABLE, junto com os produtos
+
+# Como sortear os decaimentos: "random" (gerador padrão), "qiskit" (um circuito
+# por partícula) ou "qiskit_batch" (um único job no simulador por checagem)
+QUANTUM_DECAY_MODE = os.getenv("QUANTUM_DECAY_MODE", "random")
+# Backend que executa os circuitos: "aer" (AerSimulator) ou "analytic"
+# (distribuição exata calculada uma vez e sorteada em lote com NumPy)
+QUANTUM_BACKEND = os.getenv("QUANTUM_BACKEND", "aer")
+
 # Cor de fundo
 BG_COLOR = (0, 0, 0)
 
+# Códigos inteiros dos tipos de partícula e dos estados de cor (coluna "kind" do
+# ParticleStore), indexados pelo nome; os enums ficam em reactions.py
+PARTICLE_TYPE_CODES = KIND_BY_NAME
+COLOR_STATE_CODES = STATE_BY_NAME
+
+# Usa a grade espacial (spatial hash) nas colisões em vez do laço O(n²)
+USE_SPATIAL_HASH = bool(int(os.getenv("USE_SPATIAL_HASH", 1)))
+# Folga (px) das listas de vizinhos de Verlet usadas nas colisões e na força
+# nuclear: a lista só é refeita quando algo anda mais que metade da folga
+NEIGHBOR_SKIN = float(os.getenv("NEIGHBOR_SKIN", 10))
+
+# Solver das forças entre partículas estáveis: "exact" (par a par), "barnes_hut" ou "pm"
+FORCE_SOLVER = os.getenv("FORCE_SOLVER", "exact")
+# Ângulo de abertura do Barnes–Hut (menor = mais preciso e mais lento)
+BARNES_HUT_THETA = float(os.getenv("BARNES_HUT_THETA", 0.5))
+# Resolução da grade do solver particle-mesh (FFT periódica)
+PM_GRID_X = int(os.getenv("PM_GRID_X", 256))
+PM_GRID_Y = int(os.getenv("PM_GRID_Y", 128))
+# Alcance, em células, da correção par a par (P3M) do particle-mesh
+PM_SHORT_RANGE_CELLS = float(os.getenv("PM_SHORT_RANGE_CELLS", 2))
+
+# As constantes de força foram calibradas para um impulso a cada 3 ticks.
+# A força nuclear (curto alcance, pela lista de vizinhos) roda a cada tick com
+# 1/3 do impulso; EM e gravidade (longo alcance) rodam a cada
+# LONG_RANGE_INTERVAL ticks com o impulso proporcional ao intervalo.
+FORCE_REFERENCE_INTERVAL = 3
+LONG_RANGE_INTERVAL = max(1, int(os.getenv("LONG_RANGE_INTERVAL", 3)))
+
+# Confere os contadores do registro de entidades contra uma recontagem completa
+# a cada tick (modo de depuração; 0 = desligado)
+CHECK_INVARIANTS = bool(int(os.getenv("CHECK_INVARIANTS", 0)))
+
+# Profiler por etapa do laço interativo (F3 liga/desliga, F4 grava o trace)
+PROFILER = bool(int(os.getenv("PROFILER", 0)))
+# Quadros da janela dos percentis p50/p95/p99
+PROFILER_WINDOW = int(os.getenv("PROFILER_WINDOW", 240))
+# Quadros guardados para o trace (chrome://tracing / Perfetto) e o arquivo gravado
+PROFILER_TRACE_FRAMES = int(os.getenv("PROFILER_TRACE_FRAMES", 300))
+PROFILER_TRACE_PATH = os.getenv("PROFILER_TRACE_PATH", "frame_trace.json")
+
+# Eventos das reações: tamanho do buffer circular entre dois despachos, eco no
+# console (1 = ligado) e arquivo JSON Lines com todos os eventos (vazio = sem arquivo)
+EVENT_BUFFER_SIZE = int(os.getenv("EVENT_BUFFER_SIZE", 4096))
+EVENT_CONSOLE = bool(int(os.getenv("EVENT_CONSOLE", 1)))
+EVENT_LOG_PATH = os.getenv("EVENT_LOG_PATH", "")
+
 # -----------------------
 # Logística
 # -----------------------
 
-def logistic_iter(r, x0, n_iters=200, discard=100):
-    x = x0
-    seq = []
-    for _ in range(n_iters):
-        x = r * x * (1 - x)
-        seq.append(x)
-    return seq[discard:]
-
-def cluster_attractors(values, eps=1e-3):
-    clusters = []
-    for v in values:
-        placed = False
-        for c in clusters:
-            if abs(c[0] - v) < eps:
-                c.append(v)
-                placed = True
-                break
-        if not placed:
-            clusters.append([v])
-    results = [(statistics.mean(c), len(c)) for c in clusters]
-    results.sort(key=lambda t: t[0])
-    return results
-
-def sample_branches_for_r(r, n_inits=60):
-    all_end_values = []
-    for _ in range(n_inits):
-        x0 = random.random()
-        tail = logistic_iter(r, x0)
-        sampled = tail[-20:]
-        all_end_values.extend(sampled)
-    return cluster_attractors(all_end_values, eps=1e-3)
+class AttractorCache:
+    """
+    Cache LRU de conjuntos de atratores, indexado pelo valor quantizado de r.
+
+    O r só muda a cada R_DECAY_INTERVAL flutuações, então quase todos os
+    spawns reutilizam o mesmo conjunto em vez de rodar o mapa logístico de
+    novo. Os contadores `hits` e `misses` servem para ajustar o tamanho e a
+    quantização.
+
+    Args:
+        compute (callable): Recebe o r quantizado e devolve o valor a guardar.
+        max_size (int): Número máximo de valores de r mantidos.
+        quantum (float): Passo de quantização de r.
+        compute_many (callable): Opcional. Recebe uma lista de r e devolve os
+            valores de todos de uma vez (usado por prewarm).
+    """
+
+    def __init__(self, compute, max_size=256, quantum=0.001, compute_many=None):
+        self.compute = compute
+        self.compute_many = compute_many
+        self.max_size = max(1, max_size)
+        self.quantum = quantum
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, r):
+        return round(r / self.quantum)
+
+    def get(self, r):
+        key = self.key(r)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        entry = self.compute(key * self.quantum)
+        self.entries[key] = entry
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+        return entry
+
+    def prewarm(self, r_values):
+        """Calcula antecipadamente os valores de r informados (sem contar como miss)."""
+        keys = [key for key in dict.fromkeys(self.key(r) for r in r_values) if key not in self.entries]
+        if self.compute_many is not None:
+            values = self.compute_many([key * self.quantum for key in keys])
+        else:
+            values = [self.compute(key * self.quantum) for key in keys]
+        for key, value in zip(keys, values):
+            self.entries[key] = value
+            if len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self.entries),
+            "hit_rate": self.hits / total if total else 0.0,
+        }
 
 # -----------------------
 # Classes de Objetos
 # -----------------------
 
 class QuantumSpark:
-    def __init__(self, x, y, color):
+    __slots__ = ("x", "y", "vx", "vy", "size", "color", "lifetime")
+
+    def __init__(self, x, y, color, rng=random):
+        self.reset(x, y, color, rng)
+
+    def reset(self, x, y, color, rng=random):
+        """(Re)inicializa a faísca; usado também ao reaproveitá-la do EffectPool."""
         self.x = x
         self.y = y
-        self.vx = random.uniform(-1, 1)
-        self.vy = random.uniform(-2, -0.5)
-        self.size = random.randint(1, 3)
+        self.vx = rng.uniform(-1, 1)
+        self.vy = rng.uniform(-2, -0.5)
+        self.size = rng.randint(1, 3)
         self.color = color
         self.lifetime = SPARK_LIFETIME
 
@@ -106,7 +246,13 @@ class QuantumSpark:
             pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), int(self.size))
 
 class Photon:
-    def __init__(self, x, y):
+    __slots__ = ("x", "y", "vx", "vy", "size", "color", "lifetime")
+
+    def __init__(self, x, y, rng=random):
+        self.reset(x, y, rng)
+
+    def reset(self, x, y, rng=random):
+        """(Re)inicializa o fóton; usado também ao reaproveitá-lo do EffectPool."""
         self.x = x
         self.y = y
         self.size = 3
@@ -115,7 +261,7 @@ class Photon:
 
         # --- CORREÇÃO DE VELOCIDADE ---
         # 1. Gera um ângulo de ejeção aleatório (isótropo)
-        angle = random.uniform(0, 2 * math.pi)
+        angle = rng.uniform(0, 2 * math.pi)
         
         # 2. Atribui a velocidade ALTA e CONSTANTE
         self.vx = PHOTON_SPEED * math.cos(angle)
@@ -131,38 +277,104 @@ class Photon:
         if self.lifetime > 0:
             pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), int(self.size))
 
-def generate_wave_shape(x, y, base_size, num_points, distortion, angle_offset=0):
+class EffectPool:
+    """
+    Reaproveita objetos de efeito de vida curta (faíscas, fótons). Os objetos
+    expirados voltam para a lista livre e são reinicializados com reset() na
+    próxima emissão, então no regime estável nenhum objeto novo é criado.
+    """
+
+    __slots__ = ("factory", "free", "created", "reused")
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.free = []
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, *args):
+        if self.free:
+            effect = self.free.pop()
+            effect.reset(*args)
+            self.reused += 1
+            return effect
+        self.created += 1
+        return self.factory(*args)
+
+    def release(self, effect):
+        self.free.append(effect)
+
+    def recycle_expired(self, effects):
+        """Remove de `effects` (no lugar, mantendo a ordem) os efeitos expirados e os devolve ao pool."""
+        alive = 0
+        for effect in effects:
+            if effect.lifetime > 0:
+                effects[alive] = effect
+                alive += 1
+            else:
+                self.free.append(effect)
+        del effects[alive:]
+
+
+def generate_wave_shape(x, y, base_size, num_points, distortion, angle_offset=0, phase=None):
+    # A fase da ondulação segue o relógio do pygame, a menos que seja informada
+    # (relógio da simulação ou fase quantizada dos sprites)
+    if phase is None:
+        phase = pygame.time.get_ticks() * 0.01
     points = []
     for i in range(num_points):
         angle = math.radians(i * (360 / num_points) + angle_offset)
-        current_radius = base_size + math.sin(angle * 5 + pygame.time.get_ticks() * 0.01) * distortion
+        current_radius = base_size + math.sin(angle * 5 + phase) * distortion
         px = x + current_radius * math.cos(angle)
         py = y + current_radius * math.sin(angle)
         points.append((px, py))
     return points
 
-class Fluctuation:
+class Fluctuation(StoreView):
+    __slots__ = ("center_value", "color", "circuit_signature", "creation_time")
+
+    # Atributos numéricos guardados nas colunas do ParticleStore
+    x = column_property("x")
+    y = column_property("y")
+    vx = column_property("vx")
+    vy = column_property("vy")
+    size = column_property("size")
+    angle = column_property("angle")
+    spin_speed = column_property("spin_speed")
+    chaos_level = column_property("chaos_level")
+    animation_timer = column_property("animation_timer")
+    kind = column_property("kind")
+    is_dead = flag_property(FLAG_DEAD)
+
+    @property
+    def state(self):
+        """Nome do estado de cor (derivado do código inteiro em `kind`)."""
+        return STATE_NAMES[self.kind]
+
+    @state.setter
+    def state(self, name):
+        self.kind = STATE_BY_NAME[name]
+
     def __init__(self, x, y, center_value, color, game_instance, chaos_level=0.0, vx=None, vy=None):
+        super().__init__()
         self.x = x
         self.y = y
         self.center_value = center_value
         self.color = color
         self.size = 10
-        self.vx = vx if vx is not None else random.uniform(-1.5, 1.5)
-        self.vy = vy if vy is not None else random.uniform(-1.5, 1.5)
+        rng = game_instance.rng
+        self.vx = vx if vx is not None else rng.physics.uniform(-1.5, 1.5)
+        self.vy = vy if vy is not None else rng.physics.uniform(-1.5, 1.5)
         self.state = game_instance.interpret_branch(center_value)
         self.animation_timer = 0
-        self.pulse_offset = 0
         self.angle = 0
-        self.spin_speed = random.uniform(-5, 5)
+        self.spin_speed = rng.physics.uniform(-5, 5)
 
         self.chaos_level = chaos_level 
-        self.num_points = 12
-        self.distortion_factor = 5
 
-        self.quantum_circuit = self.create_quantum_circuit(self.state)
-        #self.quantum_circuit = None
-        self.creation_time = pygame.time.get_ticks()
+        # Só a assinatura é guardada; o circuito é montado (e compartilhado) sob demanda
+        self.circuit_signature = base_circuit_signature(self.state)
+        self.creation_time = game_instance.clock.get_ticks()
    
     def get_complexity_proxy(self):
         """
@@ -170,26 +382,36 @@ class Fluctuation:
         Retorna um valor constante seguro se o circuito for None.
         """
         # Como o circuito padrão teria 1 qubit, retornamos 1
-        if self.quantum_circuit is None:
+        if self.circuit_signature is None:
             return 1 
         else:
-            return self.quantum_circuit.num_qubits
+            return signature_num_qubits(self.circuit_signature)
+
+    @property
+    def quantum_circuit(self):
+        """Template compartilhado do circuito da flutuação (não deve ser modificado)."""
+        if self.circuit_signature is None:
+            return None
+        return CIRCUIT_CACHE.get(self.circuit_signature)
 
     def create_quantum_circuit(self, state):
-        qc = QuantumCircuit(1, 1)
-        if "Anti" in state:
-            qc.x(0)
-        qc.h(0)
-        qc.measure(0, 0)
-        return qc
+        return CIRCUIT_CACHE.get(base_circuit_signature(state))
 
-    def update_visuals_from_chaos(self):
-        self.num_points = 8 + int((1.0 - self.chaos_level) * 4)
-        self.distortion_factor = 5 + (self.chaos_level * 15)
+    # Parâmetros visuais derivados do nível de caos
+    @property
+    def num_points(self):
+        return 8 + int((1.0 - self.chaos_level) * 4)
 
-    def update(self):
-        self.update_visuals_from_chaos()
+    @property
+    def distortion_factor(self):
+        return 5 + (self.chaos_level * 15)
+
+    @property
+    def pulse_offset(self):
+        return math.sin(self.animation_timer * 0.1) * 3
 
+    def update(self):
+        """Atualização escalar (o jogo usa ParticleStore.step para a população inteira)."""
         self.x += self.vx
         self.y += self.vy
         self.animate()
@@ -206,23 +428,79 @@ class Fluctuation:
         
     def animate(self):
         self.animation_timer += 1
-        self.pulse_offset = math.sin(self.animation_timer * 0.1) * 3
         
-    def draw(self, screen):
+    def draw(self, screen, now=None):
+        """Desenha a flutuação; `now` (ms) é o relógio usado na ondulação (padrão: pygame)."""
+        if now is None:
+            now = pygame.time.get_ticks()
         current_size = self.size + self.pulse_offset
-        if current_size > 0:
-            points = generate_wave_shape(self.x, self.y, current_size, self.num_points, self.distortion_factor, self.angle)
+        if current_size <= 0:
+            return
+        if not (USE_SPRITE_CACHE and FLUCTUATION_SPRITES):
+            points = generate_wave_shape(self.x, self.y, current_size, self.num_points, self.distortion_factor, self.angle,
+                                         now * 0.01)
             pygame.draw.polygon(screen, self.color, points)
+            return
+
+        # Sprite indexado pela forma quantizada: tamanho (com o pulso), distorção, ângulo e fase
+        color = self.color
+        num_points = self.num_points
+        size = quantize(current_size, 0.5)
+        distortion = quantize(self.distortion_factor, 0.5)
+        # Os vértices se repetem a cada 360 / num_points graus de giro
+        angle = quantize(self.angle, SPRITE_ANGLE_STEP, 360 / num_points)
+        phase = quantize(now * 0.01, 2 * math.pi / SPRITE_PHASE_STEPS, 2 * math.pi)
+        key = ("fluctuation", color, num_points, size, distortion, angle, phase)
+
+        def render(surface, cx, cy):
+            points = generate_wave_shape(cx, cy, size, num_points, distortion, angle, phase)
+            pygame.draw.polygon(surface, color, points)
+
+        SPRITE_CACHE.blit(screen, key, sprite_radius(size + distortion), self.x, self.y, render)
+
+class StableParticle(StoreView):
+    __slots__ = ("color", "magnetic_field_strength", "game")
+
+    # Atributos numéricos guardados nas colunas do ParticleStore
+    x = column_property("x")
+    y = column_property("y")
+    vx = column_property("vx")
+    vy = column_property("vy")
+    mass = column_property("mass")
+    charge = column_property("charge")
+    size = column_property("size")
+    angle = column_property("angle")
+    spin_speed = column_property("spin_speed")
+    kind = column_property("kind")
+    lifetime = column_property("lifetime")
+    decay_countdown = column_property("decay_countdown")
+    new_timer = column_property("new_timer")
+    is_dead = flag_property(FLAG_DEAD)
+    is_captured = flag_property(FLAG_CAPTURED)
+    is_long_lived = flag_property(FLAG_LONG_LIVED)
+    is_new = flag_property(FLAG_NEW)
+    blink_state = flag_property(FLAG_BLINK)
+
+    @property
+    def particle_type(self):
+        """Nome do tipo (derivado do código inteiro em `kind`), mantido por compatibilidade."""
+        return KIND_NAMES[self.kind]
+
+    @particle_type.setter
+    def particle_type(self, name):
+        self.kind = KIND_BY_NAME[name]
 
-class StableParticle:
     def __init__(self, x, y, color, particle_type, magnetic_field_strength=0.1, vx=0, vy=0, is_captured=False, game_ref=None):
+        super().__init__()
         self.x = x
         self.y = y
         self.color = color
         self.particle_type = particle_type
         self.magnetic_field_strength = magnetic_field_strength
-        self.angle = random.uniform(0, 360)
-        self.spin_speed = random.uniform(-3, 3)
+        # Sem o jogo (ex.: scripts), orientação e giro saem do módulo random
+        rng = game_ref.rng.physics if game_ref is not None else random
+        self.angle = rng.uniform(0, 360)
+        self.spin_speed = rng.uniform(-3, 3)
         self.vx = vx
         self.vy = vy
         self.is_captured = is_captured
@@ -248,7 +526,7 @@ class StableParticle:
         self.set_attributes()
         
         # Lógica de decaimento Quântico (Quark)
-        if self.particle_type.startswith("Quark_"):
+        if self.kind in QUARK_KINDS:
             self.is_long_lived = False
 
     def set_attributes(self):
@@ -292,6 +570,7 @@ class StableParticle:
         pass
 
     def update(self):
+        """Atualização escalar (o jogo usa ParticleStore.step para a população inteira)."""
         if self.is_dead:
             return 
             
@@ -329,89 +608,123 @@ class StableParticle:
     # REMOVIDO: A função determine_size, pois a lógica foi para set_attributes
     # REMOVIDO: A função determine_color, pois a lógica foi para set_attributes
 
-    def draw(self, screen):
+    def draw(self, screen, now=None):
         # Lembre-se: esta função requer o módulo pygame e as constantes de cor e tamanho.
+        # `now` (ms) é o relógio que move a órbita dos átomos (padrão: pygame)
+        if now is None:
+            now = pygame.time.get_ticks()
         
         # Nao desenha se estiver piscando
         if self.is_new and not self.blink_state:
             return
 
+        if not USE_SPRITE_CACHE:
+            self.render_shape(screen, self.x, self.y, self.angle, now * 0.1)
+            return
+
+        key, extent, angle, orbit_angle = self.sprite_key(now)
+        SPRITE_CACHE.blit(screen, key, sprite_radius(extent), self.x, self.y,
+                          lambda surface, cx, cy: self.render_shape(surface, cx, cy, angle, orbit_angle))
+
+    def sprite_key(self, now):
+        """
+        Chave do sprite (tudo o que muda a aparência, com ângulos quantizados),
+        alcance do desenho a partir do centro e os ângulos usados no sprite.
+        """
+        kind = self.kind
+        orbit_radius = ATOM_ORBITS.get(kind)
+        if orbit_radius is not None:
+            orbit_angle = quantize(now * 0.1, SPRITE_ANGLE_STEP, 360)
+            return (kind, orbit_angle), orbit_radius + 5, 0.0, orbit_angle
+
+        size = self.size
+        charge = self.charge
+        magnetic_field_strength = self.magnetic_field_strength
+        polygon_extent, period = ORIENTED_SHAPES.get(kind, (0, None))
+        angle = quantize(self.angle, SPRITE_ANGLE_STEP, period) if period else 0.0
+        extent = max(size + 2, polygon_extent)
+        if charge != 0:
+            extent = max(extent, size * 2 + magnetic_field_strength * 10)
+        key = (kind, self.color, size, charge > 0, charge < 0, magnetic_field_strength, self.is_captured, angle)
+        return key, extent, angle, 0.0
+
+    def render_shape(self, surface, x, y, angle, orbit_angle):
+        """Desenha a partícula centrada em (x, y) com a orientação e a órbita informadas."""
+
         # 1. Desenho para Átomos
         if self.particle_type == "Hydrogen Atom":
-            pygame.draw.circle(screen, (100, 100, 100), (int(self.x), int(self.y)), 12)
-            pygame.draw.circle(screen, (50, 50, 50), (int(self.x), int(self.y)), 25, 1)
-            orbit_angle = pygame.time.get_ticks() * 0.1
-            electron_x = self.x + 25 * math.cos(math.radians(orbit_angle))
-            electron_y = self.y + 25 * math.sin(math.radians(orbit_angle))
-            pygame.draw.circle(screen, (0, 255, 0), (int(electron_x), int(electron_y)), 5)
+            pygame.draw.circle(surface, (100, 100, 100), (int(x), int(y)), 12)
+            pygame.draw.circle(surface, (50, 50, 50), (int(x), int(y)), 25, 1)
+            electron_x = x + 25 * math.cos(math.radians(orbit_angle))
+            electron_y = y + 25 * math.sin(math.radians(orbit_angle))
+            pygame.draw.circle(surface, (0, 255, 0), (int(electron_x), int(electron_y)), 5)
             return
 
         if self.particle_type == "Deuterium Atom":
-            pygame.draw.circle(screen, (150, 150, 255), (int(self.x), int(self.y)), 15)
-            pygame.draw.circle(screen, (50, 50, 50), (int(self.x), int(self.y)), 30, 1)
-            orbit_angle = pygame.time.get_ticks() * 0.1
-            electron_x = self.x + 30 * math.cos(math.radians(orbit_angle))
-            electron_y = self.y + 30 * math.sin(math.radians(orbit_angle))
-            pygame.draw.circle(screen, (0, 255, 0), (int(electron_x), int(electron_y)), 5)
+            pygame.draw.circle(surface, (150, 150, 255), (int(x), int(y)), 15)
+            pygame.draw.circle(surface, (50, 50, 50), (int(x), int(y)), 30, 1)
+            electron_x = x + 30 * math.cos(math.radians(orbit_angle))
+            electron_y = y + 30 * math.sin(math.radians(orbit_angle))
+            pygame.draw.circle(surface, (0, 255, 0), (int(electron_x), int(electron_y)), 5)
             return
         
         # 2. Desenho para Lambda (Bárion Estranho)
         if self.particle_type == "Lambda":
-            pygame.draw.circle(screen, (150, 50, 150), (int(self.x), int(self.y)), 15)
+            pygame.draw.circle(surface, (150, 50, 150), (int(x), int(y)), 15)
             points = []
             size = 18 
             for i in range(3):
-                angle = math.radians(i * 120 + self.angle + 180)
-                px = self.x + size * math.cos(angle)
-                py = self.y + size * math.sin(angle)
+                vertex = math.radians(i * 120 + angle + 180)
+                px = x + size * math.cos(vertex)
+                py = y + size * math.sin(vertex)
                 points.append((px, py))
-            pygame.draw.polygon(screen, (0, 255, 255), points) 
+            pygame.draw.polygon(surface, (0, 255, 255), points) 
             return
         
         # 3. Desenho para Próton
         if self.particle_type == "Proton":
-            pygame.draw.circle(screen, (255, 255, 0), (int(self.x), int(self.y)), 12)
+            pygame.draw.circle(surface, (255, 255, 0), (int(x), int(y)), 12)
             points = []
             size = 15
             for i in range(3):
-                angle = math.radians(i * 120 + self.angle)
-                px = self.x + size * math.cos(angle)
-                py = self.y + size * math.sin(angle)
+                vertex = math.radians(i * 120 + angle)
+                px = x + size * math.cos(vertex)
+                py = y + size * math.sin(vertex)
                 points.append((px, py))
-            pygame.draw.polygon(screen, self.color, points, 2)
+            pygame.draw.polygon(surface, self.color, points, 2)
             # Continua para desenhar o campo EM
         
         # 4. Desenho para Deutério (Núcleo)
         if self.particle_type == "Deuterium":
-            pygame.draw.circle(screen, (100, 100, 255), (int(self.x), int(self.y)), 15)
+            pygame.draw.circle(surface, (100, 100, 255), (int(x), int(y)), 15)
             points = []
             size = 20
             for i in range(4):
-                angle = math.radians(i * 90 + self.angle)
-                px = self.x + size * math.cos(angle)
-                py = self.y + size * math.sin(angle)
+                vertex = math.radians(i * 90 + angle)
+                px = x + size * math.cos(vertex)
+                py = y + size * math.sin(vertex)
                 points.append((px, py))
-            pygame.draw.polygon(screen, self.color, points, 2)
+            pygame.draw.polygon(surface, self.color, points, 2)
             # Continua para desenhar o campo EM
             
         # 5. Desenho para Nêutron (usando forma de onda, se aplicável)
         if self.particle_type == "Neutron":
             num_points = 6
             distortion = 1 
-            # points = generate_wave_shape(self.x, self.y, self.size, num_points, distortion, self.angle)
+            # points = generate_wave_shape(x, y, self.size, num_points, distortion, angle)
             
             # Substitua a chamada acima por um desenho simples, se generate_wave_shape não for fornecida:
-            pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.size) 
+            pygame.draw.circle(surface, self.color, (int(x), int(y)), self.size) 
             
             if self.is_captured:
                  final_color = (self.color[0] + 50, self.color[1] + 50, self.color[2] + 50)
-                 pygame.draw.circle(screen, final_color, (int(self.x), int(self.y)), self.size + 2)
+                 pygame.draw.circle(surface, final_color, (int(x), int(y)), self.size + 2)
 
 
         # 6. Desenho Genérico (Léptons, Mésons e Quarks)
         # Inclui: Electron, Positron, Muon_MINUS, Pion_MINUS e Quarks
         if self.particle_type in ["Electron", "Positron", "Muon_MINUS", "Pion_MINUS"] or self.particle_type.startswith("Quark_"):
-            pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.size)
+            pygame.draw.circle(surface, self.color, (int(x), int(y)), self.size)
             
         # 7. Desenho do Campo Eletromagnético (Aplica-se a todas as carregadas não atômicas)
         if self.charge != 0 and not self.particle_type.endswith("Atom"):
@@ -420,44 +733,246 @@ class StableParticle:
             if self.charge > 0:
                 field_color = (255, 165, 0) # Laranja para carga positiva
             
-            pygame.draw.circle(screen, field_color, 
-                               (int(self.x), int(self.y)), 
+            pygame.draw.circle(surface, field_color, 
+                               (int(x), int(y)), 
                                int(field_radius), 
                                1)
+
+
+# Sprites pré-renderizados compartilhados por todas as entidades
+SPRITE_CACHE = SpriteCache(SPRITE_CACHE_SIZE)
+
+# Átomos: raio da órbita do elétron (o sprite muda com a posição do elétron)
+ATOM_ORBITS = {ParticleKind.HYDROGEN_ATOM: 25, ParticleKind.DEUTERIUM_ATOM: 30}
+# Formas com orientação: alcance do polígono e simetria de rotação (graus)
+ORIENTED_SHAPES = {ParticleKind.LAMBDA: (18, 120), ParticleKind.PROTON: (15, 120), ParticleKind.DEUTERIUM: (20, 90)}
+
 # -----------------------
 # Game logic
 # -----------------------
+class SimulationClock:
+    """
+    Relógio da simulação, em milissegundos, com a mesma interface de
+    pygame.time (get_ticks). Avança um passo fixo por tick de simulação, então
+    não depende de janela nem do tempo real (modo headless, testes em lote).
+    """
+
+    def __init__(self, tick_ms=1000 / 60):
+        self.tick_ms = tick_ms
+        self.ticks = 0
+
+    def advance(self, ticks=1):
+        self.ticks += ticks
+
+    def get_ticks(self):
+        return int(self.ticks * self.tick_ms)
+
+
 class QuantumCollectorGame:
-    def __init__(self):
+    def __init__(self, clock=None, seed=None):
+        # Fluxos aleatórios por subsistema: a mesma semente reproduz a simulação
+        self.rng = RngStreams(seed)
         self.r = 4.0
         self.quantum_bias = 0.0
-        self.fluctuations = []
-        self.sparks = []
-        self.stable_particles = []
-        self.photons = []
-        self.last_spawn_time = pygame.time.get_ticks()
+        self.clock = clock if clock is not None else SimulationClock()
+        # Contagens por tipo e totais de matéria, mantidos a cada criação e destruição
+        self.registry = EntityRegistry(len(ParticleKind), len(ColorState))
+        self.fluctuations = ParticleStore(counter=self.registry.fluctuations)
+        self.effect_backend = EFFECT_BACKEND
+        if self.effect_backend == "arrays":
+            # Mesma dinâmica de QuantumSpark.update / Photon.update, em arrays
+            self.sparks = EffectEmitter(SPARK_LIFETIME, speed_scale=0.5, gravity=0.1, size_factor=0.98, color_fade=5)
+            self.photons = EffectEmitter(PHOTON_LIFETIME, size_step=0.1)
+            self.effect_rng = self.rng.visuals.generator
+        else:
+            self.sparks = []
+            self.photons = []
+        self.spark_pool = EffectPool(QuantumSpark)
+        self.photon_pool = EffectPool(Photon)
+        self.stable_particles = ParticleStore(counter=self.registry.particles)
+        self.last_spawn_time = self.clock.get_ticks()
+        # Estado do mapa logístico que controla a frequência de spawn
+        self.logistic_x = self.rng.spawn.uniform(0.1, 0.9)
         self.game_over = False
         self.mouse_pos = None
-        self.particle_counts = {}
         self.spawn_counter = 0 
-        self.sim = AerSimulator()
-        self.matter_created = 0
-        self.matter_stabilized = 0
+        # Backend de medição e sorteador em lote: criados no primeiro uso (ver sim)
+        self._sim = None
+        self._decay_sampler = None
+        self.quantum_decay_mode = QUANTUM_DECAY_MODE
         self.force_update_counter = 0
+        self.force_solver = FORCE_SOLVER
+        # Listas de vizinhos (Verlet) de cada população, mantidas entre ticks
+        self.particle_neighbors = NeighborList(WIDTH, HEIGHT, NEIGHBOR_SKIN)
+        self.fluctuation_neighbors = NeighborList(WIDTH, HEIGHT, NEIGHBOR_SKIN)
+        self.barnes_hut_theta = BARNES_HUT_THETA
+        self.particle_mesh = None # (EM, gravidade), criados no primeiro uso do solver "pm"
         self.baryon_check_counter = 0 
         self.quantum_decay_counter = 0
         self.message_log = []
         self.max_messages = 5 # Limita o número de linhas exibidas na tela
         self.message_duration = 300 # Tempo de vida da mensagem (em frames)
+        # Reações emitem eventos; log, console e arquivo os recebem em lote em events.dispatch()
+        self.events = EventBus(EVENT_BUFFER_SIZE)
+        self.events.subscribe(self.log_events)
+        if EVENT_CONSOLE:
+            self.events.subscribe(ConsoleSink())
+        if EVENT_LOG_PATH:
+            self.events.subscribe(JsonlSink(EVENT_LOG_PATH))
+        # Temporizadores por etapa; só medem dentro de um quadro do laço interativo
+        self.profiler = FrameProfiler(PROFILER, PROFILER_WINDOW, PROFILER_TRACE_FRAMES)
+
+        # Tabelas de reação (reactions.py) ligadas aos métodos que as executam
+        self.pair_handlers = {pair: getattr(self, name) for pair, name in PAIR_REACTIONS.items()}
+        self.decay_handlers = {kind: (rule.chance, getattr(self, rule.handler)) for kind, rule in DECAY_TABLE.items()}
+
+        self.attractor_cache = AttractorCache(self.compute_attractors, ATTRACTOR_CACHE_SIZE, ATTRACTOR_R_QUANTUM,
+                                              compute_many=self.compute_attractor_table)
+        if ATTRACTOR_CACHE_PREWARM:
+            self.attractor_cache.prewarm(self.reachable_r_values())
+
+    def step(self, mouse_pressed=False):
+        """
+        Avança a simulação em um tick, sem desenhar nada: spawn, interações,
+        decaimentos, movimento e efeitos. Pode ser chamado sem janela aberta.
+        """
+        profile = self.profiler.scope
+        with profile("spawn"):
+            self.spawn_tick()
+        with profile("interactions"):
+            self.check_interactions(mouse_pressed)
+        with profile("decay"):
+            self.check_for_quantum_decay()
+        with profile("update"):
+            self.update_entities()
+
+        self.clock.advance()
+        if CHECK_INVARIANTS:
+            self.registry.verify(self.stable_particles, self.fluctuations)
+
+    def spawn_tick(self):
+        """
+        Atualiza o valor do mapa logístico e usa-o como probabilidade de criar
+        uma flutuação (SPAWN_MULTIPLIER ajusta a frequência).
+        """
+        self.logistic_x = self.r * self.logistic_x * (1 - self.logistic_x)
+        if self.rng.spawn.random() < self.logistic_x * SPAWN_MULTIPLIER:
+            self.spawn_fluctuation()
+
+    def update_entities(self):
+        """Movimento, compactação dos mortos do tick e avanço dos efeitos."""
+        # Movimento, wrap-around e contagens vetorizados sobre toda a população
+        # (as entidades mortas neste tick ficam paradas)
+        self.fluctuations.step(WIDTH, HEIGHT)
+        self.stable_particles.step(WIDTH, HEIGHT)
+
+        # Reações e decaimentos só marcam as entidades consumidas (FLAG_DEAD);
+        # todas saem aqui, em uma única compactação por tick
+        self.fluctuations.compact()
+        self.stable_particles.compact()
+        if self.effect_backend == "arrays":
+            self.sparks.step()
+            self.photons.step()
+        else:
+            for s in self.sparks:
+                s.update()
+            for ph in self.photons:
+                ph.update()
+            self.spark_pool.recycle_expired(self.sparks)
+            self.photon_pool.recycle_expired(self.photons)
+
+    @property
+    def sim(self):
+        """
+        Backend de medição (AerSimulator ou analítico), criado só quando um
+        circuito é executado pela primeira vez: no modo de decaimento padrão
+        ("random") o Qiskit e o Aer nunca chegam a ser importados.
+        """
+        if self._sim is None:
+            self._sim = create_backend(QUANTUM_BACKEND, rng=self.rng.decay.generator)
+        return self._sim
+
+    @property
+    def decay_sampler(self):
+        if self._decay_sampler is None:
+            self._decay_sampler = BatchedDecaySampler(self.sim)
+        return self._decay_sampler
 
-    def add_message(self, text):
-        """Adiciona uma nova mensagem ao log com um contador de frames."""
-        self.message_log.append({"text": text, "timer": self.message_duration})
+    def state_digest(self):
+        """
+        Resumo (SHA-256) do estado da simulação: todas as colunas e atributos
+        das duas populações, mapa logístico, contadores e relógio. Com a mesma
+        semente e o mesmo número de ticks, o resumo é o mesmo.
+        """
+        digest = hashlib.sha256()
+        for store in (self.fluctuations, self.stable_particles):
+            n = len(store)
+            for name in COLUMNS:
+                digest.update(store.columns[name][:n].tobytes())
+        digest.update(repr([(f.center_value, f.color, f.circuit_signature) for f in self.fluctuations]).encode())
+        digest.update(repr([p.color for p in self.stable_particles]).encode())
+        registry = self.registry
+        digest.update(repr((self.r, self.logistic_x, self.spawn_counter, self.clock.get_ticks(),
+                            registry.matter_created, registry.matter_stabilized,
+                            registry.particles.created, registry.fluctuations.created)).encode())
+        return digest.hexdigest()
+
+    @property
+    def matter_created(self):
+        return self.registry.matter_created
+
+    @property
+    def matter_stabilized(self):
+        return self.registry.matter_stabilized
+
+    def emit_sparks(self, x, y, color, count):
+        """Emite `count` faíscas em (x, y), reaproveitando as expiradas."""
+        if self.effect_backend == "arrays":
+            rng = self.effect_rng
+            self.sparks.emit(x, y, color, rng.uniform(-1, 1, count), rng.uniform(-2, -0.5, count),
+                             rng.integers(1, 4, count))
+            return
+        for _ in range(count):
+            self.sparks.append(self.spark_pool.acquire(x, y, color, self.rng.visuals))
+
+    def emit_photons(self, x, y, count=1):
+        """Emite `count` fótons em (x, y), reaproveitando os expirados."""
+        if self.effect_backend == "arrays":
+            # Direção isótropa com a velocidade ALTA e CONSTANTE do Photon
+            angles = self.effect_rng.uniform(0, 2 * math.pi, count)
+            self.photons.emit(x, y, (255, 255, 0), PHOTON_SPEED * np.cos(angles), PHOTON_SPEED * np.sin(angles),
+                              np.full(count, 3.0))
+            return
+        for _ in range(count):
+            self.photons.append(self.photon_pool.acquire(x, y, self.rng.visuals))
+
+    def add_message(self, text, count=1):
+        """
+        Adiciona uma nova mensagem ao log com um contador de frames. Uma
+        mensagem igual ainda visível é substituída, somando as ocorrências
+        (exibidas como "(×N)").
+        """
+        for msg in self.message_log:
+            if msg['key'] == text:
+                self.message_log.remove(msg)
+                count += msg['count']
+                break
+        self.message_log.append({"key": text, "count": count, "text": with_count(text, count),
+                                 "timer": self.message_duration})
         
         # Limita o log para manter apenas as mensagens mais recentes
         if len(self.message_log) > self.max_messages * 2: # Limite um pouco maior para evitar picos
             self.message_log = self.message_log[-self.max_messages:]
         
+    def emit_event(self, kind, x, y, reactants=(), products=()):
+        """Registra um evento de reação no tick atual (ver events.EventBus)."""
+        self.events.emit(kind, self.clock.ticks, x, y, reactants, products)
+
+    def log_events(self, batch):
+        """Assinante do log na tela: um lote vira uma mensagem por texto, com a contagem."""
+        for text, count in coalesce(batch):
+            self.add_message(text, count)
+
     def get_color_for_state(self, state):
         if state == "Red": return (255, 0, 0)
         if state == "Green": return (0, 255, 0)
@@ -501,6 +1016,57 @@ class QuantumCollectorGame:
         else: 
             return "Blue"
 
+    def collision_pairs(self, objects):
+        """
+        Pares (i, j) de índices de `objects` que podem estar colidindo.
+
+        Com a grade espacial, os candidatos vêm da lista de vizinhos da
+        população (neighbor_pairs) e são filtrados pela soma dos tamanhos.
+        """
+        n = len(objects)
+        xs = objects.columns["x"][:n]
+        ys = objects.columns["y"][:n]
+        sizes = objects.columns["size"][:n]
+
+        if not USE_SPATIAL_HASH:
+            first, second = brute_force_pairs(n)
+        else:
+            first, second = self.neighbor_pairs(objects)
+        first, second = filter_pairs_within(xs, ys, first, second, radii=sizes)
+        return zip(first.tolist(), second.tolist())
+
+    def neighbor_pairs(self, objects):
+        """
+        Pares da lista de vizinhos (Verlet) de `objects`: contém todos os pares
+        a menos do maior raio de interação, a maior soma de tamanhos ou
+        NUCLEAR_THRESHOLD + 10 (captura de elétrons).
+        """
+        n = len(objects)
+        sizes = objects.columns["size"][:n]
+        max_size = float(sizes.max()) if n else 0.0
+        reach = max(2 * max_size, NUCLEAR_THRESHOLD + 10, 1)
+        neighbors = self.particle_neighbors if objects is self.stable_particles else self.fluctuation_neighbors
+        return neighbors.pairs(objects.columns["x"][:n], objects.columns["y"][:n], objects.layout, reach)
+
+    def compute_attractors(self, r):
+        """Centros dos atratores para r e, separadamente, os que geram quarks."""
+        return self.split_attractor_centers(sample_branches(r, n_inits=80, rng=self.rng.spawn.generator))
+
+    def compute_attractor_table(self, r_values):
+        """compute_attractors para vários r de uma vez (uma única tabela de bifurcação)."""
+        return [self.split_attractor_centers(branches) for branches in bifurcation_table(r_values, n_inits=80, rng=self.rng.spawn.generator)]
+
+    def split_attractor_centers(self, branches):
+        centers = tuple(c for c, _ in branches)
+        quark_centers = tuple(c for c in centers if self.interpret_branch(c) in ["Red", "Blue", "Green"])
+        return centers, quark_centers
+
+    def reachable_r_values(self):
+        """Valores que r assume ao decair de 4.0 até 3.0, na ordem em que aparecem."""
+        step = max(R_DECAY_RATE, ATTRACTOR_R_QUANTUM)
+        count = min(int(round((4.0 - 3.0) / step)) + 1, self.attractor_cache.max_size)
+        return [max(3.0, 4.0 - i * step) for i in range(count)]
+
     def spawn_fluctuation(self):
         self.spawn_counter += 1
         if len(self.fluctuations) + len(self.stable_particles) >= MAX_OBJECTS:
@@ -510,37 +1076,35 @@ class QuantumCollectorGame:
             self.r = max(3.0, self.r - R_DECAY_RATE) 
             self.spawn_counter = 0
         
-        branches = sample_branches_for_r(self.r, n_inits=80)
-        if not branches:
+        centers, quark_centers = self.attractor_cache.get(self.r)
+        rng = self.rng.spawn
+        if not centers:
             return
         
-        centers, freqs = zip(*branches)
-        
         # A nova lógica para favorecer a criação de quarks down foi adicionada aqui
         # Ajustando a lógica de escolha para dar peso a "Blue" (Quark Down)
         # Assumindo que o "Blue" é o Quark_DOWN, a probabilidade está agora maior
-        if random.random() < 0.5: # 50% de chance de priorizar quarks
-            quark_centers = [c for c in centers if self.interpret_branch(c) in ["Red", "Blue", "Green"]]
+        if rng.random() < 0.5: # 50% de chance de priorizar quarks
             if quark_centers:
-                new_fluctuation_center = random.choice(quark_centers)
+                new_fluctuation_center = rng.choice(quark_centers)
                 outcome_state = self.interpret_branch(new_fluctuation_center)
             else:
-                new_fluctuation_center = random.choice(centers)
+                new_fluctuation_center = rng.choice(centers)
                 outcome_state = self.interpret_branch(new_fluctuation_center)
         else:
-            new_fluctuation_center = random.choice(centers)
+            new_fluctuation_center = rng.choice(centers)
             outcome_state = self.interpret_branch(new_fluctuation_center)
 
         color = self.get_color_for_state(outcome_state)
         
         anti_state, anti_color = self.get_anti_state_and_color(outcome_state)
-        chaos_level = random.uniform(0.0, 1.0) 
+        chaos_level = rng.uniform(0.0, 1.0) 
         
-        x_pos = random.randint(100, WIDTH - 100)
-        y_pos = random.randint(100, HEIGHT - 100)
+        x_pos = rng.randint(100, WIDTH - 100)
+        y_pos = rng.randint(100, HEIGHT - 100)
         
-        vx = random.uniform(-1, 1)
-        vy = random.uniform(-1, 1)
+        vx = rng.uniform(-1, 1)
+        vy = rng.uniform(-1, 1)
         
         new_fluctuation = Fluctuation(x_pos - 50, y_pos - 50, new_fluctuation_center, color, self, chaos_level, vx=vx, vy=vy)
         self.fluctuations.append(new_fluctuation)
@@ -548,8 +1112,171 @@ class QuantumCollectorGame:
         anti_fluctuation = Fluctuation(x_pos + 50, y_pos + 50, new_fluctuation_center, anti_color, self, chaos_level, vx=-vx, vy=-vy)
         self.fluctuations.append(anti_fluctuation)
     
-    def check_interactions(self, mouse_pressed):
+    def kind_mask(self, store, particle_types):
+        """Máscara booleana das linhas de `store` cujo tipo está em `particle_types`."""
+        codes = [PARTICLE_TYPE_CODES[t] for t in particle_types if t in PARTICLE_TYPE_CODES]
+        return np.isin(store.columns["kind"][:len(store)], codes)
+
+    def apply_mouse_force(self, store):
+        """Puxa para o cursor tudo o que estiver a menos de 150px dele."""
+        n = len(store)
+        if n == 0:
+            return
+        c = store.columns
+        dx = self.mouse_pos[0] - c["x"][:n]
+        dy = self.mouse_pos[1] - c["y"][:n]
+        dist = np.hypot(dx, dy)
+        near = (dist < 150) & (dist > 0)
+        safe = np.where(near, dist, 1.0)
+        scale = np.where(near, 1500 / (safe + 1) * 0.005 / safe, 0.0)
+        c["vx"][:n] += dx * scale
+        c["vy"][:n] += dy * scale
+
+    def apply_forces_exact(self):
+        """Forças EM e gravitacional somadas sobre todos os pares (O(n²), vetorizado)."""
+        store = self.stable_particles
+        n = len(store)
+        if n < 2:
+            return
+        c = store.columns
+        dvx, dvy = exact_pairwise_deltas(
+            c["x"][:n], c["y"][:n], c["charge"][:n], self.kind_mask(store, ["Proton", "Neutron"]),
+            EM_CONSTANT, GRAVITY_CONSTANT, NUCLEAR_THRESHOLD, 0.0)
+        scale = LONG_RANGE_INTERVAL / FORCE_REFERENCE_INTERVAL
+        c["vx"][:n] += dvx * scale
+        c["vy"][:n] += dvy * scale
+
+    def apply_forces_barnes_hut(self):
+        """
+        Mesmas forças de apply_forces_exact, mas com os termos 1/r² (EM e
+        gravidade) aproximados por uma quadtree de Barnes–Hut com ângulo de
+        abertura `self.barnes_hut_theta`.
+        """
+        store = self.stable_particles
+        n = len(store)
+        if n < 2:
+            return
+        c = store.columns
+        theta = self.barnes_hut_theta
+        xs = c["x"][:n]
+        ys = c["y"][:n]
+        charges = c["charge"][:n].astype(np.float64)
+        index = np.arange(n)
+
+        # Cargas positivas e negativas ficam em árvores separadas para que o
+        # centro ponderado de cada nó seja bem definido
+        positive = charges > 0
+        negative = charges < 0
+        neutral = charges == 0
+        dvx = np.zeros(n)
+        dvy = np.zeros(n)
+
+        # Interação Eletromagnética (repulsão entre cargas iguais)
+        charged = index[~neutral]
+        if len(charged):
+            fx = np.zeros(len(charged))
+            fy = np.zeros(len(charged))
+            for mask in (positive, negative):
+                tree = BarnesHutTree(xs[mask], ys[mask], charges[mask], keys=index[mask])
+                tfx, tfy = tree.field(xs[charged], ys[charged], theta, softening=5.0, exclude=charged)
+                fx += tfx
+                fy += tfy
+            scale = -charges[charged] * EM_CONSTANT
+            dvx[charged] = scale * fx
+            dvy[charged] = scale * fy
+
+        # Interação Gravitacional (somente entre partículas neutras, acima de 25px)
+        if neutral.any():
+            tree = BarnesHutTree(xs[neutral], ys[neutral], np.ones(np.count_nonzero(neutral)), keys=index[neutral])
+            fx, fy = tree.field(xs[neutral], ys[neutral], theta, cutoff=25, exclude=index[neutral])
+            dvx[neutral] = GRAVITY_CONSTANT * fx
+            dvy[neutral] = GRAVITY_CONSTANT * fy
+
+        scale = LONG_RANGE_INTERVAL / FORCE_REFERENCE_INTERVAL
+        c["vx"][:n] += dvx * scale
+        c["vy"][:n] += dvy * scale
+
+    def apply_forces_particle_mesh(self):
+        """
+        Mesmas forças de apply_forces_exact, com os termos 1/r² calculados em
+        uma grade periódica PM_GRID_X × PM_GRID_Y (depósito CIC e convolução
+        por FFT) e os pares a menos de PM_SHORT_RANGE_CELLS células somados
+        diretamente (P3M). O campo é toroidal: a interação usa a imagem mais
+        próxima.
+        """
+        store = self.stable_particles
+        n = len(store)
+        if n < 2:
+            return
+        if self.particle_mesh is None:
+            self.particle_mesh = (
+                ParticleMeshSolver(WIDTH, HEIGHT, PM_GRID_X, PM_GRID_Y, softening=5.0,
+                                   short_range=PM_SHORT_RANGE_CELLS),
+                ParticleMeshSolver(WIDTH, HEIGHT, PM_GRID_X, PM_GRID_Y, cutoff=25,
+                                   short_range=PM_SHORT_RANGE_CELLS),
+            )
+        em_mesh, gravity_mesh = self.particle_mesh
+        c = store.columns
+        xs = c["x"][:n]
+        ys = c["y"][:n]
+        charges = c["charge"][:n].astype(np.float64)
+        charged = charges != 0
+
+        dvx = np.zeros(n)
+        dvy = np.zeros(n)
+        # Interação Eletromagnética (repulsão entre cargas iguais)
+        if np.count_nonzero(charged) > 1:
+            fx, fy = em_mesh.field(xs[charged], ys[charged], charges[charged])
+            dvx[charged] = -charges[charged] * EM_CONSTANT * fx
+            dvy[charged] = -charges[charged] * EM_CONSTANT * fy
+        # Interação Gravitacional (somente entre partículas neutras, acima de 25px)
+        neutral = ~charged
+        if np.count_nonzero(neutral) > 1:
+            fx, fy = gravity_mesh.field(xs[neutral], ys[neutral], np.ones(np.count_nonzero(neutral)))
+            dvx[neutral] = GRAVITY_CONSTANT * fx
+            dvy[neutral] = GRAVITY_CONSTANT * fy
+
+        scale = LONG_RANGE_INTERVAL / FORCE_REFERENCE_INTERVAL
+        c["vx"][:n] += dvx * scale
+        c["vy"][:n] += dvy * scale
+
+    def apply_short_range_forces(self):
+        """
+        Força Nuclear Forte entre prótons e nêutrons a menos de NUCLEAR_THRESHOLD,
+        aplicada a cada tick e somada só sobre os pares da lista de vizinhos.
+        """
+        store = self.stable_particles
+        n = len(store)
+        if n < 2:
+            return
+        nucleon = self.kind_mask(store, ["Proton", "Neutron"])
+        if np.count_nonzero(nucleon) < 2:
+            return
+        first, second = self.neighbor_pairs(store)
+        both = nucleon[first] & nucleon[second]
+        c = store.columns
+        dvx, dvy = short_range_deltas(c["x"][:n], c["y"][:n], first[both], second[both],
+                                      NUCLEAR_ATTRACTION_CONSTANT / FORCE_REFERENCE_INTERVAL, NUCLEAR_THRESHOLD)
+        c["vx"][:n] += dvx
+        c["vy"][:n] += dvy
 
+    def check_interactions(self, mouse_pressed):
+        """
+        Etapas de interação de um tick, nesta ordem: log de mensagens, forças,
+        formação de bárions, colisões das partículas estáveis e das flutuações.
+        """
+        profile = self.profiler.scope
+        self.age_messages()
+        with profile("forces"):
+            self.apply_forces(mouse_pressed)
+        with profile("baryons"):
+            self.check_for_baryon_formation()
+        with profile("collisions"):
+            self.resolve_particle_collisions()
+            self.resolve_fluctuation_collisions()
+
+    def age_messages(self):
+        """Desconta um tick do tempo de vida de cada mensagem e remove as expiradas."""
         new_log = []
         for msg in self.message_log:
             # Diminui o timer (countdown)
@@ -560,350 +1287,299 @@ class QuantumCollectorGame:
                 new_log.append(msg)
 
         self.message_log = new_log
-        
+
+    def apply_forces(self, mouse_pressed):
+        """Mouse, forças de longo e curto alcance e a atração das flutuações pela matéria."""
         # Lógica de Interação com o Mouse (Sem Alterações)
         if mouse_pressed and self.mouse_pos:
-            for particle in self.stable_particles:
-                dist = math.hypot(particle.x - self.mouse_pos[0], particle.y - self.mouse_pos[1])
-                force_magnitude = 1500 / (dist + 1)
-                if dist < 150:
-                    force_direction_x = (self.mouse_pos[0] - particle.x) / dist
-                    force_direction_y = (self.mouse_pos[1] - particle.y) / dist
-                    particle.vx += force_direction_x * force_magnitude * 0.005
-                    particle.vy += force_direction_y * force_magnitude * 0.005
-
-            for fluctuation in self.fluctuations:
-                dist = math.hypot(fluctuation.x - self.mouse_pos[0], fluctuation.y - self.mouse_pos[1])
-                force_magnitude = 1500 / (dist + 1)
-                if dist < 150:
-                    force_direction_x = (self.mouse_pos[0] - fluctuation.x) / dist
-                    force_direction_y = (self.mouse_pos[1] - fluctuation.y) / dist
-                    fluctuation.vx += force_direction_x * force_magnitude * 0.005
-                    fluctuation.vy += force_direction_y * force_magnitude * 0.005
+            self.apply_mouse_force(self.stable_particles)
+            self.apply_mouse_force(self.fluctuations)
         
         # --- Lógica de Interação Eletromagnética e Gravitacional ---
-        FORCE_UPDATE_FREQUENCY = 3 # Recalcula forças a cada 3 frames
-
+        # Longo alcance (EM e gravidade) a cada LONG_RANGE_INTERVAL ticks
         self.force_update_counter += 1
         
         # Note: EM_CONSTANT, GRAVITY_CONSTANT, NUCLEAR_THRESHOLD precisam estar definidos (do .env)
-        if self.force_update_counter % FORCE_UPDATE_FREQUENCY == 0:
+        if self.force_update_counter % LONG_RANGE_INTERVAL == 0:
             self.force_update_counter = 0
-            for i in range(len(self.stable_particles)):
-                for j in range(i + 1, len(self.stable_particles)):
-                    p1 = self.stable_particles[i]
-                    p2 = self.stable_particles[j]
+            if self.force_solver == "barnes_hut":
+                self.apply_forces_barnes_hut()
+            elif self.force_solver == "pm":
+                self.apply_forces_particle_mesh()
+            else:
+                self.apply_forces_exact()
 
-                    dist = math.hypot(p1.x - p2.x, p1.y - p2.y)
-                    if dist == 0: continue
-                    
-                    # Interação Eletromagnética
-                    if p1.charge != 0 and p2.charge != 0:
-                        safe_dist = max(dist, 5.0) 
-                        
-                        # Cálculo da magnitude da força (já com o sinal de atração/repulsão)
-                        force_em_mag = (p1.charge * p2.charge * EM_CONSTANT) / (safe_dist**2)
-                        
-                        # Vetor de Força (aponta de p1 para p2, escalado pela magnitude)
-                        force_x = force_em_mag * (p2.x - p1.x) / dist
-                        force_y = force_em_mag * (p2.y - p1.y) / dist
-                        
-                        # CORREÇÃO CRÍTICA DO SINAL:
-                        # Aceleração de p1: Aplica-se o vetor de força INVERSO
-                        p1.vx -= force_x
-                        p1.vy -= force_y
-                        
-                        # Aceleração de p2: Aplica-se o vetor de força ORIGINAL
-                        p2.vx += force_x
-                        p2.vy += force_y
-                    
-                    # Lógica de Força Nuclear Forte (para prótons e nêutrons)
-                    if p1.particle_type in ["Proton", "Neutron"] and p2.particle_type in ["Proton", "Neutron"]:
-                        NUCLEAR_DISTANCE_THRESHOLD = NUCLEAR_THRESHOLD
-                        NUCLEAR_ATTRACTION_CONSTANT = -2000 
-                        
-                        if dist < NUCLEAR_DISTANCE_THRESHOLD:
-                            force_nuclear = (NUCLEAR_ATTRACTION_CONSTANT / dist)
-                            force_x = force_nuclear * (p2.x - p1.x) / dist
-                            force_y = force_nuclear * (p2.y - p1.y) / dist
-                            p1.vx += force_x
-                            p1.vy += force_y
-                            p2.vx -= force_x
-                            p2.vy -= force_y
-
-                    # Interação Gravitacional
-                    if p1.charge == 0 and p2.charge == 0 and dist > 25:
-                        force_grav = GRAVITY_CONSTANT / (dist**2)
-                        force_x = force_grav * (p2.x - p1.x) / dist
-                        force_y = force_grav * (p2.y - p1.y) / dist
-                        p1.vx += force_x
-                        p1.vy += force_y
-                        p2.vx -= force_x
-                        p2.vy -= force_y
+        # Curto alcance (força nuclear) a cada tick, pela lista de vizinhos
+        self.apply_short_range_forces()
             
         # Atração gravitacional entre partículas estáveis e flutuações
-        if GRAVITY_CONSTANT > 0:
-            for grav_source in self.stable_particles:
-                if grav_source.particle_type in ["Hydrogen Aton", "Proton", "Neutron","Deuterium", "Deuterium Atom"]:
-                    for f_other in self.fluctuations:
-                        dist = math.hypot(grav_source.x - f_other.x, grav_source.y - f_other.y)
-                        if dist > 0:
-                            force = GRAVITY_CONSTANT / (dist**2)
-                            f_other.vx += force * (grav_source.x - f_other.x) / dist
-                            f_other.vy += force * (grav_source.y - f_other.y) / dist
-
-
-        particles_to_remove = []
+        if GRAVITY_CONSTANT > 0 and len(self.fluctuations):
+            sources = self.kind_mask(self.stable_particles, ["Hydrogen Aton", "Proton", "Neutron", "Deuterium", "Deuterium Atom"])
+            if sources.any():
+                sc = self.stable_particles.columns
+                fc = self.fluctuations.columns
+                n = len(self.stable_particles)
+                m = len(self.fluctuations)
+                dvx, dvy = attraction_deltas(sc["x"][:n][sources], sc["y"][:n][sources],
+                                             fc["x"][:m], fc["y"][:m], GRAVITY_CONSTANT)
+                fc["vx"][:m] += dvx
+                fc["vy"][:m] += dvy
+
+    def resolve_particle_collisions(self):
+        """Reações entre partículas estáveis que se tocam (ver reactions.PAIR_REACTIONS)."""
         new_particles = []
-        
-        self.check_for_baryon_formation()
 
         # --- Lógica de Colisão de Partículas Estáveis (Corrigida) ---
-        for i in range(len(self.stable_particles)):
-            for j in range(i + 1, len(self.stable_particles)):
-                p1 = self.stable_particles[i]
-                p2 = self.stable_particles[j]
-                
-                dist = math.hypot(p1.x - p2.x, p1.y - p2.y)
-                if dist < p1.size + p2.size:
-                    
-                    # 1. Aniquilação de Elétron-Pósitron
-                    if (p1.particle_type == "Electron" and p2.particle_type == "Positron") or \
-                       (p1.particle_type == "Positron" and p2.particle_type == "Electron"):
-                        for _ in range(5):
-                            self.photons.append(Photon((p1.x + p2.x) / 2, (p1.y + p2.y) / 2))
-                        particles_to_remove.extend([p1, p2])
-                        print("Aniquilação! Elétron e Pósitron se transformam em Fótons.")
-                        self.add_message("Aniquilação! Elétron e Pósitron se transformam em Fótons.")
-                        continue
-                    
-                    # 2. Fusão de Próton e Nêutron para formar Deutério (PRIORIDADE)
-                    if (p1.particle_type == "Proton" and p2.particle_type == "Neutron") or \
-                       (p1.particle_type == "Neutron" and p2.particle_type == "Proton"):
-                        combined_velocity = math.hypot(p1.vx + p2.vx, p1.vy + p2.vy)
-                        if dist < NUCLEAR_THRESHOLD and combined_velocity > 0.5:
-                            particles_to_remove.extend([p1, p2])
-                            new_particles.append(StableParticle(p1.x, p1.y, (100, 100, 255), "Deuterium"))
-                            self.matter_stabilized += 1
-                            print("Fusão Nuclear! Um núcleo de Deutério foi formado!")
-                            self.add_message("Fusão Nuclear! Um núcleo de Deutério foi formado!")
-                            continue
-                            
-                    # 3. Formação de Átomo de Hidrogênio
-                    if (p1.particle_type == "Proton" and p2.particle_type == "Electron") or \
-                       (p1.particle_type == "Electron" and p2.particle_type == "Proton"):
-                        if dist < NUCLEAR_THRESHOLD + 10:
-                            particles_to_remove.extend([p1, p2])
-                            new_particles.append(StableParticle(p1.x, p1.y, (255, 255, 255), "Hydrogen Atom"))
-                            self.matter_stabilized += 1
-                            print("Um átomo de Hidrogênio foi formado!")
-                            self.add_message("Um átomo de Hidrogênio foi formado!")
-                            continue
-
-                    # 4. Formação de Átomo de Deutério
-                    if (p1.particle_type == "Deuterium" and p2.particle_type == "Electron") or \
-                       (p1.particle_type == "Electron" and p2.particle_type == "Deuterium"):
-                        if dist < NUCLEAR_THRESHOLD + 10:
-                            particles_to_remove.extend([p1, p2])
-                            new_particles.append(StableParticle(p1.x, p1.y, (150, 150, 255), "Deuterium Atom"))
-                            self.matter_stabilized += 1
-                            print("Átomo de Deutério foi formado pela captura de um Elétron!")
-                            self.add_message("Átomo de Deutério foi formado pela captura de um Elétron!")
-                            continue
-                            
-        # Aplica a remoção e adição de partículas estáveis
-        for p in particles_to_remove:
-            if p in self.stable_particles:
-                self.stable_particles.remove(p)
+        # Cada par é despachado pela tabela (tipo, tipo) -> reação, sem comparar strings
+        kinds = self.stable_particles.columns["kind"][:len(self.stable_particles)].tolist()
+        for i, j in self.collision_pairs(self.stable_particles):
+            handler = self.pair_handlers.get((kinds[i], kinds[j]))
+            if handler is None:
+                continue
+            p1 = self.stable_particles[i]
+            p2 = self.stable_particles[j]
+            # Partículas já consumidas neste tick (bárions, outras reações) não reagem de novo
+            if p1.is_dead or p2.is_dead:
+                continue
+            
+            dist = math.hypot(p1.x - p2.x, p1.y - p2.y)
+            if dist < p1.size + p2.size:
+                handler(p1, p2, dist, new_particles)
+                        
+        # As consumidas ficam marcadas como mortas até a compactação no fim do tick
         self.stable_particles.extend(new_particles)
 
+    def resolve_fluctuation_collisions(self):
+        """Aniquilação, formação de quarks e fusão caótica entre flutuações que se tocam."""
         # --- Lógica de interação entre flutuações ---
-        fluctuations_to_remove_set = set()
         new_fluctuations = []
         
-        for i in range(len(self.fluctuations)):
-            for j in range(i + 1, len(self.fluctuations)):
-                f1 = self.fluctuations[i]
-                f2 = self.fluctuations[j]
+        states = self.fluctuations.columns["kind"][:len(self.fluctuations)].tolist()
+        for i, j in self.collision_pairs(self.fluctuations):
+            f1 = self.fluctuations[i]
+            f2 = self.fluctuations[j]
+            
+            # Pula flutuações já marcadas como mortas
+            if f1.is_dead or f2.is_dead:
+                continue
                 
-                # Pula flutuações já marcadas para remoção
-                if f1 in fluctuations_to_remove_set or f2 in fluctuations_to_remove_set:
-                    continue
+            if math.hypot(f1.x - f2.x, f1.y - f2.y) < f1.size + f2.size:
+                # Reação do par de estados de cor (ver reactions.FLUCTUATION_REACTIONS);
+                # pares fora da tabela fazem a fusão caótica
+                reaction = FLUCTUATION_REACTIONS.get((states[i], states[j]))
+                
+                # 1. Aniquilação de Flutuação (Matéria + Anti-Matéria)
+                if reaction is ANNIHILATION and self.rng.reactions.random() < 0.8:
                     
-                if math.hypot(f1.x - f2.x, f1.y - f2.y) < f1.size + f2.size:
+                    # 1. GERAÇÃO DE ÂNGULO E VELOCIDADE
+                    # Gera um ângulo de ejeção aleatório (0 a 360 graus)
+                    angle = self.rng.reactions.uniform(0, 2 * math.pi) 
+                    # Define a magnitude da velocidade (o "espirro" suave)
+                    speed_magnitude = self.rng.reactions.uniform(1, 2) 
                     
-                    # 1. Aniquilação de Flutuação (Matéria + Anti-Matéria)
-                    if (f1.state.replace("Anti", "").lower() == f2.state.replace("Anti", "").lower() and f1.state != f2.state) and random.random() < 0.8:
-                        
-                        # 1. GERAÇÃO DE ÂNGULO E VELOCIDADE
-                        # Gera um ângulo de ejeção aleatório (0 a 360 graus)
-                        angle = random.uniform(0, 2 * math.pi) 
-                        # Define a magnitude da velocidade (o "espirro" suave)
-                        speed_magnitude = random.uniform(1, 2) 
-                        
-                        # 2. CÁLCULO DAS VELOCIDADES
-                        # Elétron: Usa o ângulo gerado (Vx e Vy positivos/negativos dependem do seno/cosseno do ângulo)
-                        e_vx = speed_magnitude * math.cos(angle)
-                        e_vy = speed_magnitude * math.sin(angle)
-                        
-                        # Pósitron: Usa o ângulo OPOSITO (adicionamos PI = 180 graus), garantindo que seja radialmente oposto
-                        p_vx = speed_magnitude * math.cos(angle + math.pi)
-                        p_vy = speed_magnitude * math.sin(angle + math.pi)
-                        
-                        # 3. CRIAÇÃO DO ELÉTRON 
-                        self.stable_particles.append(StableParticle(f1.x, f1.y, (0, 255, 0), "Electron", 
-                                                                vx=e_vx, 
-                                                                vy=e_vy)) 
-                        
-                        # 4. CRIAÇÃO DO PÓSITRON
-                        self.stable_particles.append(StableParticle(f2.x, f2.y, (255, 165, 0), "Positron", 
-                                                                vx=p_vx, 
-                                                                vy=p_vy))
-                        
-                        self.matter_created += 2
-                        fluctuations_to_remove_set.add(f1)
-                        fluctuations_to_remove_set.add(f2)
-                        print("Aniquilação de Flutuação (Matéria + Anti-Matéria) -> Matéria Sobrevivente")
-                        self.add_message("Aniquilação de Flutuação (Matéria + Anti-Matéria) -> Matéria Sobrevivente")
-                        for _ in range(30):
-                            self.sparks.append(QuantumSpark((f1.x + f2.x)/2, (f1.y + f2.y)/2, (255, 255, 255)))
-                        continue
-                        
-                    # 2. Formação de Quark UP (Red + Antigreen)
-                    elif (f1.state == "Red" and f2.state == "Antigreen") or (f1.state == "Antigreen" and f2.state == "Red"):
-                        new_vx = (f1.vx + f2.vx) / 2
-                        new_vy = (f1.vy + f2.vy) / 2
-                        self.stable_particles.append(StableParticle((f1.x + f2.x)/2, (f1.y + f2.y)/2, self.get_color_for_state("Red"), "Quark_UP", vx=new_vx, vy=new_vy))
-                        self.matter_created += 1
-                        fluctuations_to_remove_set.add(f1)
-                        fluctuations_to_remove_set.add(f2)
-                        continue
-                        
-                    # 3. Formação de Quark DOWN (Blue + Antigreen)
-                    elif (f1.state == "Blue" and f2.state == "Antigreen") or (f1.state == "Antigreen" and f2.state == "Blue"):
-                        new_vx = (f1.vx + f2.vx) / 2
-                        new_vy = (f1.vy + f2.vy) / 2
-                        self.stable_particles.append(StableParticle((f1.x + f2.x)/2, (f1.y + f2.y)/2, self.get_color_for_state("Blue"), "Quark_DOWN", vx=new_vx, vy=new_vy))
-                        self.matter_created += 1
-                        fluctuations_to_remove_set.add(f1)
-                        fluctuations_to_remove_set.add(f2)
-                        continue
-
-                    # 4. Formação de Quark STRANGE (Green + Antiblue)
-                    elif (f1.state == "Green" and f2.state == "Antiblue") or (f1.state == "Antiblue" and f2.state == "Green"):
-                        new_vx = (f1.vx + f2.vx) / 2
-                        # CORREÇÃO: f2.y trocado para f2.vy
-                        new_vy = (f1.vy + f2.vy) / 2 
-                        self.stable_particles.append(StableParticle((f1.x + f2.x)/2, (f1.y + f2.y)/2, self.get_color_for_state("Green"), "Quark_STRANGE", vx=new_vx, vy=new_vy))
-                        self.matter_created += 1
-                        fluctuations_to_remove_set.add(f1)
-                        fluctuations_to_remove_set.add(f2)
-                        #print("Quark Strange formado!")
-                        continue
-
-                    # 5. Fusão Caótica
-                    diff = abs(f1.center_value - f2.center_value)
-                    new_center_value = (f1.center_value + f2.center_value) / 2
+                    # 2. CÁLCULO DAS VELOCIDADES
+                    # Elétron: Usa o ângulo gerado (Vx e Vy positivos/negativos dependem do seno/cosseno do ângulo)
+                    e_vx = speed_magnitude * math.cos(angle)
+                    e_vy = speed_magnitude * math.sin(angle)
                     
-                    if diff > 0.5:
-                        new_color = (int(random.uniform(0, 255)), int(random.uniform(0, 255)), int(random.uniform(0, 255)))
-                        new_chaos = min(1.0, f1.chaos_level + f2.chaos_level)
-                    else: 
-                        new_color = (int((f1.color[0] + f2.color[0]) / 2), int((f1.color[1] + f2.color[1]) / 2), int((f1.color[2] + f2.color[2]) / 2))
-                        new_chaos = max(0.0, f1.chaos_level + f2.chaos_level - 1)
-                        
+                    # Pósitron: Usa o ângulo OPOSITO (adicionamos PI = 180 graus), garantindo que seja radialmente oposto
+                    p_vx = speed_magnitude * math.cos(angle + math.pi)
+                    p_vy = speed_magnitude * math.sin(angle + math.pi)
+                    
+                    # 3. CRIAÇÃO DO ELÉTRON 
+                    self.stable_particles.append(StableParticle(f1.x, f1.y, (0, 255, 0), "Electron", 
+                                                            vx=e_vx, 
+                                                            vy=e_vy, game_ref=self)) 
+                    
+                    # 4. CRIAÇÃO DO PÓSITRON
+                    self.stable_particles.append(StableParticle(f2.x, f2.y, (255, 165, 0), "Positron", 
+                                                            vx=p_vx, 
+                                                            vy=p_vy, game_ref=self))
+                    
+                    self.registry.record_created(2)
+                    self.fluctuations.kill(f1)
+                    self.fluctuations.kill(f2)
+                    self.emit_event(EventKind.FLUCTUATION_ANNIHILATION, (f1.x + f2.x) / 2, (f1.y + f2.y) / 2,
+                                    (states[i], states[j]), (ParticleKind.ELECTRON, ParticleKind.POSITRON))
+                    self.emit_sparks((f1.x + f2.x)/2, (f1.y + f2.y)/2, (255, 255, 255), 30)
+                    continue
+                    
+                # 2. Formação de Quarks (UP: Red + Antigreen, DOWN: Blue + Antigreen,
+                #    STRANGE: Green + Antiblue)
+                elif reaction is not None and reaction is not ANNIHILATION:
                     new_vx = (f1.vx + f2.vx) / 2
                     new_vy = (f1.vy + f2.vy) / 2
+                    color = self.get_color_for_state(STATE_NAMES[reaction.color_state])
+                    self.stable_particles.append(StableParticle((f1.x + f2.x)/2, (f1.y + f2.y)/2, color, KIND_NAMES[reaction.kind], vx=new_vx, vy=new_vy, game_ref=self))
+                    self.registry.record_created()
+                    self.fluctuations.kill(f1)
+                    self.fluctuations.kill(f2)
+                    continue
 
-                    new_fluctuation = Fluctuation((f1.x + f2.x) / 2, (f1.y + f2.y) / 2, new_center_value, new_color, self, chaos_level=new_chaos, vx=new_vx, vy=new_vy)
-
-                    # CORREÇÃO DE PERFORMANCE/ERRO: Usa proxy e protege o bloco Qiskit
-                    if f1.get_complexity_proxy() + f2.get_complexity_proxy() <= 5: 
-                        if f1.quantum_circuit is not None and f2.quantum_circuit is not None:
-                            combined_circuit = QuantumCircuit(f1.quantum_circuit.num_qubits + f2.quantum_circuit.num_qubits, f1.quantum_circuit.num_qubits + f2.quantum_circuit.num_qubits)
-                            combined_circuit = combined_circuit.compose(f1.quantum_circuit, qubits=range(f1.quantum_circuit.num_qubits))
-                            combined_circuit = combined_circuit.compose(f2.quantum_circuit, qubits=range(f1.quantum_circuit.num_qubits, f1.quantum_circuit.num_qubits + f2.quantum_circuit.num_qubits))
-                            combined_circuit.cx(0, 1)
-                            new_fluctuation.quantum_circuit = combined_circuit
-                    
-                    new_fluctuations.append(new_fluctuation)
-                    fluctuations_to_remove_set.add(f1)
-                    fluctuations_to_remove_set.add(f2)
+                # 3. Fusão Caótica
+                diff = abs(f1.center_value - f2.center_value)
+                new_center_value = (f1.center_value + f2.center_value) / 2
+                
+                if diff > 0.5:
+                    rng = self.rng.reactions
+                    new_color = (int(rng.uniform(0, 255)), int(rng.uniform(0, 255)), int(rng.uniform(0, 255)))
+                    new_chaos = min(1.0, f1.chaos_level + f2.chaos_level)
+                else: 
+                    new_color = (int((f1.color[0] + f2.color[0]) / 2), int((f1.color[1] + f2.color[1]) / 2), int((f1.color[2] + f2.color[2]) / 2))
+                    new_chaos = max(0.0, f1.chaos_level + f2.chaos_level - 1)
                     
-                    for _ in range(20):
-                        self.sparks.append(QuantumSpark((f1.x + f2.x) / 2, (f1.y + f2.y) / 2, (255, 255, 255)))
-        
-        # Remoção de flutuações marcadas
-        for fluctuation in fluctuations_to_remove_set:
-            if fluctuation in self.fluctuations:
-                self.fluctuations.remove(fluctuation)
+                new_vx = (f1.vx + f2.vx) / 2
+                new_vy = (f1.vy + f2.vy) / 2
 
+                new_fluctuation = Fluctuation((f1.x + f2.x) / 2, (f1.y + f2.y) / 2, new_center_value, new_color, self, chaos_level=new_chaos, vx=new_vx, vy=new_vy)
+
+                # CORREÇÃO DE PERFORMANCE/ERRO: Usa proxy e protege o bloco Qiskit
+                if f1.get_complexity_proxy() + f2.get_complexity_proxy() <= 5: 
+                    if f1.circuit_signature is not None and f2.circuit_signature is not None:
+                        # Circuito combinado memoizado pela assinatura da composição
+                        new_fluctuation.circuit_signature = fused_circuit_signature(f1.circuit_signature, f2.circuit_signature)
+                
+                new_fluctuations.append(new_fluctuation)
+                self.fluctuations.kill(f1)
+                self.fluctuations.kill(f2)
+                
+                self.emit_sparks((f1.x + f2.x) / 2, (f1.y + f2.y) / 2, (255, 255, 255), 20)
+        
         self.fluctuations.extend(new_fluctuations)
 
 
+    # --- Reações entre partículas estáveis (ver reactions.PAIR_REACTIONS) ---
+
+    def react_annihilation(self, p1, p2, dist, new_particles):
+        """Aniquilação de Elétron-Pósitron."""
+        self.emit_photons((p1.x + p2.x) / 2, (p1.y + p2.y) / 2, 5)
+        self.stable_particles.kill(p1)
+        self.stable_particles.kill(p2)
+        self.emit_event(EventKind.ANNIHILATION, (p1.x + p2.x) / 2, (p1.y + p2.y) / 2, (p1.kind, p2.kind))
+
+    def react_deuterium_fusion(self, p1, p2, dist, new_particles):
+        """Fusão de Próton e Nêutron para formar Deutério."""
+        combined_velocity = math.hypot(p1.vx + p2.vx, p1.vy + p2.vy)
+        if dist < NUCLEAR_THRESHOLD and combined_velocity > 0.5:
+            self.stable_particles.kill(p1)
+            self.stable_particles.kill(p2)
+            new_particles.append(StableParticle(p1.x, p1.y, (100, 100, 255), "Deuterium", game_ref=self))
+            self.registry.record_stabilized()
+            self.emit_event(EventKind.DEUTERIUM_FUSION, p1.x, p1.y, (p1.kind, p2.kind), (ParticleKind.DEUTERIUM,))
+
+    def react_hydrogen_capture(self, p1, p2, dist, new_particles):
+        """Formação de Átomo de Hidrogênio."""
+        if dist < NUCLEAR_THRESHOLD + 10:
+            self.stable_particles.kill(p1)
+            self.stable_particles.kill(p2)
+            new_particles.append(StableParticle(p1.x, p1.y, (255, 255, 255), "Hydrogen Atom", game_ref=self))
+            self.registry.record_stabilized()
+            self.emit_event(EventKind.HYDROGEN_CAPTURE, p1.x, p1.y, (p1.kind, p2.kind), (ParticleKind.HYDROGEN_ATOM,))
+
+    def react_deuterium_capture(self, p1, p2, dist, new_particles):
+        """Formação de Átomo de Deutério."""
+        if dist < NUCLEAR_THRESHOLD + 10:
+            self.stable_particles.kill(p1)
+            self.stable_particles.kill(p2)
+            new_particles.append(StableParticle(p1.x, p1.y, (150, 150, 255), "Deuterium Atom", game_ref=self))
+            self.registry.record_stabilized()
+            self.emit_event(EventKind.DEUTERIUM_CAPTURE, p1.x, p1.y, (p1.kind, p2.kind), (ParticleKind.DEUTERIUM_ATOM,))
+
 # NOVO: Implementação completa da formação de bárions, incluindo Lambda
+    def quark_triples(self, xs, ys, kinds):
+        """
+        Trios (i, j, k), i < j < k, de quarks que podem formar um bárion.
+
+        Um trio só se forma se cada quark estiver a menos de 3 * NUCLEAR_THRESHOLD
+        do centro do trio, então cada par está a menos de 6 * NUCLEAR_THRESHOLD.
+        Os pares próximos vêm da grade espacial, só os trios em que os três
+        pares são vizinhos são enumerados (na ordem do laço triplo original), e
+        os que claramente falham o teste do centro ou não têm a composição de
+        um bárion (UDS, UUD, UDD) são descartados em bloco.
+        """
+        n = len(xs)
+        reach = NUCLEAR_THRESHOLD * 6
+        if not USE_SPATIAL_HASH:
+            first, second = brute_force_pairs(n)
+            first, second = filter_pairs_within(xs, ys, first, second, reach=reach)
+        else:
+            grid = SpatialHash(WIDTH, HEIGHT, reach)
+            grid.rebuild(xs, ys)
+            first, second = grid.pairs_within(reach=reach)
+        I, J, K = pair_triples(first, second, n)
+
+        # Pré-filtro vetorizado do teste do centro; a folga deixa a decisão
+        # final com o teste exato (math.hypot) de check_for_baryon_formation
+        center_x = (xs[I] + xs[J] + xs[K]) / 3
+        center_y = (ys[I] + ys[J] + ys[K]) / 3
+        limit = NUCLEAR_THRESHOLD * 3 + 1e-9
+        close = ((np.hypot(xs[I] - center_x, ys[I] - center_y) < limit) &
+                 (np.hypot(xs[J] - center_x, ys[J] - center_y) < limit) &
+                 (np.hypot(xs[K] - center_x, ys[K] - center_y) < limit))
+
+        # Composição: quantos up, down e strange há em cada trio
+        def flavor_count(kind):
+            is_flavor = kinds == kind
+            return is_flavor[I].astype(np.int8) + is_flavor[J] + is_flavor[K]
+        ups = flavor_count(ParticleKind.QUARK_UP)
+        downs = flavor_count(ParticleKind.QUARK_DOWN)
+        stranges = flavor_count(ParticleKind.QUARK_STRANGE)
+        baryon = (ups >= 1) & (downs >= 1) & (stranges <= 1) & (ups + downs + stranges == 3)
+        keep = close & baryon
+        return zip(I[keep].tolist(), J[keep].tolist(), K[keep].tolist())
+
     def check_for_baryon_formation(self):
-        quarks = [p for p in self.stable_particles if p.particle_type.startswith("Quark_")]
+        n = len(self.stable_particles)
+        columns = self.stable_particles.columns
+        alive = (columns["flags"][:n] & FLAG_DEAD) == 0
+        slots = np.flatnonzero(np.isin(columns["kind"][:n], list(QUARK_KINDS)) & alive)
+        if len(slots) < 3:
+            return
+        quarks = [self.stable_particles[slot] for slot in slots.tolist()]
+        # Posições e tipos copiados das colunas do store uma única vez
+        xs = columns["x"][:n][slots]
+        ys = columns["y"][:n][slots]
+        kinds = columns["kind"][:n][slots]
+        qx = xs.tolist()
+        qy = ys.tolist()
+        qk = kinds.tolist()
         
-        particles_to_remove = []
+        consumed = set() # Índices dos quarks já usados em um bárion neste tick
         new_particles = []
         
-        # Itera sobre todos os trios de quarks para checar por combinações
-        for i in range(len(quarks)):
-            for j in range(i + 1, len(quarks)):
-                for k in range(j + 1, len(quarks)):
-                    q1, q2, q3 = quarks[i], quarks[j], quarks[k]
-                    
-                    # Simples verificação de proximidade (dentro de 3x o NUCLEAR_THRESHOLD)
-                    center_x = (q1.x + q2.x + q3.x) / 3
-                    center_y = (q1.y + q2.y + q3.y) / 3
-                    
-                    if math.hypot(q1.x - center_x, q1.y - center_y) < NUCLEAR_THRESHOLD * 3 and \
-                       math.hypot(q2.x - center_x, q2.y - center_y) < NUCLEAR_THRESHOLD * 3 and \
-                       math.hypot(q3.x - center_x, q3.y - center_y) < NUCLEAR_THRESHOLD * 3:
-                        
-                        # Usa um multiset para verificar a composição do trio
-                        types = sorted([q1.particle_type, q2.particle_type, q3.particle_type])
-                        
-                        # Evita processar quarks que já foram marcados para remoção
-                        if q1 in particles_to_remove or q2 in particles_to_remove or q3 in particles_to_remove:
-                            continue
-
-                        # --- Lambda Baryon (Up + Down + Strange) ---
-                        if types == ['Quark_DOWN', 'Quark_STRANGE', 'Quark_UP']:
-                            particles_to_remove.extend([q1, q2, q3])
-                            avg_vx = (q1.vx + q2.vx + q3.vx) / 3
-                            avg_vy = (q1.vy + q2.vy + q3.vy) / 3
-                            # Cor roxa para o Lambda (UDS, carga zero)
-                            new_particles.append(StableParticle(center_x, center_y, (180, 0, 180), "Lambda", vx=avg_vx, vy=avg_vy))
-                            self.matter_stabilized += 1
-                            print("Bárion Lambda (Up, Down, Strange) formado!")
-                            self.add_message("Bárion Lambda (Up, Down, Strange) formado!")
-                            
-                        # --- Proton (Up + Up + Down) ---
-                        elif types == ['Quark_DOWN', 'Quark_UP', 'Quark_UP']: 
-                            particles_to_remove.extend([q1, q2, q3])
-                            avg_vx = (q1.vx + q2.vx + q3.vx) / 3
-                            avg_vy = (q1.vy + q2.vy + q3.vy) / 3
-                            # Cor amarela para o Próton (UUD, carga +1)
-                            new_particles.append(StableParticle(center_x, center_y, (255, 255, 0), "Proton", vx=avg_vx, vy=avg_vy))
-                            self.matter_stabilized += 1
-                            print("Próton (Up, Up, Down) formado!")
-                            self.add_message("Próton (Up, Up, Down) formado!")
-                            
-                        # --- Neutron (Up + Down + Down) ---
-                        elif types == ['Quark_DOWN', 'Quark_DOWN', 'Quark_UP']:
-                            particles_to_remove.extend([q1, q2, q3])
-                            avg_vx = (q1.vx + q2.vx + q3.vx) / 3
-                            avg_vy = (q1.vy + q2.vy + q3.vy) / 3
-                            # Cor cinza para o Nêutron (UDD, carga 0)
-                            new_particles.append(StableParticle(center_x, center_y, (150, 150, 150), "Neutron", vx=avg_vx, vy=avg_vy))
-                            self.matter_stabilized += 1
-                            print("Nêutron (Up, Down, Down) formado!")
-                            self.add_message("Nêutron (Up, Down, Down) formado!")
+        # Só os trios de quarks vizinhos são checados
+        for i, j, k in self.quark_triples(xs, ys, kinds):
+            # Evita processar quarks que já foram usados em um bárion neste tick
+            # (os mortos antes disso nem entram em `slots`)
+            if i in consumed or j in consumed or k in consumed:
+                continue
+            
+            # Simples verificação de proximidade (dentro de 3x o NUCLEAR_THRESHOLD)
+            center_x = (qx[i] + qx[j] + qx[k]) / 3
+            center_y = (qy[i] + qy[j] + qy[k]) / 3
+            
+            if math.hypot(qx[i] - center_x, qy[i] - center_y) < NUCLEAR_THRESHOLD * 3 and \
+               math.hypot(qx[j] - center_x, qy[j] - center_y) < NUCLEAR_THRESHOLD * 3 and \
+               math.hypot(qx[k] - center_x, qy[k] - center_y) < NUCLEAR_THRESHOLD * 3:
+                
+                # A composição ordenada do trio indexa a tabela de bárions
+                # (Lambda = UDS, Próton = UUD, Nêutron = UDD; ver reactions.BARYONS)
+                rule = BARYONS.get(tuple(sorted((qk[i], qk[j], qk[k]))))
+                if rule is None:
+                    continue
+
+                q1, q2, q3 = quarks[i], quarks[j], quarks[k]
+                consumed.update((i, j, k))
+                self.stable_particles.kill(q1)
+                self.stable_particles.kill(q2)
+                self.stable_particles.kill(q3)
+                avg_vx = (q1.vx + q2.vx + q3.vx) / 3
+                avg_vy = (q1.vy + q2.vy + q3.vy) / 3
+                new_particles.append(StableParticle(center_x, center_y, rule.color, KIND_NAMES[rule.kind], vx=avg_vx, vy=avg_vy, game_ref=self))
+                self.registry.record_stabilized()
+                self.emit_event(EventKind.BARYON_FORMATION, center_x, center_y, (qk[i], qk[j], qk[k]), (rule.kind,))
                             
-        # Aplica as remoções e adições
-        self.stable_particles = [p for p in self.stable_particles if p not in particles_to_remove]
+        # Os quarks consumidos saem na compactação do fim do tick
         self.stable_particles.extend(new_particles)
 
     def run_quantum_decay_check(self, decay_chance):
@@ -917,7 +1593,7 @@ class QuantumCollectorGame:
             bool: True se o decaimento ocorreu.
         """
         # Esta é a checagem padrão, sem o overhead de compilação e execução do Qiskit.
-        return random.random() < decay_chance
+        return self.rng.decay.random() < decay_chance
 
     def run_quantum_decay_check_qiskit(self, decay_chance):
         """
@@ -938,14 +1614,16 @@ class QuantumCollectorGame:
         else:
             angle = 2 * math.asin(math.sqrt(P1))
         
+        from qiskit import QuantumCircuit
+
         qc = QuantumCircuit(1, 1)
         # Aplica a rotação R_Y para colocar o qubit no estado |1> com probabilidade P1
         qc.ry(angle, 0)
         # Realiza a medição
         qc.measure(0, 0)
         
-        # Compila e executa no simulador (self.sim = AerSimulator())
-        compiled_circuit = transpile(qc, self.sim)
+        # Compila e executa no backend de medição (self.sim: AerSimulator ou analítico)
+        compiled_circuit = compile_for(qc, self.sim)
         # Roda apenas 1 shot, pois queremos simular o resultado único para este frame
         job = self.sim.run(compiled_circuit, shots=1)
         result = job.result()
@@ -954,6 +1632,41 @@ class QuantumCollectorGame:
         # Se a medição for '1', o decaimento ocorreu
         return '1' in counts
 
+    def run_quantum_decay_batch(self, particles):
+        """
+        Sorteia, com um único job no simulador, quais partículas instáveis decaem.
+
+        As partículas elegíveis são agrupadas pela chance de decaimento (tipos
+        com a mesma chance dividem o mesmo qubit).
+
+        Returns:
+            set: As partículas que decaíram.
+        """
+        groups = {}
+        for p in particles:
+            rule = DECAY_TABLE.get(p.kind)
+            if rule is not None and not p.is_dead:
+                groups.setdefault(rule.chance, []).append(p)
+        if not groups:
+            return set()
+
+        probabilities = tuple(sorted(groups))
+        members = [groups[chance] for chance in probabilities]
+        outcomes = self.decay_sampler.sample(probabilities, [len(m) for m in members])
+
+        decayed = set()
+        for group, results in zip(members, outcomes):
+            decayed.update(p for p, hit in zip(group, results) if hit)
+        return decayed
+
+    def decay_check(self, p, decay_chance, batch=None):
+        """Decide o decaimento de `p` pelo modo configurado em `self.quantum_decay_mode`."""
+        if batch is not None:
+            return p in batch
+        if self.quantum_decay_mode == "qiskit":
+            return self.run_quantum_decay_check_qiskit(decay_chance)
+        return self.run_quantum_decay_check(decay_chance)
+
     # NOVO: Implementação completa do decaimento de quarks e nêutrons
     def check_for_quantum_decay(self):
 
@@ -969,142 +1682,132 @@ class QuantumCollectorGame:
         # Se chegamos aqui, é hora de rodar o Qiskit
         self.quantum_decay_counter = 0 
         
-        particles_to_remove = []
         new_particles = []
-        
-        # Chance por frame para decaimento (~1 minuto de meia-vida a 60 FPS)
-        NEUTRON_DECAY_CHANCE = 0.0005  
-        # Chance por frame para decaimento do Strange
-        STRANGE_DECAY_CHANCE = 0.002
-        # Chance por frame para decaimento do Lambda
-        LAMBDA_DECAY_CHANCE = 0.005
-        # Chance por frame para decaimento do Pion minus
-        PION_DECAY_CHANCE = 0.01 # Chance muito alta de decaimento (ex: 1% por checagem)
-        # Chance por frame para decaimento do Pion minus
-        MUON_DECAY_CHANCE = 0.002
-        
-        for p in self.stable_particles:
-            
-            # 1. Decaimento Beta do Nêutron (Neutron -> Proton + Electron)
-            if p.particle_type == "Neutron" and self.run_quantum_decay_check(NEUTRON_DECAY_CHANCE):
-                particles_to_remove.append(p)
-                # Cria um Próton no lugar
-                new_particles.append(StableParticle(p.x, p.y, (255, 255, 0), "Proton", vx=p.vx, vy=p.vy))
-                # Cria um Elétron (Beta)
-                new_particles.append(StableParticle(p.x + 5, p.y + 5, (0, 255, 0), "Electron", vx=random.uniform(-1, 1), vy=random.uniform(-1, 1)))
-                print("Decaimento Beta: Nêutron -> Próton + Elétron (e Antineutrino, simplificado)")
-                self.add_message("Decaimento Beta: Nêutron -> Próton + Elétron (e Antineutrino, simplificado)")
-                # Faísca para representar a energia liberada
-                for _ in range(5): self.sparks.append(QuantumSpark(p.x, p.y, (100, 100, 255)))
-                
-            # 2. Decaimento do Quark Estranho (Strange -> Up/Down)
-            elif p.particle_type == "Quark_STRANGE" and self.run_quantum_decay_check(STRANGE_DECAY_CHANCE):
-                particles_to_remove.append(p)
-                
-                # Strange decai principalmente para UP (cerca de 94% de chance)
-                if random.random() < 0.94:
-                    new_type = "Quark_UP"
-                    new_color = self.get_color_for_state("Red")
-                else:
-                    new_type = "Quark_DOWN"
-                    new_color = self.get_color_for_state("Blue")
-
-                # Cria o novo Quark (mais leve)
-                new_particles.append(StableParticle(p.x, p.y, new_color, new_type, vx=p.vx, vy=p.vy))
-                
-                # Energia liberada (W boson, leptons, etc.) simplificada para um fóton
-                self.photons.append(Photon(p.x, p.y))
-                print(f"Decaimento Fraco: Quark Estranho -> {new_type.replace('Quark_', '')}")
-                self.add_message(f"Decaimento Fraco: Quark Estranho -> {new_type.replace('Quark_', '')}")
-            
-            # 3. Decaimento do Bárion Lambda (Lambda -> Proton + Pion Negativo)
-            elif p.particle_type == "Lambda" and self.run_quantum_decay_check(LAMBDA_DECAY_CHANCE):
-                particles_to_remove.append(p)
-                
-                # Cria um Próton (carga +1, cor amarela)
-                new_particles.append(StableParticle(p.x, p.y, (255, 255, 0), "Proton", vx=p.vx, vy=p.vy))
-                
-                # Cria um Píon Negativo (carga -1, cor rosa para contraste)
-                new_particles.append(StableParticle(p.x + 5, p.y + 5, (255, 100, 100), "Pion_MINUS", vx=random.uniform(-1, 1), vy=random.uniform(-1, 1)))
-
-                print("Decaimento Fraco: Bárion Lambda -> Próton + Píon Negativo")
-                self.add_message("Decaimento Fraco: Bárion Lambda -> Próton + Píon Negativo")
-                # Faísca para representar a energia liberada
-                for _ in range(10): self.sparks.append(QuantumSpark(p.x, p.y, (180, 0, 180)))
-
-            # 5. Decaimento do Pion Minus (Pion -> Antineutrino + Muon Negativo)  
-            elif p.particle_type == "Pion_MINUS" and self.run_quantum_decay_check(PION_DECAY_CHANCE):
-                particles_to_remove.append(p)
-                # Cria um Múon Negativo (cor diferente, ex: ciano)
-                new_particles.append(StableParticle(p.x, p.y, (0, 255, 255), "Muon_MINUS", vx=p.vx, vy=p.vy))
-                
-                # Adicionamos uma faísca/fóton para o Antineutrino (invisível)
-                self.photons.append(Photon(p.x, p.y)) 
-                
-                print("Decaimento Fraco: Píon Negativo -> Múon Negativo (+ Antineutrino, simplificado)")
-                self.add_message("Decaimento Fraco: Píon Negativo -> Múon Negativo (+ Antineutrino, simplificado)")
 
-            # 5 Decaimento do Muon Negativo (Muon -> Eletron + Antineutrino)  
-            elif p.particle_type == "Muon_MINUS" and self.run_quantum_decay_check(MUON_DECAY_CHANCE):
-                particles_to_remove.append(p)
-                
-                # Cria o Elétron! (o produto final da cadeia)
-                # Lembre-se de dar uma velocidade de ejeção isótropa
-                angle = random.uniform(0, 2 * math.pi)
-                speed = random.uniform(1, 2)
-                new_particles.append(StableParticle(p.x, p.y, (0, 255, 0), "Electron", 
-                                                    vx=speed * math.cos(angle), 
-                                                    vy=speed * math.sin(angle)))
-                
-                # Faísca para representar os neutrinos
-                for _ in range(3): self.sparks.append(QuantumSpark(p.x, p.y, (0, 0, 255)))
+        # No modo em lote, todos os sorteios saem de um único job no simulador
+        batch = None
+        if self.quantum_decay_mode == "qiskit_batch":
+            batch = self.run_quantum_decay_batch(self.stable_particles)
+
+        # Cada tipo instável tem uma entrada na tabela de decaimento (chance, método)
+        kinds = self.stable_particles.columns["kind"][:len(self.stable_particles)].tolist()
+        for p, kind in zip(list(self.stable_particles), kinds):
+            rule = self.decay_handlers.get(kind)
+            if rule is None or p.is_dead:
+                continue
+            chance, handler = rule
+            if self.decay_check(p, chance, batch):
+                self.stable_particles.kill(p)
+                handler(p, new_particles)
                 
-                print("Decaimento Fraco Final: Múon Negativo -> Elétron (+ 2 Neutrinos, simplificado)")
-                self.add_message("Decaimento Fraco Final: Múon Negativo -> Elétron (+ 2 Neutrinos, simplificado)")
-                
-        # Aplica as alterações
-        self.stable_particles = [p for p in self.stable_particles if p not in particles_to_remove]
+        # A partícula que decaiu sai na compactação do fim do tick
         self.stable_particles.extend(new_particles)
 
+    # --- Decaimentos (ver reactions.DECAY_TABLE) ---
+
+    def decay_neutron(self, p, new_particles):
+        """Decaimento Beta do Nêutron (Neutron -> Proton + Electron)."""
+        # Cria um Próton no lugar
+        new_particles.append(StableParticle(p.x, p.y, (255, 255, 0), "Proton", vx=p.vx, vy=p.vy, game_ref=self))
+        # Cria um Elétron (Beta)
+        new_particles.append(StableParticle(p.x + 5, p.y + 5, (0, 255, 0), "Electron", vx=self.rng.decay.uniform(-1, 1), vy=self.rng.decay.uniform(-1, 1), game_ref=self))
+        self.emit_event(EventKind.NEUTRON_DECAY, p.x, p.y, (ParticleKind.NEUTRON,),
+                        (ParticleKind.PROTON, ParticleKind.ELECTRON))
+        # Faísca para representar a energia liberada
+        self.emit_sparks(p.x, p.y, (100, 100, 255), 5)
+
+    def decay_strange(self, p, new_particles):
+        """Decaimento do Quark Estranho (Strange -> Up/Down)."""
+        # Strange decai principalmente para UP (cerca de 94% de chance)
+        if self.rng.decay.random() < 0.94:
+            new_type = "Quark_UP"
+            new_color = self.get_color_for_state("Red")
+        else:
+            new_type = "Quark_DOWN"
+            new_color = self.get_color_for_state("Blue")
+
+        # Cria o novo Quark (mais leve)
+        new_particles.append(StableParticle(p.x, p.y, new_color, new_type, vx=p.vx, vy=p.vy, game_ref=self))
+        
+        # Energia liberada (W boson, leptons, etc.) simplificada para um fóton
+        self.emit_photons(p.x, p.y)
+        self.emit_event(EventKind.STRANGE_DECAY, p.x, p.y, (ParticleKind.QUARK_STRANGE,), (KIND_BY_NAME[new_type],))
+
+    def decay_lambda(self, p, new_particles):
+        """Decaimento do Bárion Lambda (Lambda -> Proton + Pion Negativo)."""
+        # Cria um Próton (carga +1, cor amarela)
+        new_particles.append(StableParticle(p.x, p.y, (255, 255, 0), "Proton", vx=p.vx, vy=p.vy, game_ref=self))
+        
+        # Cria um Píon Negativo (carga -1, cor rosa para contraste)
+        new_particles.append(StableParticle(p.x + 5, p.y + 5, (255, 100, 100), "Pion_MINUS", vx=self.rng.decay.uniform(-1, 1), vy=self.rng.decay.uniform(-1, 1), game_ref=self))
+
+        self.emit_event(EventKind.LAMBDA_DECAY, p.x, p.y, (ParticleKind.LAMBDA,),
+                        (ParticleKind.PROTON, ParticleKind.PION_MINUS))
+        # Faísca para representar a energia liberada
+        self.emit_sparks(p.x, p.y, (180, 0, 180), 10)
+
+    def decay_pion(self, p, new_particles):
+        """Decaimento do Pion Minus (Pion -> Antineutrino + Muon Negativo)."""
+        # Cria um Múon Negativo (cor diferente, ex: ciano)
+        new_particles.append(StableParticle(p.x, p.y, (0, 255, 255), "Muon_MINUS", vx=p.vx, vy=p.vy, game_ref=self))
+        
+        # Adicionamos uma faísca/fóton para o Antineutrino (invisível)
+        self.emit_photons(p.x, p.y)
+        
+        self.emit_event(EventKind.PION_DECAY, p.x, p.y, (ParticleKind.PION_MINUS,), (ParticleKind.MUON_MINUS,))
+
+    def decay_muon(self, p, new_particles):
+        """Decaimento do Muon Negativo (Muon -> Eletron + Antineutrino)."""
+        # Cria o Elétron! (o produto final da cadeia)
+        # Lembre-se de dar uma velocidade de ejeção isótropa
+        angle = self.rng.decay.uniform(0, 2 * math.pi)
+        speed = self.rng.decay.uniform(1, 2)
+        new_particles.append(StableParticle(p.x, p.y, (0, 255, 0), "Electron", 
+                                            vx=speed * math.cos(angle), 
+                                            vy=speed * math.sin(angle), game_ref=self))
+        
+        # Faísca para representar os neutrinos
+        self.emit_sparks(p.x, p.y, (0, 0, 255), 3)
+        
+        self.emit_event(EventKind.MUON_DECAY, p.x, p.y, (ParticleKind.MUON_MINUS,), (ParticleKind.ELECTRON,))
+
 # -----------------------
 # Visual (pygame)
 # -----------------------
 
-pygame.init()
-
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
+def init_display():
+    """Abre a janela do jogo. Só o modo interativo precisa dela."""
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Laboratório Quântico")
+    font = pygame.font.SysFont("Arial", 20)
+    return screen, font
 
-pygame.display.set_caption("Laboratório Quântico")
-font = pygame.font.SysFont("Arial", 20)
-clock = pygame.time.Clock()
 
-def draw_hud(game):
+def draw_hud(screen, hud, game):
+    """Desenha o HUD pelo HudRenderer: só textos que mudaram são renderizados de novo."""
     hud_x_offset = 20
     y_offset = 30
+    title_color = (0, 255, 255)
+    hud.begin()
     
     # Título
-    mission_title = font.render("LABORATÓRIO: Manipule Partículas", True, (0, 255, 255))
-    screen.blit(mission_title, (hud_x_offset, y_offset))
+    hud.label("LABORATÓRIO: Manipule Partículas", title_color, (hud_x_offset, y_offset))
     y_offset += 40
     
     # Nível de Caos
-    r_text = font.render(f"Nível de Caos (r): {game.r:.4f}", True, (255, 255, 255))
-    screen.blit(r_text, (hud_x_offset, y_offset))
+    hud.value("r", f"Nível de Caos (r): {game.r:.4f}", (255, 255, 255), (hud_x_offset, y_offset))
     y_offset += 40
 
-    # Contagem de Partículas
-    counts = {}
-    for p in game.stable_particles:
-        counts[p.particle_type] = counts.get(p.particle_type, 0) + 1
+    # Contagem de Partículas (contadores do registro, sem percorrer a população)
+    counts = game.registry.particles.counts
 
     # Partículas Estáveis
-    stable_title = font.render("Partículas Estáveis", True, (0, 255, 255))
-    screen.blit(stable_title, (hud_x_offset, y_offset))
+    hud.label("Partículas Estáveis", title_color, (hud_x_offset, y_offset))
     y_offset += 30
     for p_type in ["Proton", "Neutron", "Lambda", "Deuterium", "Deuterium Atom", "Hydrogen Atom", "Electron", "Positron"]:
-        count = counts.get(p_type, 0)
-        text = font.render(f"  {p_type}: {count}", True, (200, 200, 200))
-        screen.blit(text, (hud_x_offset, y_offset))
+        count = counts[PARTICLE_TYPE_CODES[p_type]]
+        hud.value(p_type, f"  {p_type}: {count}", (200, 200, 200), (hud_x_offset, y_offset))
         y_offset += 25
     
     y_offset += 15
@@ -1112,60 +1815,54 @@ def draw_hud(game):
     # Assume que a lista de fótons é game.photons
     photon_count = len(game.photons) 
     
-    photon_title = font.render("Partículas de Campo", True, (0, 255, 255))
-    screen.blit(photon_title, (hud_x_offset, y_offset))
+    hud.label("Partículas de Campo", title_color, (hud_x_offset, y_offset))
     y_offset += 30
     
-    photon_text = font.render(f"  Fótons: {photon_count}", True, (255, 255, 0)) # Fótons em amarelo para destaque
-    screen.blit(photon_text, (hud_x_offset, y_offset))
+    hud.value("photons", f"  Fótons: {photon_count}", (255, 255, 0), (hud_x_offset, y_offset)) # Fótons em amarelo para destaque
     y_offset += 25
     
     y_offset += 15
 
     # Quarks
-    quark_title = font.render("Quarks", True, (0, 255, 255))
-    screen.blit(quark_title, (hud_x_offset, y_offset))
+    hud.label("Quarks", title_color, (hud_x_offset, y_offset))
     y_offset += 30
     quark_types = ["Quark_UP", "Quark_DOWN", "Quark_STRANGE"]
     for q_type in quark_types:
-        count = counts.get(q_type, 0)
-        text = font.render(f"  {q_type.replace('Quark_', '')}: {count}", True, (150, 150, 150))
-        screen.blit(text, (hud_x_offset, y_offset))
+        count = counts[PARTICLE_TYPE_CODES[q_type]]
+        hud.value(q_type, f"  {q_type.replace('Quark_', '')}: {count}", (150, 150, 150), (hud_x_offset, y_offset))
         y_offset += 25
 
     # Mesons
-    meson_title = font.render("Mésons e Léptons Instáveis", True, (0, 255, 255)) # Renomeei o título para ser mais preciso
-    screen.blit(meson_title, (hud_x_offset, y_offset))
+    hud.label("Mésons e Léptons Instáveis", title_color, (hud_x_offset, y_offset)) # Renomeei o título para ser mais preciso
     y_offset += 30
     quark_types = ["Pion_MINUS","Muon_MINUS"]
     for q_type in quark_types:
-        count = counts.get(q_type, 0)
+        count = counts[PARTICLE_TYPE_CODES[q_type]]
         # Substituí 'Meson_' por um prefixo vazio ou 'Pion'/'Muon' para simplificar a exibição:
         display_name = q_type.replace('Pion_MINUS', 'Píon-').replace('Muon_MINUS', 'Múon-') 
-        text = font.render(f"  {display_name}: {count}", True, (150, 150, 150))
-        screen.blit(text, (hud_x_offset, y_offset))
+        hud.value(q_type, f"  {display_name}: {count}", (150, 150, 150), (hud_x_offset, y_offset))
         y_offset += 25
 
     # Nova métrica
     y_offset += 40
-    metric_title = font.render("Métricas de Estabilização", True, (0, 255, 255))
-    screen.blit(metric_title, (hud_x_offset, y_offset))
+    hud.label("Métricas de Estabilização", title_color, (hud_x_offset, y_offset))
     y_offset += 30
     
     ratio = 0
     if game.matter_created > 0:
         ratio = game.matter_stabilized / game.matter_created * 100
     
-    matter_text = font.render(f"Matéria Criada: {game.matter_created}", True, (200, 200, 200))
-    screen.blit(matter_text, (hud_x_offset, y_offset))
+    hud.value("created", f"Matéria Criada: {game.matter_created}", (200, 200, 200), (hud_x_offset, y_offset))
     y_offset += 25
     
-    stabilized_text = font.render(f"Matéria Estabilizada: {game.matter_stabilized}", True, (200, 200, 200))
-    screen.blit(stabilized_text, (hud_x_offset, y_offset))
+    hud.value("stabilized", f"Matéria Estabilizada: {game.matter_stabilized}", (200, 200, 200), (hud_x_offset, y_offset))
     y_offset += 25
     
-    ratio_text = font.render(f"Taxa de Estabilização: {ratio:.2f}%", True, (0, 255, 0) if ratio > 0 else (200, 200, 200))
-    screen.blit(ratio_text, (hud_x_offset, y_offset))
+    hud.value("ratio", f"Taxa de Estabilização: {ratio:.2f}%", (0, 255, 0) if ratio > 0 else (200, 200, 200),
+              (hud_x_offset, y_offset))
+
+    # Um único blit do painel (recomposto apenas quando alguma linha mudou)
+    hud.finish(screen)
 
     # --- NOVO: Área de Log Dinâmico (Substituindo a DICA) ---
     
@@ -1183,8 +1880,8 @@ def draw_hud(game):
         # Assumindo que o game.message_duration seja 300 (5 segundos)
         alpha = min(255, int(255 * (msg['timer'] / 60)))
         
-        # 2. Renderiza o texto
-        text_surface = font.render(msg['text'], True, (255, 255, 255))
+        # 2. Reaproveita o texto já renderizado; o fade é só o alfa da Surface
+        text_surface = hud.message(msg['text'])
         text_surface.set_alpha(alpha)
         
         # 3. Calcula a posição centralizada na parte inferior da tela
@@ -1198,75 +1895,214 @@ def draw_hud(game):
     # --------------------------------------------------------
 
 
-def main():
-    game = QuantumCollectorGame()
-    running = True
-    mouse_pressed = False
-    
-    # Adicione a variável para rastrear o estado do mapa logístico
-    game.logistic_x = random.uniform(0.1, 0.9)
-    
-    # Adicione a variável r para o nível de caos (se ainda não estiver na classe)
-    # Se já estiver, remova esta linha
-    game.r = 4.0 
-
-    while running:
-        current_time = pygame.time.get_ticks()
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_pressed = True
-                game.mouse_pos = pygame.mouse.get_pos()
-            
-            if event.type == pygame.MOUSEBUTTONUP:
-                mouse_pressed = False
-                game.mouse_pos = None
-        
-        # --- Nova Lógica de Spawn ---
-        # Atualiza o valor do mapa logístico a cada frame
-        game.logistic_x = game.r * game.logistic_x * (1 - game.logistic_x)
-
-        # Usa a probabilidade do mapa logístico para decidir se cria uma flutuação
-        # O fator de 0.5 é um multiplicador para ajustar a frequência de spawn
-        # Sinta-se à vontade para ajustar esse valor para o que funcionar melhor
-        if random.random() < game.logistic_x * SPAWN_MULTIPLIER:
-            game.spawn_fluctuation()
-
-        game.check_interactions(mouse_pressed)
-        game.check_for_quantum_decay()
-
-        for f in game.fluctuations:
-            f.update()
-        for p in game.stable_particles:
-            p.update()
-        for s in game.sparks:
-            s.update()
-        for ph in game.photons:
-            ph.update()
-
-        # Desenho
+def render(screen, hud, game):
+    """Desenha o estado atual da simulação."""
+    profile = game.profiler.scope
+    with profile("draw"):
         screen.fill(BG_COLOR)
+        # Animações seguem o relógio da simulação (o mesmo estado desenha sempre igual)
+        now = game.clock.get_ticks()
         for f in game.fluctuations:
-            f.draw(screen)
+            f.draw(screen, now)
         for p in game.stable_particles:
-            p.draw(screen)
-        for s in game.sparks:
-            s.draw(screen)
-        for ph in game.photons:
-            ph.draw(screen)
+            p.draw(screen, now)
+        if game.effect_backend == "arrays":
+            # Um desenho em lote por emissor
+            game.sparks.draw(screen)
+            game.photons.draw(screen)
+        else:
+            for s in game.sparks:
+                s.draw(screen)
+            for ph in game.photons:
+                ph.draw(screen)
+    with profile("hud"):
+        draw_hud(screen, hud, game)
+
+
+def draw_speed_status(screen, hud, ticks_per_frame, turbo, ticks_this_frame):
+    """Indicador de velocidade da simulação no canto superior direito."""
+    if turbo:
+        label = f"TURBO: {ticks_this_frame} ticks/quadro"
+    elif ticks_per_frame != 1:
+        label = f"Velocidade: {ticks_per_frame}x"
+    else:
+        return
+    text = hud.message(label, (255, 200, 0))
+    screen.blit(text, text.get_rect(topright=(WIDTH - 20, 30)))
+
+
+def draw_profiler_overlay(screen, hud, profiler):
+    """
+    Percentis por etapa (ms) no canto superior direito, abaixo do indicador de
+    velocidade. Usa um HudRenderer próprio: o resumo do profiler só muda a cada
+    `summary_interval` quadros, então o painel quase sempre é só um blit.
+    """
+    x = WIDTH - 400
+    y_offset = 60
+    hud.begin()
+    hud.label("Perfil por etapa (ms): p50 / p95 / p99", (0, 255, 255), (x, y_offset))
+    y_offset += 30
+    for name, (p50, p95, p99) in profiler.summary.items():
+        hud.value(name, f"{name}: {p50:.2f} / {p95:.2f} / {p99:.2f}", (200, 200, 200), (x, y_offset))
+        y_offset += 25
+    hud.label("F3: fechar  |  F4: gravar trace", (150, 150, 150), (x, y_offset + 5))
+    hud.finish(screen)
+
+
+def save_frame_trace(game):
+    """Grava o trace dos últimos quadros em PROFILER_TRACE_PATH."""
+    count = game.profiler.export_chrome_trace(PROFILER_TRACE_PATH)
+    game.add_message(f"Trace gravado: {PROFILER_TRACE_PATH} ({count} eventos)")
+    print(f"Trace de {len(game.profiler.frames)} quadros gravado em {PROFILER_TRACE_PATH}")
+
+
+def main(seed=None):
+    """
+    Laço interativo com passo fixo: a simulação avança em ticks de
+    1 / SIM_TICK_RATE segundos, acumulados a partir do tempo real e
+    multiplicados pela velocidade (ticks por quadro), e a janela mostra
+    sempre o estado mais recente. No modo turbo (tecla T), cada quadro roda
+    quantos ticks couberem no orçamento de um quadro, limitado só pela CPU.
+
+    F3 liga o profiler por etapa (percentis na tela) e F4 grava o trace dos
+    últimos quadros, que também é gravado ao sair se o profiler estiver ligado.
+    """
+    screen, font = init_display()
+    hud = HudRenderer(font)
+    profiler_hud = HudRenderer(font)
+    frame_clock = pygame.time.Clock()
+    game = QuantumCollectorGame(seed=seed)
+    print(f"Semente: {game.rng.seed}")
+    running = True
+    mouse_pressed = False
 
-        game.sparks = [s for s in game.sparks if s.lifetime > 0]
-        game.photons = [ph for ph in game.photons if ph.lifetime > 0]
+    tick_dt = 1.0 / SIM_TICK_RATE
+    frame_budget = 1.0 / RENDER_FPS
+    ticks_per_frame = max(1, SIM_TICKS_PER_FRAME)
+    turbo = False
+    accumulator = 0.0
+    last_time = time.perf_counter()
+    profiler = game.profiler
+    profile = profiler.scope
+
+    try:
+        while running:
+            profiler.begin_frame()
+            with profile("events"):
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        running = False
+
+                    if event.type == pygame.MOUSEBUTTONDOWN:
+                        mouse_pressed = True
+                        game.mouse_pos = pygame.mouse.get_pos()
+
+                    if event.type == pygame.MOUSEBUTTONUP:
+                        mouse_pressed = False
+                        game.mouse_pos = None
+
+                    if event.type == pygame.KEYDOWN:
+                        if event.key == pygame.K_t:
+                            turbo = not turbo
+                        elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+                            ticks_per_frame = min(ticks_per_frame * 2, 64)
+                        elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                            ticks_per_frame = max(ticks_per_frame // 2, 1)
+                        elif event.key == pygame.K_F3:
+                            profiler.toggle()
+                        elif event.key == pygame.K_F4:
+                            save_frame_trace(game)
+
+            now = time.perf_counter()
+            frame_time = min(now - last_time, MAX_FRAME_TIME)
+            last_time = now
+
+            ticks_this_frame = 0
+            with profile("simulation"):
+                if turbo:
+                    # Roda ticks até esgotar o orçamento do quadro (sempre pelo menos um)
+                    deadline = now + frame_budget
+                    while True:
+                        game.step(mouse_pressed)
+                        ticks_this_frame += 1
+                        if time.perf_counter() >= deadline:
+                            break
+                    accumulator = 0.0
+                else:
+                    accumulator += frame_time * ticks_per_frame
+                    # Os ticks também param no orçamento do quadro: se a CPU não
+                    # acompanha a velocidade pedida, o atraso restante é descartado
+                    # (a simulação fica mais lenta que o pedido) em vez de passar
+                    # para o quadro seguinte, que demoraria ainda mais
+                    deadline = now + frame_budget
+                    while accumulator >= tick_dt:
+                        if ticks_this_frame and time.perf_counter() >= deadline:
+                            accumulator = 0.0
+                            break
+                        game.step(mouse_pressed)
+                        ticks_this_frame += 1
+                        accumulator -= tick_dt
+            # Eventos das reações do quadro: log na tela, console e arquivo, em lote
+            with profile("dispatch"):
+                game.events.dispatch()
+
+            render(screen, hud, game)
+            draw_speed_status(screen, hud, ticks_per_frame, turbo, ticks_this_frame)
+            if profiler.enabled:
+                draw_profiler_overlay(screen, profiler_hud, profiler)
+            with profile("flip"):
+                pygame.display.flip()
+            with profile("wait"):
+                frame_clock.tick(RENDER_FPS)
+            profiler.end_frame()
+    finally:
+        # Grava no log os eventos ainda pendentes e fecha os arquivos dos assinantes
+        game.events.close()
+
+    if profiler.enabled:
+        save_frame_trace(game)
+    if USE_SPRITE_CACHE:
+        stats = SPRITE_CACHE.stats()
+        print(f"Cache de sprites: {stats['hit_rate']:.1%} de acertos "
+              f"({stats['hits']} acertos, {stats['misses']} faltas, {stats['evictions']} descartes, "
+              f"{stats['size']} sprites)")
+    pygame.quit()
 
-        draw_hud(game)
 
-        pygame.display.flip()
-        clock.tick(60)
+def run_headless(ticks, seed=None):
+    """
+    Roda a simulação sem janela, o mais rápido possível, e informa a vazão,
+    a semente e o resumo do estado final (para comparar execuções).
+
+    Returns:
+        float: Ticks por segundo.
+    """
+    game = QuantumCollectorGame(seed=seed)
+    start = time.perf_counter()
+    try:
+        for _ in range(ticks):
+            game.step()
+            game.events.dispatch()
+    finally:
+        game.events.close()
+    elapsed = time.perf_counter() - start
+    rate = ticks / elapsed if elapsed > 0 else float("inf")
+    print(f"{ticks} ticks em {elapsed:.2f}s ({rate:.1f} ticks/s) | "
+          f"partículas: {len(game.stable_particles)} | flutuações: {len(game.fluctuations)}")
+    print(f"semente: {game.rng.seed} | estado: {game.state_digest()[:16]}")
+    return rate
 
-    pygame.quit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Laboratório Quântico")
+    parser.add_argument("--headless", action="store_true",
+                        help="Roda apenas a simulação, sem janela (servidores, execuções em lote)")
+    parser.add_argument("--ticks", type=int, default=1000,
+                        help="Número de ticks simulados no modo headless")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Semente da simulação (a mesma semente reproduz a execução)")
+    args = parser.parse_args()
+    if args.headless:
+        run_headless(args.ticks, args.seed)
+    else:
+        main(args.seed)
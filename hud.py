@@ -0,0 +1,105 @@
+import pygame
+
+# -----------------------
+# HUD com Cache de Texto
+# -----------------------
+
+class HudRenderer:
+    """
+    Desenha o HUD sem rasterizar texto a cada quadro.
+
+    - Títulos fixos (label) são renderizados uma única vez por (texto, cor).
+    - Linhas de valor (value) guardam o último texto exibido e só são
+      renderizadas de novo quando o texto (ou seja, o número) muda.
+    - Todas as linhas do quadro são compostas em um único painel, reaproveitado
+      enquanto nenhuma linha muda; cada quadro custa um blit.
+    - O log de mensagens reutiliza a Surface de cada texto e aplica o fade
+      com set_alpha, sem renderizá-lo de novo.
+
+    As linhas são copiadas para o painel transparente com BLEND_RGBA_MAX (cópia
+    exata de cor e alfa, já que não se sobrepõem), então um blit do painel
+    equivale ao blit direto de cada linha na tela (a menos de 1 nível de cor
+    nas bordas suavizadas, por causa da aceleração RLE do painel).
+
+    Uso por quadro: begin(), label(...)/value(...) na ordem do layout, finish(screen).
+
+    Args:
+        font (pygame.font.Font): Fonte usada em todos os textos.
+        max_messages (int): Textos de mensagem mantidos no cache.
+    """
+
+    def __init__(self, font, max_messages=64):
+        self.font = font
+        self.max_messages = max_messages
+        self.labels = {} # (texto, cor) -> Surface
+        self.values = {} # chave da linha -> (texto, cor, Surface)
+        self.messages = {} # (texto, cor) -> Surface (alfa ajustado a cada desenho)
+        self.panel = None
+        self.panel_pos = (0, 0)
+        self.renders = 0 # Chamadas a font.render (para medir o cache)
+        self.compositions = 0
+        self._items = []
+        self._composed = None
+
+    def _render(self, text, color):
+        self.renders += 1
+        return self.font.render(text, True, color)
+
+    def text(self, text, color):
+        """Surface de um texto fixo, renderizada uma única vez."""
+        surface = self.labels.get((text, color))
+        if surface is None:
+            surface = self._render(text, color)
+            self.labels[(text, color)] = surface
+        return surface
+
+    def begin(self):
+        self._items = []
+
+    def label(self, text, color, pos):
+        """Acrescenta um texto fixo (título) ao painel."""
+        self._items.append((self.text(text, color), pos))
+
+    def value(self, key, text, color, pos):
+        """Acrescenta a linha `key`, renderizada de novo só se o texto ou a cor mudarem."""
+        cached = self.values.get(key)
+        if cached is None or cached[0] != text or cached[1] != color:
+            cached = (text, color, self._render(text, color))
+            self.values[key] = cached
+        self._items.append((cached[2], pos))
+
+    def finish(self, screen):
+        """Recompõe o painel se alguma linha mudou e o desenha na tela."""
+        if self._items != self._composed:
+            self._compose()
+        if self.panel is not None:
+            screen.blit(self.panel, self.panel_pos)
+
+    def _compose(self):
+        self._composed = self._items
+        self.compositions += 1
+        if not self._items:
+            self.panel = None
+            return
+        left = min(x for _, (x, _) in self._items)
+        top = min(y for _, (_, y) in self._items)
+        right = max(x + surface.get_width() for surface, (x, _) in self._items)
+        bottom = max(y + surface.get_height() for surface, (_, y) in self._items)
+        panel = pygame.Surface((right - left, bottom - top), pygame.SRCALPHA)
+        for surface, (x, y) in self._items:
+            panel.blit(surface, (x - left, y - top), special_flags=pygame.BLEND_RGBA_MAX)
+        # RLE: o blit pula os trechos transparentes (a maior parte do painel)
+        panel.set_alpha(255, pygame.RLEACCEL)
+        self.panel = panel
+        self.panel_pos = (left, top)
+
+    def message(self, text, color=(255, 255, 255)):
+        """Surface de uma mensagem do log (o fade é aplicado com set_alpha a cada desenho)."""
+        surface = self.messages.get((text, color))
+        if surface is None:
+            if len(self.messages) >= self.max_messages:
+                self.messages.clear()
+            self.renders += 1
+            surface = self.font.render(text, True, color)
+            self.messages[(text, color)] = surface
+        return surface
@@ -0,0 +1,284 @@
+import numpy as np
+
+# -----------------------
+# Armazenamento Colunar de Partículas
+# -----------------------
+
+# Bits da coluna "flags"
+FLAG_DEAD = 1
+FLAG_CAPTURED = 2
+FLAG_LONG_LIVED = 4
+FLAG_NEW = 8
+FLAG_BLINK = 16
+
+# Colunas numéricas (nome -> dtype, valor padrão)
+COLUMNS = {
+    "x": (np.float64, 0.0),
+    "y": (np.float64, 0.0),
+    "vx": (np.float64, 0.0),
+    "vy": (np.float64, 0.0),
+    "mass": (np.float64, 1.0),
+    "charge": (np.float64, 0.0),
+    "size": (np.float64, 10.0),
+    "angle": (np.float64, 0.0),
+    "spin_speed": (np.float64, 0.0),
+    "chaos_level": (np.float64, 0.0),
+    "kind": (np.int16, -1),
+    "lifetime": (np.int32, 0),
+    "decay_countdown": (np.int32, 0),
+    "new_timer": (np.int32, 0),
+    "animation_timer": (np.int32, 0),
+    "flags": (np.uint8, FLAG_LONG_LIVED | FLAG_BLINK),
+}
+
+COLUMN_DEFAULTS = {name: default for name, (_, default) in COLUMNS.items()}
+
+
+class StoreView:
+    """
+    Base das entidades cujos dados numéricos vivem em um ParticleStore.
+
+    Enquanto a entidade não pertence a nenhum store (ex.: recém-criada, ainda
+    na lista `new_particles`), os valores ficam em `_local`. Ao ser adicionada
+    ao store, os valores são copiados para uma linha das colunas e os
+    atributos passam a ler/escrever diretamente nos arrays.
+    """
+
+    __slots__ = ("_store", "_slot", "_local")
+
+    def __init__(self):
+        self._store = None
+        self._slot = -1
+        self._local = dict(COLUMN_DEFAULTS)
+
+
+def column_property(name):
+    """Propriedade que lê/escreve a coluna `name` do store da entidade."""
+    def fget(self):
+        store = self._store
+        if store is None:
+            return self._local[name]
+        return store.columns[name].item(self._slot)
+
+    def fset(self, value):
+        store = self._store
+        if store is None:
+            self._local[name] = value
+        else:
+            store.columns[name][self._slot] = value
+
+    return property(fget, fset)
+
+
+def flag_property(bit):
+    """Propriedade booleana sobre um bit da coluna `flags`."""
+    def fget(self):
+        store = self._store
+        if store is None:
+            flags = self._local["flags"]
+        else:
+            flags = store.columns["flags"].item(self._slot)
+        return bool(flags & bit)
+
+    def fset(self, value):
+        store = self._store
+        if store is None:
+            flags = self._local["flags"]
+            self._local["flags"] = (flags | bit) if value else (flags & ~bit)
+        else:
+            flags = store.columns["flags"]
+            if value:
+                flags[self._slot] |= bit
+            else:
+                flags[self._slot] &= 0xFF & ~bit # ~bit é negativo e não cabe em uint8
+
+    return property(fget, fset)
+
+
+class ParticleStore:
+    """
+    População de partículas em formato structure-of-arrays (uma coluna NumPy
+    por atributo). Substitui as listas simples do jogo: aceita append, extend,
+    remove, iteração, len e indexação, mas a remoção é O(1) (swap-remove: a
+    última linha ocupa o lugar da removida, e o slot livre no fim é reutilizado
+    pela próxima inserção).
+
+    A ordem de iteração é a ordem dos slots. `version` muda a cada inserção ou
+    remoção; `layout` só muda quando uma remoção move a última linha para o
+    slot livre. Enquanto `layout` não muda, cada linha continua no mesmo slot
+    (inserções só acrescentam linhas no fim e remover a última só as tira),
+    o que permite atualizar aos poucos estruturas indexadas por slot
+    guardadas entre um tick e outro.
+
+    Args:
+        capacity (int): Linhas alocadas inicialmente (dobra quando enche).
+        counter (KindCounter, opcional): Avisado de cada inserção e remoção,
+            com o código de tipo da entidade.
+    """
+
+    def __init__(self, capacity=256, counter=None):
+        self.capacity = max(1, capacity)
+        self.count = 0
+        self.version = 0
+        self.layout = 0
+        self.counter = counter
+        self.entities = []
+        self.columns = {name: np.full(self.capacity, default, dtype=dtype)
+                        for name, (dtype, default) in COLUMNS.items()}
+
+    # --- Protocolo de lista ---
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(self.entities)
+
+    def __getitem__(self, index):
+        return self.entities[index]
+
+    def __contains__(self, entity):
+        return getattr(entity, "_store", None) is self
+
+    def __bool__(self):
+        return self.count > 0
+
+    def _grow(self):
+        new_capacity = self.capacity * 2
+        for name, (dtype, default) in COLUMNS.items():
+            column = np.full(new_capacity, default, dtype=dtype)
+            column[:self.count] = self.columns[name][:self.count]
+            self.columns[name] = column
+        self.capacity = new_capacity
+
+    def append(self, entity):
+        if entity._store is not None:
+            raise ValueError("A entidade já pertence a um ParticleStore")
+        if self.count == self.capacity:
+            self._grow()
+
+        slot = self.count
+        local = entity._local
+        for name, column in self.columns.items():
+            column[slot] = local[name]
+
+        entity._store = self
+        entity._slot = slot
+        entity._local = None
+        self.entities.append(entity)
+        self.count += 1
+        self.version += 1
+        if self.counter is not None:
+            self.counter.added(local["kind"])
+
+    def extend(self, entities):
+        for entity in entities:
+            self.append(entity)
+
+    def remove(self, entity):
+        if entity._store is not self:
+            raise ValueError("A entidade não pertence a este ParticleStore")
+        self._remove_slot(entity._slot)
+
+    def remove_many(self, entities):
+        """
+        Remove várias entidades de uma vez. Os slots são removidos do maior
+        para o menor, o que torna o resultado independente da ordem (ou do
+        tipo de coleção) em que as entidades foram passadas.
+        """
+        slots = sorted({e._slot for e in entities if e._store is self}, reverse=True)
+        for slot in slots:
+            self._remove_slot(slot)
+
+    def _remove_slot(self, slot):
+        entity = self.entities[slot]
+
+        # A entidade removida volta a guardar seus próprios valores
+        entity._local = {name: column.item(slot) for name, column in self.columns.items()}
+        entity._store = None
+        entity._slot = -1
+
+        last = self.count - 1
+        if slot != last:
+            for column in self.columns.values():
+                column[slot] = column[last]
+            moved = self.entities[last]
+            moved._slot = slot
+            self.entities[slot] = moved
+            self.layout += 1
+        self.entities.pop()
+        self.count -= 1
+        self.version += 1
+        if self.counter is not None:
+            self.counter.removed(entity._local["kind"])
+
+    # --- Remoção adiada ---
+
+    def kill(self, entity):
+        """
+        Marca a entidade como morta (FLAG_DEAD) sem tirá-la do store: ela para
+        de se mover e de reagir, e sai de fato no próximo compact(). Matar a
+        mesma entidade duas vezes não tem efeito.
+        """
+        if entity._store is not self:
+            raise ValueError("A entidade não pertence a este ParticleStore")
+        self.columns["flags"][entity._slot] |= FLAG_DEAD
+
+    def compact(self):
+        """
+        Remove de uma vez todas as entidades mortas (swap-remove, do maior slot
+        para o menor, O(1) cada).
+
+        Returns:
+            int: Quantas entidades foram removidas.
+        """
+        dead = np.flatnonzero(self.columns["flags"][:self.count] & FLAG_DEAD)
+        for slot in dead[::-1].tolist():
+            self._remove_slot(slot)
+        return len(dead)
+
+    # --- Atualização vetorizada ---
+
+    def step(self, width, height):
+        """
+        Avança um quadro para toda a população de uma só vez: rotação,
+        movimento, wrap-around toroidal, contagem regressiva de decaimento,
+        piscar de criação e tempo de vida. Equivale a chamar update() em cada
+        entidade.
+        """
+        n = self.count
+        if n == 0:
+            return
+        c = self.columns
+        flags = c["flags"][:n]
+        alive = (flags & FLAG_DEAD) == 0
+
+        c["angle"][:n] += np.where(alive, c["spin_speed"][:n], 0.0)
+        c["animation_timer"][:n] += alive
+
+        # 1. Movimento (partículas capturadas ficam paradas)
+        moving = alive & ((flags & FLAG_CAPTURED) == 0)
+        x = c["x"][:n]
+        y = c["y"][:n]
+        x += np.where(moving, c["vx"][:n], 0.0)
+        y += np.where(moving, c["vy"][:n], 0.0)
+
+        # 2. Wrap-around
+        x[:] = np.where(alive & (x < 0), width, np.where(alive & (x > width), 0, x))
+        y[:] = np.where(alive & (y < 0), height, np.where(alive & (y > height), 0, y))
+
+        # 3. Contagem regressiva das instáveis
+        c["decay_countdown"][:n] -= alive & ((flags & FLAG_LONG_LIVED) == 0)
+
+        # 4. Piscar de criação
+        is_new = alive & ((flags & FLAG_NEW) != 0)
+        if is_new.any():
+            timers = c["new_timer"][:n]
+            timers -= is_new
+            toggle = is_new & (timers % 10 == 0)
+            flags ^= np.where(toggle, FLAG_BLINK, 0).astype(flags.dtype)
+            done = is_new & (timers <= 0)
+            flags &= np.where(done, ~FLAG_NEW & 0xFF, 0xFF).astype(flags.dtype)
+            flags |= np.where(done, FLAG_BLINK, 0).astype(flags.dtype)
+
+        c["lifetime"][:n] += alive
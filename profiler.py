@@ -0,0 +1,147 @@
+import json
+import time
+from collections import deque
+
+import numpy as np
+
+# -----------------------
+# Profiler por Etapa
+# -----------------------
+
+class _NullScope:
+    """Escopo vazio devolvido com o profiler desligado (nenhuma leitura de relógio)."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SCOPE = _NullScope()
+
+
+class _Scope:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler._record(self.name, self.start, time.perf_counter_ns())
+        return False
+
+
+class FrameProfiler:
+    """
+    Temporizadores por escopo (`with profiler.scope("etapa"):`) agrupados por
+    quadro (begin_frame / end_frame).
+
+    - Para cada etapa, o tempo somado dentro de cada quadro entra em uma
+      janela móvel dos últimos `window` quadros, de onde saem p50/p95/p99
+      (em ms). Quadros em que a etapa não rodou contam como 0, então uma
+      etapa que roda a cada N quadros aparece nos percentis altos.
+    - Os escopos dos últimos `trace_frames` quadros ficam guardados para
+      export_chrome_trace (formato trace_event, aberto pelo chrome://tracing
+      e pelo Perfetto). Escopos aninhados aparecem aninhados no trace.
+
+    Fora de um quadro (profiler desligado, ou simulação rodando sem o laço
+    interativo), scope() devolve um escopo vazio compartilhado, sem ler o
+    relógio: o custo é uma chamada de método. Ligar ou desligar vale a partir
+    do próximo begin_frame.
+
+    Args:
+        enabled (bool): Começa ligado.
+        window (int): Quadros usados nos percentis.
+        trace_frames (int): Quadros mantidos para o trace.
+        summary_interval (int): A cada quantos quadros `summary` é recalculado
+            (o overlay lê `summary` e não precisa renderizar texto todo quadro).
+    """
+
+    def __init__(self, enabled=False, window=240, trace_frames=300, summary_interval=30):
+        self.enabled = enabled
+        self.window = max(1, window)
+        self.summary_interval = max(1, summary_interval)
+        self.samples = {} # etapa -> deque com o tempo (ns) por quadro
+        self.frames = deque(maxlen=max(1, trace_frames)) # eventos (etapa, início, duração) de cada quadro
+        self.summary = {} # etapa -> (p50, p95, p99) em ms
+        self.frame_count = 0
+        self._totals = {}
+        self._events = []
+        self._frame_start = 0
+        self._active = False # dentro de um quadro medido
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        return self.enabled
+
+    def scope(self, name):
+        if not self._active:
+            return _NULL_SCOPE
+        return _Scope(self, name)
+
+    def _record(self, name, start, stop):
+        duration = stop - start
+        self._totals[name] = self._totals.get(name, 0) + duration
+        self._events.append((name, start, duration))
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self._totals = {}
+        self._events = []
+        self._active = True
+        self._frame_start = time.perf_counter_ns()
+
+    def end_frame(self):
+        if not self._active:
+            return
+        self._active = False
+        stop = time.perf_counter_ns()
+        self._record("frame", self._frame_start, stop)
+        for name in self._totals:
+            if name not in self.samples:
+                self.samples[name] = deque(maxlen=self.window)
+        for name, samples in self.samples.items():
+            samples.append(self._totals.get(name, 0))
+        self.frames.append(self._events)
+        self.frame_count += 1
+        if self.frame_count % self.summary_interval == 0:
+            self.summary = self.stats()
+
+    def percentiles(self, name):
+        """(p50, p95, p99) da etapa em ms, na janela atual."""
+        samples = self.samples.get(name)
+        if not samples:
+            return (0.0, 0.0, 0.0)
+        p50, p95, p99 = np.percentile(np.fromiter(samples, dtype=np.float64), (50, 95, 99)) / 1e6
+        return (float(p50), float(p95), float(p99))
+
+    def stats(self):
+        """Percentis de todas as etapas, na ordem em que apareceram."""
+        return {name: self.percentiles(name) for name in self.samples}
+
+    def chrome_trace(self):
+        """Eventos "X" (início + duração, em µs) dos quadros guardados, no formato trace_event."""
+        events = []
+        for frame in self.frames:
+            for name, start, duration in frame:
+                events.append({"name": name, "ph": "X", "ts": start / 1000, "dur": duration / 1000,
+                               "pid": 0, "tid": 0})
+        # Pais antes dos filhos quando começam no mesmo instante
+        events.sort(key=lambda e: (e["ts"], -e["dur"]))
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path):
+        """Grava o trace dos últimos quadros em `path` e devolve quantos eventos foram escritos."""
+        trace = self.chrome_trace()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(trace, f)
+        return len(trace["traceEvents"])
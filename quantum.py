@@ -0,0 +1,322 @@
+import math
+
+import numpy as np
+
+# O Qiskit e o Aer são importados só quando um circuito é de fato montado,
+# transpilado ou executado (cada função importa o que usa): o modo de
+# decaimento padrão nunca toca neles, e importá-los custa centenas de ms e
+# dezenas de MB na inicialização.
+
+# -----------------------
+# Circuitos Quânticos Compartilhados
+# -----------------------
+
+# Assinaturas descrevem como um circuito é montado, sem construí-lo:
+#   ("base", anti)          -> circuito de 1 qubit de uma flutuação (X opcional, H, medida)
+#   ("fused", sig1, sig2)   -> composição de dois circuitos + CX(0, 1) (fusão caótica)
+
+def base_circuit_signature(state):
+    """Assinatura do circuito de uma flutuação no estado de cor `state`."""
+    return ("base", "Anti" in state)
+
+
+def fused_circuit_signature(first, second):
+    """Assinatura do circuito resultante da fusão caótica de duas flutuações."""
+    return ("fused", first, second)
+
+
+def signature_num_qubits(signature):
+    """Número de qubits do circuito descrito, sem precisar construí-lo."""
+    if signature[0] == "base":
+        return 1
+    return signature_num_qubits(signature[1]) + signature_num_qubits(signature[2])
+
+
+class CircuitCache:
+    """
+    Templates de circuitos compartilhados, indexados pela assinatura.
+
+    Só existem dois circuitos base (com ou sem a porta X), e cada fusão é
+    determinada pelas assinaturas das partes, então todas as flutuações com a
+    mesma assinatura apontam para o mesmo objeto. Os circuitos só são
+    construídos quando alguém realmente os consome, e NUNCA devem ser
+    modificados por quem os recebe (use .copy() antes de alterar).
+    """
+
+    def __init__(self):
+        self.circuits = {}
+
+    def get(self, signature):
+        circuit = self.circuits.get(signature)
+        if circuit is None:
+            circuit = self._build(signature)
+            self.circuits[signature] = circuit
+        return circuit
+
+    def _build(self, signature):
+        from qiskit import QuantumCircuit
+
+        if signature[0] == "base":
+            qc = QuantumCircuit(1, 1)
+            if signature[1]:
+                qc.x(0)
+            qc.h(0)
+            qc.measure(0, 0)
+            return qc
+
+        first = self.get(signature[1])
+        second = self.get(signature[2])
+        n1 = first.num_qubits
+        n2 = second.num_qubits
+        combined = QuantumCircuit(n1 + n2, n1 + n2)
+        combined = combined.compose(first, qubits=range(n1))
+        combined = combined.compose(second, qubits=range(n1, n1 + n2))
+        combined.cx(0, 1)
+        return combined
+
+
+# Cache global: os templates não dependem do estado do jogo
+CIRCUIT_CACHE = CircuitCache()
+
+
+# -----------------------
+# Backends de Medição
+# -----------------------
+
+def circuit_key(circuit):
+    """Chave estrutural de um circuito (portas, parâmetros, qubits e clbits)."""
+    return (circuit.num_qubits, circuit.num_clbits, tuple(
+        (instruction.operation.name,
+         tuple(float(p) for p in instruction.operation.params),
+         tuple(circuit.find_bit(q).index for q in instruction.qubits),
+         tuple(circuit.find_bit(c).index for c in instruction.clbits))
+        for instruction in circuit.data
+    ))
+
+
+def outcome_distribution(circuit):
+    """
+    Distribuição exata das medidas de um circuito pequeno, por statevector NumPy.
+
+    O estado é um tensor com um eixo por qubit (eixo i = qubit i). Portas
+    unitárias são aplicadas com a matriz do Qiskit; cada medida divide os
+    ramos possíveis (estado colapsado + bits clássicos), o que também cobre
+    medidas no meio do circuito, como nas fusões caóticas.
+
+    Returns:
+        dict: Bitstring (no formato do Qiskit, clbit 0 à direita) -> probabilidade.
+    """
+    n = circuit.num_qubits
+    state = np.zeros((2,) * n, dtype=complex)
+    state[(0,) * n] = 1.0
+    branches = [(1.0, state, (0,) * circuit.num_clbits)]
+
+    for instruction in circuit.data:
+        operation = instruction.operation
+        qubits = [circuit.find_bit(q).index for q in instruction.qubits]
+        name = operation.name
+
+        if name in ("barrier", "id", "delay"):
+            continue
+
+        if name == "measure":
+            qubit = qubits[0]
+            clbit = circuit.find_bit(instruction.clbits[0]).index
+            measured = []
+            for prob, state, bits in branches:
+                for outcome in (0, 1):
+                    part = np.take(state, outcome, axis=qubit)
+                    weight = float(np.sum(np.abs(part) ** 2))
+                    if weight < 1e-15:
+                        continue
+                    collapsed = np.zeros_like(state)
+                    index = [slice(None)] * n
+                    index[qubit] = outcome
+                    collapsed[tuple(index)] = part / math.sqrt(weight)
+                    new_bits = bits[:clbit] + (outcome,) + bits[clbit + 1:]
+                    measured.append((prob * weight, collapsed, new_bits))
+            branches = measured
+            continue
+
+        # Porta unitária: matriz little-endian do Qiskit (qarg 0 = bit menos significativo)
+        k = len(qubits)
+        gate = np.asarray(operation.to_matrix()).reshape((2,) * (2 * k))
+        axes = list(reversed(qubits))
+        applied = []
+        for prob, state, bits in branches:
+            new_state = np.tensordot(gate, state, axes=(list(range(k, 2 * k)), axes))
+            new_state = np.moveaxis(new_state, list(range(k)), axes)
+            applied.append((prob, new_state, bits))
+        branches = applied
+
+    distribution = {}
+    for prob, _, bits in branches:
+        key = "".join(str(b) for b in reversed(bits))
+        distribution[key] = distribution.get(key, 0.0) + prob
+    return distribution
+
+
+class AnalyticResult:
+    """Imita o Result do Aer (get_counts / get_memory)."""
+
+    def __init__(self, counts, memory=None):
+        self._counts = counts
+        self._memory = memory
+
+    def result(self):
+        return self
+
+    def get_counts(self, circuit=None):
+        return self._counts
+
+    def get_memory(self, circuit=None):
+        if self._memory is None:
+            raise ValueError("Execute com memory=True para obter as medidas individuais")
+        return self._memory
+
+
+class AnalyticBackend:
+    """
+    Backend de medição sem simulador: a distribuição de cada circuito é
+    calculada uma única vez (outcome_distribution) e guardada pela chave
+    estrutural do circuito; as medidas são então sorteadas em lote com o
+    gerador vetorizado do NumPy. Estatisticamente idêntico ao AerSimulator
+    para os circuitos do jogo, e com a mesma interface run(...).result().
+    """
+
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.distributions = {}
+
+    def distribution(self, circuit):
+        key = circuit_key(circuit)
+        cached = self.distributions.get(key)
+        if cached is None:
+            distribution = outcome_distribution(circuit)
+            outcomes = sorted(distribution)
+            probs = np.array([distribution[o] for o in outcomes])
+            cached = (outcomes, probs / probs.sum())
+            self.distributions[key] = cached
+        return cached
+
+    def run(self, circuit, shots=1024, memory=False, **_options):
+        outcomes, probs = self.distribution(circuit)
+        draws = self.rng.choice(len(outcomes), size=shots, p=probs)
+        tallies = np.bincount(draws, minlength=len(outcomes))
+        counts = {o: int(c) for o, c in zip(outcomes, tallies) if c}
+        shot_memory = [outcomes[i] for i in draws.tolist()] if memory else None
+        return AnalyticResult(counts, shot_memory)
+
+
+def create_backend(name, rng=None):
+    """
+    Backend de medição pelo nome: "aer" (AerSimulator) ou "analytic".
+
+    Com `rng` (np.random.Generator), as medidas ficam reproduzíveis: o backend
+    analítico sorteia desse gerador e cada job do Aer recebe dele o seed_simulator.
+    """
+    if name == "analytic":
+        return AnalyticBackend(rng)
+    from qiskit_aer import AerSimulator
+    if rng is not None:
+        return SeededBackend(AerSimulator(), rng)
+    return AerSimulator()
+
+
+class SeededBackend:
+    """
+    Repassa run() ao backend com um seed_simulator novo por job, sorteado de
+    `rng`: jobs diferentes continuam independentes, mas a sequência de
+    medidas se repete com a mesma semente.
+    """
+
+    def __init__(self, backend, rng):
+        self.backend = backend
+        self.rng = rng
+
+    def run(self, circuit, **options):
+        options.setdefault("seed_simulator", int(self.rng.integers(2 ** 31)))
+        return self.backend.run(circuit, **options)
+
+
+def compile_for(circuit, backend):
+    """Transpila para o Aer; o backend analítico executa o circuito como está."""
+    if isinstance(backend, AnalyticBackend):
+        return circuit
+    if isinstance(backend, SeededBackend):
+        backend = backend.backend
+    from qiskit import transpile
+    return transpile(circuit, backend)
+
+
+# -----------------------
+# Decaimento em Lote
+# -----------------------
+
+def decay_angle(probability):
+    """Ângulo de R_Y que mede |1> com a probabilidade dada: theta = 2 * arcsin(sqrt(P1))."""
+    p1 = min(max(probability, 0.0), 1.0)
+    return 2 * math.asin(math.sqrt(p1)) if p1 > 0 else 0.0
+
+
+class BatchedDecaySampler:
+    """
+    Sorteia o decaimento de toda a população com UM job no simulador.
+
+    As partículas são agrupadas pela probabilidade de decaimento; cada grupo
+    ganha um qubit com uma rotação R_Y parametrizada e uma medida. O circuito
+    parametrizado é transpilado uma única vez por sessão (por número de
+    grupos) e reaproveitado com assign_parameters. Cada shot é uma amostra
+    independente de todos os qubits, então com shots = tamanho do maior grupo
+    a partícula k do grupo g usa o bit g do shot k.
+    """
+
+    def __init__(self, simulator):
+        self.sim = simulator
+        self._compiled = {} # número de grupos -> (circuito transpilado, parâmetros)
+        self._bound = {} # probabilidades -> circuito com os ângulos atribuídos
+        self.jobs = 0
+
+    def _circuit_for(self, probabilities):
+        bound = self._bound.get(probabilities)
+        if bound is not None:
+            return bound
+
+        n_groups = len(probabilities)
+        if n_groups not in self._compiled:
+            from qiskit import QuantumCircuit
+            from qiskit.circuit import ParameterVector
+
+            thetas = ParameterVector("theta", n_groups)
+            qc = QuantumCircuit(n_groups, n_groups)
+            for q in range(n_groups):
+                qc.ry(thetas[q], q)
+            qc.measure(range(n_groups), range(n_groups))
+            self._compiled[n_groups] = (compile_for(qc, self.sim), thetas)
+
+        compiled, thetas = self._compiled[n_groups]
+        bound = compiled.assign_parameters({thetas[q]: decay_angle(p) for q, p in enumerate(probabilities)})
+        self._bound[probabilities] = bound
+        return bound
+
+    def sample(self, probabilities, counts):
+        """
+        Args:
+            probabilities (tuple): Probabilidade de decaimento de cada grupo.
+            counts (list): Quantas partículas há em cada grupo.
+
+        Returns:
+            list: Para cada grupo, uma lista de bools (True = decaiu).
+        """
+        shots = max(counts, default=0)
+        if shots == 0:
+            return [[] for _ in counts]
+
+        circuit = self._circuit_for(tuple(probabilities))
+        memory = self.sim.run(circuit, shots=shots, memory=True).result().get_memory()
+        self.jobs += 1
+
+        # Bitstrings do Qiskit: o clbit 0 é o último caractere
+        width = len(probabilities)
+        return [[shot[width - 1 - group] == "1" for shot in memory[:count]]
+                for group, count in enumerate(counts)]
@@ -0,0 +1,135 @@
+from collections import namedtuple
+from enum import IntEnum
+
+# -----------------------
+# Tipos de Partícula e Estados de Cor
+# -----------------------
+
+class ParticleKind(IntEnum):
+    """Código inteiro de cada tipo de partícula estável (coluna "kind" do ParticleStore)."""
+    ELECTRON = 0
+    POSITRON = 1
+    MUON_MINUS = 2
+    PION_MINUS = 3
+    QUARK_UP = 4
+    QUARK_DOWN = 5
+    QUARK_STRANGE = 6
+    PROTON = 7
+    NEUTRON = 8
+    LAMBDA = 9
+    DEUTERIUM = 10
+    HYDROGEN_ATOM = 11
+    DEUTERIUM_ATOM = 12
+
+
+# Nome usado no jogo (HUD, mensagens, particle_type) de cada tipo
+KIND_NAMES = {
+    ParticleKind.ELECTRON: "Electron",
+    ParticleKind.POSITRON: "Positron",
+    ParticleKind.MUON_MINUS: "Muon_MINUS",
+    ParticleKind.PION_MINUS: "Pion_MINUS",
+    ParticleKind.QUARK_UP: "Quark_UP",
+    ParticleKind.QUARK_DOWN: "Quark_DOWN",
+    ParticleKind.QUARK_STRANGE: "Quark_STRANGE",
+    ParticleKind.PROTON: "Proton",
+    ParticleKind.NEUTRON: "Neutron",
+    ParticleKind.LAMBDA: "Lambda",
+    ParticleKind.DEUTERIUM: "Deuterium",
+    ParticleKind.HYDROGEN_ATOM: "Hydrogen Atom",
+    ParticleKind.DEUTERIUM_ATOM: "Deuterium Atom",
+}
+KIND_BY_NAME = {name: kind for kind, name in KIND_NAMES.items()}
+
+QUARK_KINDS = frozenset({ParticleKind.QUARK_UP, ParticleKind.QUARK_DOWN, ParticleKind.QUARK_STRANGE})
+
+
+class ColorState(IntEnum):
+    """Estado de cor de uma flutuação. O anti-estado de s é (s + 3) % 6."""
+    RED = 0
+    GREEN = 1
+    BLUE = 2
+    ANTIRED = 3
+    ANTIGREEN = 4
+    ANTIBLUE = 5
+
+
+STATE_NAMES = {
+    ColorState.RED: "Red",
+    ColorState.GREEN: "Green",
+    ColorState.BLUE: "Blue",
+    ColorState.ANTIRED: "Antired",
+    ColorState.ANTIGREEN: "Antigreen",
+    ColorState.ANTIBLUE: "Antiblue",
+}
+STATE_BY_NAME = {name: state for state, name in STATE_NAMES.items()}
+
+
+def anti_state(state):
+    """Estado de antimatéria correspondente (Red <-> Antired, ...)."""
+    return ColorState((state + 3) % 6)
+
+
+def symmetric(rules):
+    """Tabela de pares indexada nas duas ordens: (a, b) e (b, a) levam ao mesmo valor."""
+    table = {}
+    for (a, b), value in rules.items():
+        table[(a, b)] = value
+        table[(b, a)] = value
+    return table
+
+
+# -----------------------
+# Tabelas de Reação
+# -----------------------
+
+# Colisões entre partículas estáveis: par de tipos -> nome do método do jogo
+# que trata a reação. O método recebe (p1, p2, dist, novas): se as condições da
+# reação valerem, marca p1 e p2 como mortas e acrescenta os produtos em `novas`.
+PAIR_REACTIONS = symmetric({
+    (ParticleKind.ELECTRON, ParticleKind.POSITRON): "react_annihilation",
+    (ParticleKind.PROTON, ParticleKind.NEUTRON): "react_deuterium_fusion",
+    (ParticleKind.PROTON, ParticleKind.ELECTRON): "react_hydrogen_capture",
+    (ParticleKind.DEUTERIUM, ParticleKind.ELECTRON): "react_deuterium_capture",
+})
+
+# Colisões entre flutuações: matéria + antimatéria da mesma cor se aniquilam,
+# alguns pares de cores formam quarks e todo o resto é uma fusão caótica.
+ANNIHILATION = "annihilation"
+QuarkFormation = namedtuple("QuarkFormation", "kind color_state")
+
+FLUCTUATION_REACTIONS = symmetric({
+    **{(state, anti_state(state)): ANNIHILATION for state in (ColorState.RED, ColorState.GREEN, ColorState.BLUE)},
+    (ColorState.RED, ColorState.ANTIGREEN): QuarkFormation(ParticleKind.QUARK_UP, ColorState.RED),
+    (ColorState.BLUE, ColorState.ANTIGREEN): QuarkFormation(ParticleKind.QUARK_DOWN, ColorState.BLUE),
+    (ColorState.GREEN, ColorState.ANTIBLUE): QuarkFormation(ParticleKind.QUARK_STRANGE, ColorState.GREEN),
+})
+
+# Bárions: composição ordenada de quarks -> (tipo, cor, mensagem)
+BaryonRule = namedtuple("BaryonRule", "kind color message")
+
+BARYONS = {
+    tuple(sorted((ParticleKind.QUARK_UP, ParticleKind.QUARK_DOWN, ParticleKind.QUARK_STRANGE))):
+        # Cor roxa para o Lambda (UDS, carga zero)
+        BaryonRule(ParticleKind.LAMBDA, (180, 0, 180), "Bárion Lambda (Up, Down, Strange) formado!"),
+    tuple(sorted((ParticleKind.QUARK_UP, ParticleKind.QUARK_UP, ParticleKind.QUARK_DOWN))):
+        # Cor amarela para o Próton (UUD, carga +1)
+        BaryonRule(ParticleKind.PROTON, (255, 255, 0), "Próton (Up, Up, Down) formado!"),
+    tuple(sorted((ParticleKind.QUARK_UP, ParticleKind.QUARK_DOWN, ParticleKind.QUARK_DOWN))):
+        # Cor cinza para o Nêutron (UDD, carga 0)
+        BaryonRule(ParticleKind.NEUTRON, (150, 150, 150), "Nêutron (Up, Down, Down) formado!"),
+}
+
+# Decaimentos: tipo -> chance por checagem, produtos e método do jogo que cria
+# os produtos (com velocidades, faíscas e mensagens).
+DecayRule = namedtuple("DecayRule", "chance products handler")
+
+DECAY_TABLE = {
+    # ~1 minuto de meia-vida a 60 FPS
+    ParticleKind.NEUTRON: DecayRule(0.0005, (ParticleKind.PROTON, ParticleKind.ELECTRON), "decay_neutron"),
+    # Strange -> Up (94%) ou Down
+    ParticleKind.QUARK_STRANGE: DecayRule(0.002, (ParticleKind.QUARK_UP, ParticleKind.QUARK_DOWN), "decay_strange"),
+    ParticleKind.LAMBDA: DecayRule(0.005, (ParticleKind.PROTON, ParticleKind.PION_MINUS), "decay_lambda"),
+    # Chance muito alta de decaimento (ex: 1% por checagem)
+    ParticleKind.PION_MINUS: DecayRule(0.01, (ParticleKind.MUON_MINUS,), "decay_pion"),
+    ParticleKind.MUON_MINUS: DecayRule(0.002, (ParticleKind.ELECTRON,), "decay_muon"),
+}
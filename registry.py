@@ -0,0 +1,81 @@
+import numpy as np
+
+# -----------------------
+# Registro de Entidades
+# -----------------------
+
+class KindCounter:
+    """
+    Contadores por tipo de uma população (um ParticleStore), atualizados pelo
+    próprio store a cada inserção e remoção: vivos, criados e destruídos.
+    Ler uma contagem é O(1), sem percorrer a população.
+
+    Args:
+        num_kinds (int): Quantidade de códigos de tipo (coluna "kind").
+    """
+
+    def __init__(self, num_kinds):
+        self.counts = [0] * num_kinds
+        self.created = [0] * num_kinds
+        self.destroyed = [0] * num_kinds
+        self.total = 0
+
+    def added(self, kind):
+        self.counts[kind] += 1
+        self.created[kind] += 1
+        self.total += 1
+
+    def removed(self, kind):
+        self.counts[kind] -= 1
+        self.destroyed[kind] += 1
+        self.total -= 1
+
+    def count(self, kind):
+        return self.counts[kind]
+
+    def mismatches(self, store, label):
+        """Diferenças entre os contadores e uma recontagem completa do store."""
+        kinds = store.columns["kind"][:len(store)]
+        recount = np.bincount(kinds, minlength=len(self.counts)).tolist()
+        problems = []
+        if self.total != len(store):
+            problems.append(f"{label}: total {self.total} != {len(store)} no store")
+        for kind, (counted, actual) in enumerate(zip(self.counts, recount)):
+            if counted != actual:
+                problems.append(f"{label}[{kind}]: contador {counted} != recontagem {actual}")
+            if self.created[kind] - self.destroyed[kind] != counted:
+                problems.append(f"{label}[{kind}]: criados - destruídos != {counted}")
+        return problems
+
+
+class EntityRegistry:
+    """
+    Registro central das populações do jogo: contagem por tipo das partículas
+    estáveis e das flutuações (mantidas pelos stores) e os totais de matéria
+    criada e estabilizada (registrados pelas reações). HUD, telemetria e
+    exportadores leem daqui em vez de percorrer as listas.
+    """
+
+    def __init__(self, num_particle_kinds, num_fluctuation_kinds):
+        self.particles = KindCounter(num_particle_kinds)
+        self.fluctuations = KindCounter(num_fluctuation_kinds)
+        self.matter_created = 0
+        self.matter_stabilized = 0
+
+    def record_created(self, count=1):
+        self.matter_created += count
+
+    def record_stabilized(self, count=1):
+        self.matter_stabilized += count
+
+    def verify(self, particles, fluctuations):
+        """
+        Confere os contadores contra uma recontagem completa dos dois stores.
+
+        Raises:
+            RuntimeError: Se algum contador divergir.
+        """
+        problems = (self.particles.mismatches(particles, "partículas")
+                    + self.fluctuations.mismatches(fluctuations, "flutuações"))
+        if problems:
+            raise RuntimeError("Registro de entidades inconsistente: " + "; ".join(problems))
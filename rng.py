@@ -0,0 +1,81 @@
+import numpy as np
+
+# -----------------------
+# Fluxos de Números Aleatórios
+# -----------------------
+
+class RngStream:
+    """
+    Um fluxo de números aleatórios de um subsistema, com a mesma interface
+    do módulo `random` para os sorteios escalares (random, uniform, randint,
+    choice) e o numpy.random.Generator exposto em `generator` para sorteios
+    em lote.
+
+    Os escalares saem de blocos de `block` valores sorteados de uma vez pelo
+    Generator, então cada chamada custa uma indexação em vez de uma chamada
+    ao NumPy. A sequência continua determinística: depende só da semente e
+    da ordem das chamadas.
+
+    Args:
+        generator (np.random.Generator): Gerador do fluxo.
+        block (int): Quantos valores uniformes são sorteados por recarga.
+    """
+
+    __slots__ = ("generator", "block", "_buffer", "_index")
+
+    def __init__(self, generator, block=1024):
+        self.generator = generator
+        self.block = max(1, block)
+        self._buffer = []
+        self._index = 0
+
+    def random(self):
+        """Uniforme em [0, 1)."""
+        if self._index >= len(self._buffer):
+            self._buffer = self.generator.random(self.block).tolist()
+            self._index = 0
+        value = self._buffer[self._index]
+        self._index += 1
+        return value
+
+    def uniform(self, a, b):
+        """Uniforme entre a e b."""
+        return a + (b - a) * self.random()
+
+    def randint(self, a, b):
+        """Inteiro uniforme em [a, b], com os dois extremos incluídos (como random.randint)."""
+        return a + int(self.random() * (b - a + 1))
+
+    def choice(self, seq):
+        """Elemento uniforme de uma sequência não vazia."""
+        return seq[int(self.random() * len(seq))]
+
+
+class RngStreams:
+    """
+    Contexto de aleatoriedade do jogo: um fluxo independente por subsistema,
+    todos derivados de uma única semente por numpy.random.SeedSequence.spawn.
+    Com a mesma semente e o mesmo número de ticks, a simulação chega ao mesmo
+    estado bit a bit; e como cada subsistema tem seu próprio fluxo, sortear a
+    mais em um deles (ex.: mais faíscas) não altera os outros.
+
+    Fluxos:
+        spawn: criação de flutuações (decisão, ramo, posição, velocidade) e
+            a amostragem dos atratores do mapa logístico.
+        physics: velocidades iniciais padrão, ângulos e giros das entidades.
+        reactions: sorteios das reações em check_interactions.
+        decay: sorteios e produtos dos decaimentos (incluindo os backends quânticos).
+        visuals: efeitos (faíscas, fótons), que não fazem parte do estado do mundo.
+
+    Args:
+        seed (int): Semente. Sem semente, a SeedSequence usa entropia do
+            sistema, e o valor sorteado fica em `seed` para repetir a execução.
+    """
+
+    NAMES = ("spawn", "physics", "reactions", "decay", "visuals")
+
+    def __init__(self, seed=None):
+        sequence = np.random.SeedSequence(seed)
+        self.seed = sequence.entropy
+        for name, child in zip(self.NAMES, sequence.spawn(len(self.NAMES))):
+            setattr(self, name, RngStream(np.random.default_rng(child)))
@@ -0,0 +1,271 @@
+import math
+
+import numpy as np
+
+# -----------------------
+# Estruturas Espaciais
+# -----------------------
+
+class SpatialHash:
+    """
+    Grade uniforme (spatial hash) para a fase ampla (broad-phase) das colisões.
+
+    O campo de jogo é toroidal (as partículas reaparecem do outro lado da tela),
+    então os índices das células são tomados em módulo: as células da última
+    coluna/linha são vizinhas das células da primeira. A distância usada nos
+    testes de colisão continua sendo a do plano; a grade apenas garante que
+    nenhum par a menos de `cell_size` fique de fora dos candidatos.
+
+    Se a grade não cobre o campo com células inteiras, a última coluna/linha
+    fica mais estreita, e dois objetos a duas células de distância através
+    da borda podem estar a menos de `cell_size` pela imagem mais próxima.
+    Quem mede distâncias no toro deve passar células que dividem o campo
+    exatamente (`cell_height` permite uma altura diferente da largura).
+    """
+
+    def __init__(self, width, height, cell_size, cell_height=None):
+        self.cell_size = float(cell_size)
+        self.cell_height = float(cell_height) if cell_height is not None else self.cell_size
+        # A folga evita uma coluna/linha extra quase vazia quando a célula divide
+        # o campo e a divisão em ponto flutuante passa um pouco do inteiro
+        self.cols = max(1, int(math.ceil(width / self.cell_size - 1e-9)))
+        self.rows = max(1, int(math.ceil(height / self.cell_height - 1e-9)))
+        self.xs = np.empty(0)
+        self.ys = np.empty(0)
+
+        # Deslocamentos das 9 células vizinhas, sem repetição quando a grade
+        # tem menos de 3 colunas/linhas (o módulo faria a mesma célula aparecer duas vezes)
+        col_offsets = sorted({d % self.cols for d in (-1, 0, 1)})
+        row_offsets = sorted({d % self.rows for d in (-1, 0, 1)})
+        self._offsets = [(dc, dr) for dc in col_offsets for dr in row_offsets]
+
+    def rebuild(self, xs, ys):
+        """Reconstrói a grade a partir das coordenadas (arrays ou listas) dos objetos."""
+        self.xs = np.asarray(xs, dtype=np.float64)
+        self.ys = np.asarray(ys, dtype=np.float64)
+        self._cols_of = np.floor(self.xs / self.cell_size).astype(np.int64) % self.cols
+        self._rows_of = np.floor(self.ys / self.cell_height).astype(np.int64) % self.rows
+        cell_ids = self._rows_of * self.cols + self._cols_of
+
+        # Objetos ordenados por célula; cada célula ocupa um intervalo contíguo
+        self._order = np.argsort(cell_ids, kind="stable")
+        self._sorted_ids = cell_ids[self._order]
+
+    def candidate_pairs(self):
+        """
+        Pares candidatos (i, j), com i < j, em ordem lexicográfica, a mesma do
+        laço força-bruta `for i / for j`. Isso mantém idêntica a sequência de
+        reações (e de chamadas ao gerador aleatório) em relação ao caminho O(n²).
+
+        Returns:
+            tuple: Arrays (I, J) com os índices dos pares.
+        """
+        n = len(self.xs)
+        if n < 2:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+
+        index = np.arange(n)
+        firsts = []
+        seconds = []
+        for dc, dr in self._offsets:
+            neighbor_ids = ((self._rows_of + dr) % self.rows) * self.cols + (self._cols_of + dc) % self.cols
+            starts = np.searchsorted(self._sorted_ids, neighbor_ids, side="left")
+            ends = np.searchsorted(self._sorted_ids, neighbor_ids, side="right")
+            lengths = ends - starts
+            total = int(lengths.sum())
+            if total == 0:
+                continue
+            first = np.repeat(index, lengths)
+            # Posição de cada candidato dentro do intervalo ordenado da célula vizinha
+            run_starts = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+            second = self._order[run_starts + np.arange(total)]
+            keep = second > first
+            firsts.append(first[keep])
+            seconds.append(second[keep])
+
+        if not firsts:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+        first = np.concatenate(firsts)
+        second = np.concatenate(seconds)
+        order = np.lexsort((second, first))
+        return first[order], second[order]
+
+    def pairs_within(self, reach=None, radii=None):
+        """
+        Pares candidatos mais próximos que `reach` (distância fixa) ou que a
+        soma dos raios `radii[i] + radii[j]` (ex.: soma dos tamanhos).
+        """
+        first, second = self.candidate_pairs()
+        return filter_pairs_within(self.xs, self.ys, first, second, reach, radii)
+
+
+class NeighborList:
+    """
+    Lista de vizinhos de Verlet: os pares a menos de `reach + skin`, guardados
+    entre um tick e outro. Enquanto nenhum objeto se deslocar mais que
+    skin / 2 desde a construção, todo par que hoje esteja a menos de `reach`
+    já está na lista (cada um dos dois andou no máximo skin / 2), então basta
+    filtrar a lista em vez de varrer a grade de novo.
+
+    Mudanças na população não exigem refazer a lista enquanto nenhuma linha
+    troca de slot (ParticleStore.layout igual): objetos inseridos no fim
+    entram com os pares que formam com os demais (medidos nas posições de
+    referência, como na construção) e a remoção da última linha só descarta
+    os pares dela. A lista é reconstruída quando uma remoção move linhas,
+    quando algum objeto anda mais que skin / 2 (o wrap-around toroidal conta
+    como um salto), quando muitos objetos chegam de uma vez ou quando o
+    alcance pedido passa do alcance usado na construção. Com skin = 0 ela é
+    refeita a cada consulta, como a grade sem lista.
+
+    Args:
+        width, height (float): Dimensões do campo.
+        skin (float): Folga somada ao alcance, em pixels.
+    """
+
+    # Acima disso, os objetos novos são testados contra todos os outros de uma
+    # vez (novos × todos) e sai mais barato reconstruir pela grade
+    max_appended = 64
+
+    def __init__(self, width, height, skin):
+        self.width = width
+        self.height = height
+        self.skin = max(0.0, float(skin))
+        self.first = np.empty(0, dtype=np.int64)
+        self.second = np.empty(0, dtype=np.int64)
+        self.x0 = None
+        self.y0 = None
+        self.layout = None
+        self.reach = 0.0
+        self.builds = 0
+        self.appends = 0
+        self.queries = 0
+
+    def needs_rebuild(self, xs, ys, layout, reach):
+        if self.x0 is None or layout != self.layout or reach > self.reach or self.skin == 0:
+            return True
+        if len(xs) - len(self.x0) > self.max_appended:
+            return True
+        kept = min(len(xs), len(self.x0))
+        if kept == 0:
+            return False
+        moved = (xs[:kept] - self.x0[:kept]) ** 2 + (ys[:kept] - self.y0[:kept]) ** 2
+        return float(moved.max()) > (self.skin / 2) ** 2
+
+    def rebuild(self, xs, ys, layout, reach):
+        grid = SpatialHash(self.width, self.height, max(reach + self.skin, 1))
+        grid.rebuild(xs, ys)
+        self.first, self.second = grid.pairs_within(reach=reach + self.skin)
+        self.x0 = np.array(xs, dtype=np.float64)
+        self.y0 = np.array(ys, dtype=np.float64)
+        self.layout = layout
+        self.reach = reach
+        self.builds += 1
+
+    def truncate(self, count):
+        """Descarta os pares e as posições dos objetos a partir de `count` (linhas removidas do fim)."""
+        keep = self.second < count
+        self.first = self.first[keep]
+        self.second = self.second[keep]
+        self.x0 = self.x0[:count]
+        self.y0 = self.y0[:count]
+
+    def append(self, xs, ys):
+        """Acrescenta os objetos a partir de len(x0) e os pares que eles formam, mantendo a ordem."""
+        start = len(self.x0)
+        new_x = np.array(xs[start:], dtype=np.float64)
+        new_y = np.array(ys[start:], dtype=np.float64)
+        self.x0 = np.concatenate((self.x0, new_x))
+        self.y0 = np.concatenate((self.y0, new_y))
+
+        # Cada novo j contra todos os i < j, nas posições de referência
+        dist = np.hypot(self.x0[None, :] - new_x[:, None], self.y0[None, :] - new_y[:, None])
+        below = np.arange(len(self.x0))[None, :] < np.arange(start, len(self.x0))[:, None]
+        rows, cols = np.nonzero(below & (dist < self.reach + self.skin + 1e-9))
+        first = np.concatenate((self.first, cols))
+        second = np.concatenate((self.second, rows + start))
+        order = np.lexsort((second, first))
+        self.first = first[order]
+        self.second = second[order]
+        self.appends += 1
+
+    def pairs(self, xs, ys, layout, reach):
+        """
+        Pares (i, j), i < j, em ordem lexicográfica, que contêm todos os pares
+        a menos de `reach` (o chamador aplica o teste exato).
+
+        Args:
+            xs, ys (np.ndarray): Posições atuais.
+            layout (int): Versão da disposição das linhas (ParticleStore.layout).
+            reach (float): Maior distância de interação que será testada.
+        """
+        self.queries += 1
+        if self.needs_rebuild(xs, ys, layout, reach):
+            self.rebuild(xs, ys, layout, reach)
+        else:
+            if len(xs) < len(self.x0):
+                self.truncate(len(xs))
+            if len(xs) > len(self.x0):
+                self.append(xs, ys)
+        return self.first, self.second
+
+
+def filter_pairs_within(xs, ys, first, second, reach=None, radii=None):
+    """
+    Mantém os pares cuja distância no plano está abaixo do limite. Uma pequena
+    folga deixa a decisão final com o teste exato (math.hypot) do chamador.
+    """
+    if len(first) == 0:
+        return first, second
+    limit = radii[first] + radii[second] if radii is not None else reach
+    dist = np.hypot(xs[first] - xs[second], ys[first] - ys[second])
+    keep = dist < limit + 1e-9
+    return first[keep], second[keep]
+
+
+def brute_force_pairs(count):
+    """Todos os pares (i, j), i < j, na ordem do laço original."""
+    return np.triu_indices(count, 1)
+
+
+def pair_triples(first, second, count):
+    """
+    Trios (i, j, k), i < j < k, em que os três pares (i, j), (i, k) e (j, k)
+    aparecem na lista de pares, em ordem lexicográfica (a mesma do laço
+    triplo `for i / for j / for k`). Só os vizinhos de cada objeto são
+    combinados, em vez de todos os trios da população.
+
+    Args:
+        first, second (np.ndarray): Pares i < j em ordem lexicográfica (como
+            devolvidos por candidate_pairs, pairs_within ou brute_force_pairs).
+        count (int): Número de objetos.
+
+    Returns:
+        tuple: Arrays (I, J, K) com os índices dos trios.
+    """
+    first = np.asarray(first, dtype=np.int64)
+    second = np.asarray(second, dtype=np.int64)
+    empty = np.empty(0, dtype=np.int64)
+    if len(first) < 3:
+        return empty, empty, empty
+
+    # Para o par p = (i, j), os candidatos k são os vizinhos de i depois de j:
+    # second[p + 1 : fim da lista de i]
+    ends = np.searchsorted(first, first, side="right")
+    pair_index = np.arange(len(first))
+    lengths = ends - pair_index - 1
+    total = int(lengths.sum())
+    if total == 0:
+        return empty, empty, empty
+    I = np.repeat(first, lengths)
+    J = np.repeat(second, lengths)
+    run_starts = np.repeat(pair_index + 1 - (np.cumsum(lengths) - lengths), lengths)
+    K = second[run_starts + np.arange(total)]
+
+    # O trio só vale se (j, k) também for um par
+    keys = first * count + second
+    wanted = J * count + K
+    found = np.searchsorted(keys, wanted)
+    valid = (found < len(keys)) & (keys[np.minimum(found, len(keys) - 1)] == wanted)
+    return I[valid], J[valid], K[valid]
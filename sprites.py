@@ -0,0 +1,83 @@
+import math
+from collections import OrderedDict
+
+import pygame
+
+# -----------------------
+# Cache de Sprites
+# -----------------------
+
+class SpriteCache:
+    """
+    Cache LRU de Surfaces pré-renderizadas. A chave descreve tudo o que muda
+    a aparência de um desenho (tipo, cor, ângulo e fase quantizados...), então
+    desenhar uma entidade vira um único blit do sprite guardado.
+
+    Cada sprite é um quadrado de lado 2 * radius + 1 com o centro do desenho
+    no pixel (radius, radius). O fundo usa colorkey preto, a mesma cor do
+    fundo do jogo.
+
+    Args:
+        max_size (int): Número máximo de sprites mantidos (os menos usados saem primeiro).
+    """
+
+    def __init__(self, max_size=2048):
+        self.max_size = max(1, max_size)
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, radius, render):
+        """
+        Devolve o sprite de `key`, renderizando-o com render(surface, cx, cy)
+        se ainda não estiver no cache.
+        """
+        sprite = self.entries.get(key)
+        if sprite is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return sprite
+
+        self.misses += 1
+        side = 2 * radius + 1
+        sprite = pygame.Surface((side, side))
+        render(sprite, radius, radius)
+        if pygame.display.get_surface() is not None:
+            sprite = sprite.convert()
+        sprite.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+        self.entries[key] = sprite
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return sprite
+
+    def blit(self, screen, key, radius, x, y, render):
+        """Desenha o sprite de `key` centrado em (x, y)."""
+        sprite = self.get(key, radius, render)
+        screen.blit(sprite, (int(x) - radius, int(y) - radius))
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self.entries),
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+def quantize(value, step, period=None):
+    """Arredonda `value` para o múltiplo de `step` mais próximo (em módulo `period`, se dado)."""
+    if period is not None:
+        value %= period
+    q = round(value / step) * step
+    if period is not None and q >= period:
+        q -= period
+    return q
+
+
+def sprite_radius(extent):
+    """Meio-lado do sprite que comporta um desenho de alcance `extent` (com folga para bordas)."""
+    return int(math.ceil(extent)) + 2